@@ -0,0 +1,351 @@
+#!/usr/bin/env python3.10
+"""
+Generates large, valid binp programs for scale testing, along with the output each one should print
+
+The expected output is not found by running the interpreter. The generator keeps the program it builds
+as a small tree of statements and expressions and works out the output from that tree with plain python,
+so it can be used to check the interpreter as well as time it
+
+usage: python benchmarks/generate.py OUT_PREFIX [--lines N] [--depth N] [--variables N] [--functions N]
+                                                [--recursion N] [--expression-length N] [--outputs N] [--seed N]
+writes OUT_PREFIX.binp and OUT_PREFIX.expected
+"""
+import argparse
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from binp.builtins import BUILTINS  # noqa: E402
+from binp.interpreter import INVALID_VARIABLE_NAMES  # noqa: E402
+
+MODULUS = 10007  # every assignment is taken mod this, so values stay small no matter how long the program runs
+LOOP_COUNT = (2, 3)  # how many times each while/for loop can run
+ARITH_OPERATORS = ['+', '-', '*']
+COMPARISONS = ['<', '<=', '>', '>=', '==', '!=']
+INDENT = '    '
+
+
+def variable_name(prefix: str, i: int) -> str:
+    """
+    This makes a variable name out of letters only (binp names can not contain a 0)
+    :param prefix: the first letter of the name
+    :param i: the index of the variable
+    :return: a name like 'va', 'vb', ..., 'vz', 'vba', ... (keywords and builtins are skipped)
+    """
+    letters = ''
+    while True:
+        letters = chr(ord('a') + i % 26) + letters
+        i //= 26
+        if i == 0:
+            break
+    name = prefix + letters
+    if name in INVALID_VARIABLE_NAMES or name in BUILTINS:
+        return name + '_'
+    return name
+
+
+class Generator:
+    """
+    This class builds one random program. Statements and expressions are tuples:
+        ('lit', value) ('var', name) ('bin', op, left, right) ('call', name, [args])
+        ('cmp', op, left, right) ('and', left, right) ('or', left, right)
+        ('assign', name, expr) ('output', [words]) ('call_stmt', name, [args])
+        ('if', cond, body, else_body) ('while', counter, count, body) ('for', name, start, stop, body)
+
+    :param options: the parsed command line options
+    """
+    def __init__(self, options: argparse.Namespace):
+        self.options = options
+        self.random = random.Random(options.seed)
+        self.variables = [variable_name('v', i) for i in range(options.variables)]
+        self.functions = {}  # name -> (params, expr)
+        self.loop_names = 0
+        self.outputs_left = options.outputs
+        self.output_count = 0
+        self.lines_left = options.lines
+
+    # ---- building the program ----
+
+    def expression(self, names: list[str], length: int, calls=True):
+        """
+        This makes a random arithmetic expression with about length operators
+        :param names: the variables the expression can use
+        :param length: the number of operators
+        :param calls: if this is true, the expression can call the generated functions
+        :return: the expression
+        """
+        if length <= 0:
+            choice = self.random.random()
+            if calls and self.functions and choice < 0.1:
+                name = self.random.choice(list(self.functions))
+                params, _ = self.functions[name]
+                return 'call', name, [self.expression(names, 0, calls=False) for _ in params]
+            if names and choice < 0.7:
+                return 'var', self.random.choice(names)
+            return 'lit', self.random.randint(0, 99)
+        left = self.random.randint(0, length - 1)
+        if self.random.random() < 0.1:  # divide or modulus by a literal, so it can never be by 0
+            return 'bin', self.random.choice(['/', '%']), self.expression(names, length - 1, calls), \
+                ('lit', self.random.randint(1, 9))
+        return 'bin', self.random.choice(ARITH_OPERATORS), self.expression(names, left, calls), \
+            self.expression(names, length - 1 - left, calls)
+
+    def condition(self, names: list[str]):
+        """
+        This makes a random condition out of comparisons joined by && and ||
+        :param names: the variables the condition can use
+        :return: the condition
+        """
+        comparison = ('cmp', self.random.choice(COMPARISONS),
+                      self.expression(names, 1, calls=False), self.expression(names, 0, calls=False))
+        if self.random.random() < 0.3:
+            return self.random.choice(['and', 'or']), comparison, self.condition(names)
+        return comparison
+
+    def define_functions(self) -> None:
+        """
+        This makes the (non-recursive) functions, which only use their own parameters
+        """
+        for i in range(self.options.functions):
+            params = [variable_name('p', j) for j in range(self.random.randint(1, 3))]
+            self.functions[variable_name('f', i)] = (params, self.expression(params, self.options.expression_length,
+                                                                             calls=False))
+
+    def block(self, depth: int, loop_names: list[str]) -> list:
+        """
+        This makes a list of statements, using up the line budget
+        :param depth: how many more levels of if/while/for can be nested inside this block
+        :param loop_names: the loop counters of the loops around this block, which it must not assign
+        :return: the statements
+        """
+        statements = []
+        length = self.random.randint(2, 6)
+        while self.lines_left > 0 and len(statements) < length:
+            choice = self.random.random()
+            if depth > 0 and choice < 0.3:
+                statements.append(self.nested(depth, loop_names))
+            elif self.outputs_left > 0 and choice < 0.45:
+                self.outputs_left -= 1
+                self.output_count += 1
+                self.lines_left -= 1
+                statements.append(('output', ['out', str(self.output_count), ':',
+                                              *self.random.sample(self.variables, min(3, len(self.variables)))]))
+            else:
+                self.lines_left -= 1
+                statements.append(('assign', self.random.choice(self.variables),
+                                   self.expression(self.variables + loop_names, self.options.expression_length)))
+        return statements
+
+    def nested(self, depth: int, loop_names: list[str]):
+        """
+        This makes an if, while or for statement with blocks inside of it
+        :param depth: how many more levels can be nested
+        :param loop_names: the loop counters of the loops around this statement
+        :return: the statement
+        """
+        kind = self.random.choice(['if', 'while', 'for'])
+        self.lines_left -= 2
+        if kind == 'if':
+            else_body = []
+            if self.random.random() < 0.5:
+                self.lines_left -= 1
+                else_body = self.block(depth - 1, loop_names)
+            return 'if', self.condition(self.variables + loop_names), self.block(depth - 1, loop_names), else_body
+
+        name = variable_name('w' if kind == 'while' else 'k', self.loop_names)
+        self.loop_names += 1
+        if kind == 'while':
+            self.lines_left -= 2
+            return 'while', name, self.random.randint(*LOOP_COUNT), self.block(depth - 1, loop_names + [name])
+        start = self.random.randint(0, 5)
+        return 'for', name, start, start + self.random.randint(*LOOP_COUNT), self.block(depth - 1, loop_names + [name])
+
+    def program(self) -> list:
+        """
+        This makes the whole program
+        :return: the statements of the main program
+        """
+        self.define_functions()
+        statements = [('assign', name, ('lit', self.random.randint(0, 99))) for name in self.variables]
+        if self.options.recursion > 0:
+            statements.append(('output', ['recursion', ':', ('call', 'rec', [('lit', self.options.recursion)])]))
+        while self.lines_left > 0:
+            statements.extend(self.block(self.options.depth, []))
+        statements.append(('output', ['final', ':', *self.variables]))
+        return statements
+
+    # ---- writing the program as binp ----
+
+    def render_expression(self, expr) -> str:
+        match expr:
+            case ('lit', value):
+                return str(value)
+            case ('var', name):
+                return name
+            case ('bin', op, left, right):
+                return f'({self.render_expression(left)} {op} {self.render_expression(right)})'
+            case ('call', name, args):
+                return f'{name}({", ".join(self.render_expression(arg) for arg in args)})'
+            case ('cmp', op, left, right):
+                return f'({self.render_expression(left)} {op} {self.render_expression(right)})'
+            case ('and' | 'or' as op, left, right):
+                symbol = '&&' if op == 'and' else '||'
+                return f'({self.render_expression(left)} {symbol} {self.render_expression(right)})'
+
+    def render_block(self, statements: list, indent: int) -> list[str]:
+        pad = INDENT * indent
+        lines = []
+        for statement in statements:
+            match statement:
+                case ('assign', name, expr):
+                    lines.append(f'{pad}var int {name} = {self.render_expression(expr)} % {MODULUS}')
+                case ('output', words):
+                    words = [word if isinstance(word, str) else self.render_expression(word) for word in words]
+                    if any(not isinstance(word, str) for word in statement[1]):
+                        # output does not run function calls, so the value is stored first
+                        lines.append(f'{pad}var int result = {words[-1]}')
+                        words[-1] = 'result'
+                    lines.append(f'{pad}output {" ".join(words)}')
+                case ('if', cond, body, else_body):
+                    lines.append(f'{pad}if ({self.render_expression(cond)}) =>')
+                    lines.extend(self.render_block(body, indent + 1))
+                    if else_body:
+                        lines.append(f'{pad}else =>')
+                        lines.extend(self.render_block(else_body, indent + 1))
+                    lines.append(f'{pad}end')
+                case ('while', counter, count, body):
+                    lines.append(f'{pad}var int {counter} = 0')
+                    lines.append(f'{pad}while ({counter} < {count}) =>')
+                    lines.extend(self.render_block(body, indent + 1))
+                    lines.append(f'{pad}{INDENT}var int {counter} = {counter} + 1')
+                    lines.append(f'{pad}end')
+                case ('for', name, start, stop, body):
+                    lines.append(f'{pad}for (int {name} = {start}, {stop}) =>')
+                    lines.extend(self.render_block(body, indent + 1))
+                    lines.append(f'{pad}end')
+        return lines
+
+    def render(self, statements: list) -> str:
+        """
+        :param statements: the statements of the main program
+        :return: the source of the whole program
+        """
+        lines = ['$ generated by benchmarks/generate.py']
+        for name, (params, expr) in self.functions.items():
+            lines.append(f'var int func {name} = ({", ".join(f"int {param}" for param in params)}) =>')
+            lines.append(f'{INDENT}return {self.render_expression(expr)} % {MODULUS}')
+            lines.append(f'end {name}')
+        if self.options.recursion > 0:
+            lines.extend([
+                'var int func rec = (int n) =>',
+                f'{INDENT}if (n == 0) =>',
+                f'{INDENT * 2}return 0',
+                f'{INDENT}end',
+                f'{INDENT}return (rec(n - 1) + n * 3) % {MODULUS}',
+                'end rec',
+            ])
+        lines.extend(self.render_block(statements, 0))
+        return '\n'.join(lines) + '\n'
+
+    # ---- working out the expected output ----
+
+    def evaluate(self, expr, values: dict):
+        match expr:
+            case ('lit', value):
+                return value
+            case ('var', name):
+                return values[name]
+            case ('bin', op, left, right):
+                left, right = self.evaluate(left, values), self.evaluate(right, values)
+                match op:
+                    case '+': return left + right
+                    case '-': return left - right
+                    case '*': return left * right
+                    case '/': return left // right
+                    case '%': return left % right
+            case ('call', 'rec', [arg]):
+                total = 0
+                for n in range(1, self.evaluate(arg, values) + 1):
+                    total = (total + n * 3) % MODULUS
+                return total
+            case ('call', name, args):
+                params, body = self.functions[name]
+                arg_values = [self.evaluate(arg, values) for arg in args]
+                return self.evaluate(body, dict(zip(params, arg_values))) % MODULUS
+            case ('cmp', op, left, right):
+                left, right = self.evaluate(left, values), self.evaluate(right, values)
+                return {'<': left < right, '<=': left <= right, '>': left > right,
+                        '>=': left >= right, '==': left == right, '!=': left != right}[op]
+            case ('and', left, right):
+                return self.evaluate(left, values) and self.evaluate(right, values)
+            case ('or', left, right):
+                return self.evaluate(left, values) or self.evaluate(right, values)
+
+    def execute(self, statements: list, values: dict, output: list[str]) -> None:
+        for statement in statements:
+            match statement:
+                case ('assign', name, expr):
+                    values[name] = self.evaluate(expr, values) % MODULUS
+                case ('output', words):
+                    words = [str(values.get(word, word)) if isinstance(word, str) else str(self.evaluate(word, values))
+                             for word in words]
+                    output.append(f' >> {" ".join(words)} ')
+                case ('if', cond, body, else_body):
+                    self.execute(body if self.evaluate(cond, values) else else_body, values, output)
+                case ('while', counter, count, body):
+                    for i in range(count):
+                        values[counter] = i
+                        self.execute(body, values, output)
+                    values[counter] = count
+                case ('for', name, start, stop, body):
+                    for i in range(start, stop):
+                        values[name] = i
+                        self.execute(body, values, output)
+
+    def expected_output(self, statements: list) -> str:
+        output = []
+        self.execute(statements, {}, output)
+        return '\n'.join(output) + '\n'
+
+
+def generate(options: argparse.Namespace) -> (str, str):
+    """
+    This generates a program
+    :param options: the parsed command line options (see get_parser)
+    :return: the source of the program and the output it should print
+    """
+    generator = Generator(options)
+    statements = generator.program()
+    return generator.render(statements), generator.expected_output(statements)
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Generate a binp program and its expected output')
+    parser.add_argument('out', help='the prefix of the files to write (PREFIX.binp and PREFIX.expected)')
+    parser.add_argument('--lines', type=int, default=200, help='roughly how many lines the main program has')
+    parser.add_argument('--depth', type=int, default=2, help='how deeply if/while/for blocks are nested')
+    parser.add_argument('--variables', type=int, default=8, help='how many global variables there are')
+    parser.add_argument('--functions', type=int, default=4, help='how many functions are defined')
+    parser.add_argument('--recursion', type=int, default=20, help='how deep the recursive function goes (0 for none)')
+    parser.add_argument('--expression-length', type=int, default=3, help='how many operators are in an expression')
+    parser.add_argument('--outputs', type=int, default=20, help='how many output statements there are')
+    parser.add_argument('--seed', type=int, default=0, help='the random seed')
+    return parser
+
+
+def main() -> None:
+    options = get_parser().parse_args()
+    source, expected = generate(options)
+    with open(f'{options.out}.binp', 'w') as file:
+        file.write(source)
+    with open(f'{options.out}.expected', 'w') as file:
+        file.write(expected)
+    print(f'wrote {options.out}.binp ({source.count(chr(10))} lines) and {options.out}.expected '
+          f'({expected.count(chr(10))} lines of output)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3.10
+"""
+Generates programs of growing size (with benchmarks/generate.py) and measures how the interpreter scales:
+the time to format (parse) each program, the time to run it, and the peak memory used while running it.
+Every run is also checked against the output the generator expects, so a wrong result is never timed
+
+usage: python benchmarks/scaling.py [SIZES...] [-- GENERATOR OPTIONS]
+e.g.   python benchmarks/scaling.py 250 500 1000 2000 -- --depth 3 --functions 8
+"""
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.generate import generate, get_parser  # noqa: E402
+from binp.builtins import get_builtins  # noqa: E402
+from binp.context import Context  # noqa: E402
+from binp.formatting import format_file  # noqa: E402
+from binp.interpreter import run_program, get_unaries  # noqa: E402
+
+DEFAULT_SIZES = [250, 500, 1000, 2000, 4000]
+
+
+def run(lines: list[str]) -> str:
+    """
+    Runs a formatted program in a fresh namespace and context
+    :param lines: the formatted lines of the program
+    :return: everything the program printed
+    """
+    stdout = io.StringIO()
+    run_program(lines, get_builtins(get_unaries({})), Context(stdout=stdout))
+    return stdout.getvalue()
+
+
+def measure(source: str, expected: str) -> tuple[float, float, int]:
+    """
+    Formats and runs a program, checking its output
+    :param source: the source of the program
+    :param expected: the output it should print
+    :return: the seconds taken to format it, the seconds taken to run it, and the peak bytes allocated while running
+    """
+    start = time.perf_counter()
+    lines = format_file(io.StringIO(source))
+    parse_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    output = run(lines)
+    run_time = time.perf_counter() - start
+    if output != expected:
+        raise AssertionError('the program did not print what the generator expected')
+
+    # memory is measured on a separate run, tracemalloc slows everything down too much to time the same run
+    tracemalloc.start()
+    run(lines)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return parse_time, run_time, peak
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    generator_args = []
+    if '--' in args:
+        generator_args = args[args.index('--') + 1:]
+        args = args[:args.index('--')]
+    sizes = [int(size) for size in args] or DEFAULT_SIZES
+
+    print(f'{"lines":>8}{"source lines":>14}{"parse (ms)":>12}{"run (ms)":>12}{"peak (KiB)":>12}')
+    for size in sizes:
+        options = get_parser().parse_args(['-', '--lines', str(size), *generator_args])
+        source, expected = generate(options)
+        parse_time, run_time, peak = measure(source, expected)
+        print(f'{size:>8}{source.count(chr(10)):>14}{parse_time * 1000:>12.1f}{run_time * 1000:>12.1f}'
+              f'{peak / 1024:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
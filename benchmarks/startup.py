@@ -0,0 +1,49 @@
+#!/usr/bin/env python3.10
+"""
+Measures the cold start time of the interpreter by running a small program many times
+in fresh python processes and comparing it against starting python with no program at all
+
+usage: python benchmarks/startup.py [PROGRAM] [RUNS]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PROGRAM = os.path.join(ROOT, 'valid_programs', 'hello_world.binp')
+
+
+def time_command(command: list[str], runs: int) -> list[float]:
+    """
+    Runs a command several times and times each run
+    :param command: the command to run
+    :param runs: how many times to run the command
+    :return: the time of each run in seconds
+    """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main() -> None:
+    program = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PROGRAM
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    commands = {
+        'python (no program)': [sys.executable, '-c', 'pass'],
+        'python main.py': [sys.executable, os.path.join(ROOT, 'main.py'), program],
+        'python -m binp': [sys.executable, '-m', 'binp', program],
+    }
+    print(f'{"command":<22}{"min (ms)":>10}{"median (ms)":>14}')
+    for name, command in commands.items():
+        times = time_command(command, runs)
+        print(f'{name:<22}{min(times) * 1000:>10.1f}{statistics.median(times) * 1000:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
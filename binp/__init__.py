@@ -0,0 +1,10 @@
+"""
+Binary Plus: an interpreter for .binp programs
+
+The interpreter is imported first, so the modules which depend on each other
+(interpreter, functions, evaluators, conditionals) always load in the same order
+"""
+from binp.interpreter import run_program, parse_line, get_cli_args, get_unaries
+from binp.context import Context
+from binp.errors import BinPExit
+from binp.formatting import format_file, format_line
@@ -0,0 +1,3 @@
+from binp.cli import main
+
+main()
@@ -0,0 +1,277 @@
+import time
+from collections.abc import Callable
+
+from binp import sequences
+from binp.context import current_context
+from binp.expressions import Operator
+from binp.handles import BinPHandle
+from binp.functions import BinPFunction
+from binp.maps import BinPMap
+from binp.sequences import BinPSeq
+
+
+class BinPBuiltin(BinPFunction):
+    """
+    This class is a function which is written in python instead of binp, for things
+    a binp program cannot do by itself (like checking for the end of its input)
+
+    It is called just like any other function, and its arguments are checked
+    and evaluated the same way, but instead of running lines it calls body
+
+    :param body: the python function to run, which is passed the line number,
+            the line and then the value of each argument
+    :param io: true if the builtin reads or writes something, so --stats counts its time as I/O
+    """
+    def __init__(self, name: str, return_type: str, params: list[(str, str)], body: Callable, io: bool = True):
+        super().__init__(name, return_type, params, [])
+        self._body = body
+        self._io = io
+
+    def run(self, line_num: int, line: str, args: list[list], namespace: dict):
+        """
+        This runs the python function with the values of the arguments
+        :param line_num: line number for errors
+        :param line: line for errors
+        :param args: the arguments passed into the function call, one list of values per argument
+        :param namespace: the namespace of the caller
+        :return: the value which the python function returns
+        """
+        context = current_context()
+        values = self.evaluate_arguments(line_num, line, args, namespace, context)
+        if context.stats is None:
+            return self._body(line_num, line, *values)
+
+        context.stats.builtin_calls += 1
+        if not self._io:
+            return self._body(line_num, line, *values)
+        start = time.perf_counter()
+        try:
+            return self._body(line_num, line, *values)
+        finally:
+            context.stats.io_time += time.perf_counter() - start
+
+
+def builtin_eof(line_num: int, line: str) -> bool:
+    """
+    eof() is true once there is nothing left for 'input' to read
+    """
+    return current_context().stdin.at_eof()
+
+
+def builtin_fopen(line_num: int, line: str, path: str, mode: str) -> BinPHandle:
+    """
+    fopen(path, mode) opens a file to read ('r'), write ('w') or append to ('a') and returns its handle.
+    A path in quotes is opened exactly as it is written, so it can have spaces in it
+    """
+    return current_context().files.open(line_num, line, path, mode)
+
+
+def builtin_fread_int(line_num: int, line: str, handle: BinPHandle) -> int:
+    """
+    fread_int(f) reads the next line of a file as an int
+    """
+    return current_context().files.get(line_num, line, handle).read_value(line_num, line, 'int')
+
+
+def builtin_fread_bool(line_num: int, line: str, handle: BinPHandle) -> bool:
+    """
+    fread_bool(f) reads the next line of a file as a bool
+    """
+    return current_context().files.get(line_num, line, handle).read_value(line_num, line, 'bool')
+
+
+def builtin_fread_str(line_num: int, line: str, handle: BinPHandle) -> str:
+    """
+    fread_str(f) reads the next line of a file as a str
+    """
+    return current_context().files.get(line_num, line, handle).read_value(line_num, line, 'str')
+
+
+def builtin_fwrite(line_num: int, line: str, handle: BinPHandle, text: str) -> str:
+    """
+    fwrite(f, text) writes text to a file as a line. text in quotes is written exactly as it is written
+    """
+    current_context().files.get(line_num, line, handle).write(line_num, line, text)
+    return 'null'
+
+
+def builtin_feof(line_num: int, line: str, handle: BinPHandle) -> bool:
+    """
+    feof(f) is true once there is nothing left to read from a file
+    """
+    return current_context().files.get(line_num, line, handle).at_eof()
+
+
+def builtin_fclose(line_num: int, line: str, handle: BinPHandle) -> str:
+    """
+    fclose(f) closes a file. files which are not closed are closed when the function that opened them returns
+    """
+    current_context().files.close(line_num, line, handle)
+    return 'null'
+
+
+def builtin_seq_range(line_num: int, line: str, start: int, stop: int, step: int) -> BinPSeq:
+    """
+    seq_range(start, stop, step) is the seq start, start + step, ... up to (but not including) stop
+    """
+    return sequences.seq_range(line_num, line, start, stop, step)
+
+
+def builtin_seq_len(line_num: int, line: str, xs: BinPSeq) -> int:
+    """
+    seq_len(xs) is the number of values in a seq
+    """
+    return len(xs)
+
+
+def builtin_seq_get(line_num: int, line: str, xs: BinPSeq, i: int) -> int:
+    """
+    seq_get(xs, i) is the value at position i of a seq, counting from 0
+    """
+    return xs.get(line_num, line, i)
+
+
+def builtin_seq_sum(line_num: int, line: str, xs: BinPSeq) -> int:
+    """
+    seq_sum(xs) is the sum of every value of a seq (0 for an empty seq)
+    """
+    return sequences.total(xs)
+
+
+def builtin_seq_min(line_num: int, line: str, xs: BinPSeq) -> int:
+    """
+    seq_min(xs) is the smallest value of a seq
+    """
+    return sequences.extreme(line_num, line, xs, largest=False)
+
+
+def builtin_seq_max(line_num: int, line: str, xs: BinPSeq) -> int:
+    """
+    seq_max(xs) is the largest value of a seq
+    """
+    return sequences.extreme(line_num, line, xs, largest=True)
+
+
+def builtin_seq_prefix(line_num: int, line: str, xs: BinPSeq) -> BinPSeq:
+    """
+    seq_prefix(xs) is the running total of a seq: each value is the sum of every value of xs up to it
+    """
+    return sequences.prefix_sums(xs)
+
+
+def builtin_seq_mask(line_num: int, line: str, xs: BinPSeq, op: str, y: int) -> BinPSeq:
+    """
+    seq_mask(xs, op, y) compares every value of a seq to y, giving 1 where it is true and 0 where it is false.
+    op is one of ==, !=, <, <=, > or >= in quotes, like seq_mask(xs, '>=', 10)
+    """
+    return sequences.mask(line_num, line, xs, op, y)
+
+
+def seq_operator(op: Operator) -> Callable:
+    """
+    :param op: an arithmetic operator
+    :return: the body of the builtin which applies the operator to every value of a seq,
+            with another seq of the same length or with an int
+    """
+    def body(line_num: int, line: str, xs: BinPSeq, y: BinPSeq | int) -> BinPSeq:
+        return sequences.elementwise(line_num, line, op, xs, y)
+    return body
+
+
+def builtin_map_new(line_num: int, line: str) -> BinPMap:
+    """
+    map_new() makes an empty map
+    """
+    return BinPMap()
+
+
+def builtin_map_get(line_num: int, line: str, m: BinPMap, key: int | str):
+    """
+    map_get(m, key) is the value of a key. it is an error if the key is not in the map
+    """
+    return m.get(line_num, line, key)
+
+
+def builtin_map_set(line_num: int, line: str, m: BinPMap, key: int | str, value) -> str:
+    """
+    map_set(m, key, value) sets the value of a key, adding the key if it is not in the map yet
+    """
+    m.set(line_num, line, key, value)
+    return 'null'
+
+
+def builtin_map_has(line_num: int, line: str, m: BinPMap, key: int | str) -> bool:
+    """
+    map_has(m, key) is true if a key is in the map
+    """
+    return m.contains(key)
+
+
+def builtin_map_remove(line_num: int, line: str, m: BinPMap, key: int | str) -> str:
+    """
+    map_remove(m, key) removes a key (and its value) from the map
+    """
+    m.remove(line_num, line, key)
+    return 'null'
+
+
+def builtin_map_size(line_num: int, line: str, m: BinPMap) -> int:
+    """
+    map_size(m) is the number of keys in the map
+    """
+    return len(m)
+
+
+def builtin_map_key(line_num: int, line: str, m: BinPMap, i: int) -> int | str:
+    """
+    map_key(m, i) is the key at position i of the map (the first is 0), in the order the keys were added
+    """
+    return m.key(line_num, line, i)
+
+
+BUILTINS = {
+    'eof': BinPBuiltin('eof', 'bool', [], builtin_eof),
+    'fopen': BinPBuiltin('fopen', 'file', [('str', 'path'), ('str', 'mode')], builtin_fopen),
+    'fread_int': BinPBuiltin('fread_int', 'int', [('file', 'f')], builtin_fread_int),
+    'fread_bool': BinPBuiltin('fread_bool', 'bool', [('file', 'f')], builtin_fread_bool),
+    'fread_str': BinPBuiltin('fread_str', 'str', [('file', 'f')], builtin_fread_str),
+    'fwrite': BinPBuiltin('fwrite', 'null', [('file', 'f'), ('str', 'text')], builtin_fwrite),
+    'feof': BinPBuiltin('feof', 'bool', [('file', 'f')], builtin_feof),
+    'fclose': BinPBuiltin('fclose', 'null', [('file', 'f')], builtin_fclose),
+
+    'seq_range': BinPBuiltin('seq_range', 'seq', [('int', 'start'), ('int', 'stop'), ('int', 'step')],
+                             builtin_seq_range, io=False),
+    'seq_len': BinPBuiltin('seq_len', 'int', [('seq', 'xs')], builtin_seq_len, io=False),
+    'seq_get': BinPBuiltin('seq_get', 'int', [('seq', 'xs'), ('int', 'i')], builtin_seq_get, io=False),
+    'seq_sum': BinPBuiltin('seq_sum', 'int', [('seq', 'xs')], builtin_seq_sum, io=False),
+    'seq_min': BinPBuiltin('seq_min', 'int', [('seq', 'xs')], builtin_seq_min, io=False),
+    'seq_max': BinPBuiltin('seq_max', 'int', [('seq', 'xs')], builtin_seq_max, io=False),
+    'seq_prefix': BinPBuiltin('seq_prefix', 'seq', [('seq', 'xs')], builtin_seq_prefix, io=False),
+    'seq_mask': BinPBuiltin('seq_mask', 'seq', [('seq', 'xs'), ('str', 'op'), ('int', 'y')],
+                            builtin_seq_mask, io=False),
+    'seq_add': BinPBuiltin('seq_add', 'seq', [('seq', 'xs'), ('seq|int', 'y')], seq_operator(Operator.ADD), io=False),
+    'seq_sub': BinPBuiltin('seq_sub', 'seq', [('seq', 'xs'), ('seq|int', 'y')], seq_operator(Operator.SUB), io=False),
+    'seq_mul': BinPBuiltin('seq_mul', 'seq', [('seq', 'xs'), ('seq|int', 'y')], seq_operator(Operator.MUL), io=False),
+    'seq_div': BinPBuiltin('seq_div', 'seq', [('seq', 'xs'), ('seq|int', 'y')], seq_operator(Operator.DIV), io=False),
+    'seq_mod': BinPBuiltin('seq_mod', 'seq', [('seq', 'xs'), ('seq|int', 'y')],
+                           seq_operator(Operator.MODULUS), io=False),
+
+    'map_new': BinPBuiltin('map_new', 'map', [], builtin_map_new, io=False),
+    'map_get': BinPBuiltin('map_get', 'any', [('map', 'm'), ('any', 'key')], builtin_map_get, io=False),
+    'map_set': BinPBuiltin('map_set', 'null', [('map', 'm'), ('any', 'key'), ('any', 'value')],
+                           builtin_map_set, io=False),
+    'map_has': BinPBuiltin('map_has', 'bool', [('map', 'm'), ('any', 'key')], builtin_map_has, io=False),
+    'map_remove': BinPBuiltin('map_remove', 'null', [('map', 'm'), ('any', 'key')], builtin_map_remove, io=False),
+    'map_size': BinPBuiltin('map_size', 'int', [('map', 'm')], builtin_map_size, io=False),
+    'map_key': BinPBuiltin('map_key', 'any', [('map', 'm'), ('int', 'i')], builtin_map_key, io=False),
+}
+
+
+def get_builtins(global_namespace: dict) -> dict:
+    """
+    This adds every builtin function to the global namespace
+    :param global_namespace: the global namespace
+    :return: the global namespace with the builtins added
+    """
+    global_namespace.update(BUILTINS)
+    return global_namespace
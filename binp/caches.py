@@ -0,0 +1,222 @@
+from operator import itemgetter
+
+from binp import evaluators, functions
+from binp.errors import BinPValueError
+from binp.expressions import Operator, BINARY_OPERATOR_MAP, gen_bool_tree, gen_math_tree, tree_type
+
+UNCACHEABLE = object()  # stored for a site whose expression always has to be evaluated the slow way
+CALL_PARAM_TYPES = {'int', 'bool'}  # the parameters a cached call can have, whose arguments evaluate the same either way
+
+
+class CachedExpression:
+    """
+    This class is an inline cache for one int or bool expression in a program (a site)
+
+    The first time a site is evaluated, its tokens are parsed into a tree once, and the tree is turned into
+    a function of the values of its operands. After that, evaluating the site only looks up its variables
+    and calls that function, instead of replacing variables and building a new tree every time
+
+    The cache is monomorphic: it only holds for the types the variables had when it was made.
+    Since the variables are looked up every time anyway, checking each one still has the same type
+    is the guard. When one does not (or is not there at all), the site is evaluated the slow way,
+    which also makes the same error it always has
+
+    Function calls in an int expression are call sites, which remember the function they called
+    and have their arguments split up (and their number checked) once. The guard for a call site is that
+    its name is still that same function. Calls run before any of the arithmetic, in the order they
+    were written, just like they do without the cache
+
+    :param boolean: true for a bool expression, false for an int expression
+    :param names: the variables in the expression, each one only once
+    :param types: the type of each variable when the cache was made
+    :param calls: the (name, function, arguments) of each call in the expression, in order
+    :param func: the function which takes the values of the operands (the variables in the same order as names,
+            then the result of each call) and evaluates the expression
+    """
+    __slots__ = ('boolean', 'names', 'types', 'calls', 'func')
+
+    def __init__(self, boolean: bool, names: list[str], types: list[type], calls: list[tuple], func):
+        self.boolean = boolean
+        self.names = names
+        self.types = types
+        self.calls = calls
+        self.func = func
+
+    def operands(self, line_num: int, line: str, local_namespace: dict) -> list:
+        """
+        This looks up the variables and runs the calls of the expression
+        :param line_num: the line number for error printing
+        :param line: the entire line with the expression
+        :param local_namespace: the namespace the expression is evaluated in
+        :return: the values to pass to func, or NO_VALUE if a guard failed (before anything was run)
+        """
+        get = local_namespace.get
+        values = [get(name) for name in self.names]
+        if list(map(type, values)) != self.types:
+            return evaluators.NO_VALUE
+        if not self.calls:
+            return values
+
+        for name, function, _ in self.calls:
+            if get(name) is not function:
+                return evaluators.NO_VALUE
+        for _, function, args in self.calls:
+            value = function.run(line_num, line, [list(arg) for arg in args], local_namespace)
+            if type(value) is not int:
+                raise BinPValueError(line_num, line, message="Invalid cast of type 'int'")
+            values.append(value)
+        return values
+
+
+def cached_expression(line: str, vals: list, local_namespace: dict, boolean: bool) -> CachedExpression | None:
+    """
+    This finds the inline cache of an expression, making it the first time the expression is evaluated.
+    The caches of a line are kept on the line, by the tokens of the expression
+    :param line: the line with the expression (only a SourceLine has caches)
+    :param vals: the tokens of the expression
+    :param local_namespace: the namespace the expression is evaluated in
+    :param boolean: true for a bool expression, false for an int expression
+    :return: the cache, or None if the expression has to be evaluated the slow way
+    """
+    sites = getattr(line, 'sites', None)
+    if sites is None:
+        return None
+    try:
+        key = tuple(vals)
+        cache = sites.get(key)
+    except TypeError:  # a value which was already evaluated, which can not be a key
+        return None
+
+    if cache is None:
+        cache = compile_expression(vals, local_namespace, boolean)
+        if cache is None:
+            return None
+        sites[key] = cache
+    if cache is UNCACHEABLE or cache.boolean is not boolean:
+        return None
+    return cache
+
+
+def compile_expression(vals: list, local_namespace: dict, boolean: bool):
+    """
+    This makes the inline cache of an expression
+    :param vals: the tokens of the expression
+    :param local_namespace: the namespace the expression is first evaluated in
+    :param boolean: true for a bool expression, false for an int expression
+    :return: the cache, UNCACHEABLE if it can never be cached, or None if it can not be cached this time
+            (some tokens were already evaluated, or the variables do not have types which can be cached yet)
+    """
+    if any(type(val) is not str for val in vals):
+        return None
+
+    names = []
+    types = []
+    calls = []
+    tokens = []  # the tokens, with the value each operand has now
+    operands = []  # for each operand, in order: ('name', position in names), ('call', position in calls) or None
+    i = 0
+    while i < len(vals):
+        val = vals[i]
+        if val in evaluators.SYMBOLS:
+            if val == ',' or (val == '(' and i > 0 and vals[i-1] not in evaluators.SYMBOLS):
+                return UNCACHEABLE  # not a call to a function we know of
+            tokens.append(val)
+            i += 1
+            continue
+
+        value = local_namespace.get(val, evaluators.NO_VALUE)
+        if i + 1 < len(vals) and vals[i+1] == '(' and isinstance(value, functions.BinPFunction):
+            end = call_end(vals, i + 1)
+            args = functions.split_arguments(vals[i+2:end])
+            if boolean or end is None or not cacheable_call(value, args):
+                return UNCACHEABLE  # calls in a bool expression are only run when they are needed
+            calls.append((val, value, args))
+            operands.append(('call', len(calls) - 1))
+            tokens.append(0)
+            i = end + 1
+            continue
+
+        if value is evaluators.NO_VALUE:
+            value = evaluators.parse_value(val)
+            if type(value) is str:
+                return None  # not a variable (yet)
+            operands.append(None)
+        elif type(value) is int or (boolean and type(value) is bool):
+            if val not in names:
+                names.append(val)
+                types.append(type(value))
+            operands.append(('name', names.index(val)))
+        else:
+            return None
+        if not boolean and type(value) is bool:
+            return UNCACHEABLE
+        tokens.append(value)
+        i += 1
+
+    try:
+        if boolean:
+            root = gen_bool_tree(tokens)
+            if tree_type(root) is not bool:
+                return UNCACHEABLE
+        else:
+            root = gen_math_tree(tokens)
+    except Exception:  # the slow way makes the error
+        return UNCACHEABLE
+
+    # the results of the calls come after the variables in the values passed to func
+    slots = [None if operand is None else operand[1] + (len(names) if operand[0] == 'call' else 0)
+             for operand in operands]
+    return CachedExpression(boolean, names, types, calls, compile_tree(root, iter(slots)))
+
+
+def call_end(vals: list, start: int) -> int | None:
+    """
+    :param vals: the tokens of an expression
+    :param start: the position of the parenthesis which opens a call
+    :return: the position of the parenthesis which closes it, or None if it is never closed
+    """
+    depth = 0
+    for i in range(start, len(vals)):
+        if vals[i] == '(':
+            depth += 1
+        elif vals[i] == ')':
+            depth -= 1
+            if depth == 0:
+                return i
+    return None
+
+
+def cacheable_call(function, args: list[list]) -> bool:
+    """
+    :param function: the function being called
+    :param args: the tokens of each argument
+    :return: true if the call can be a call site in an int expression
+    """
+    return function._return_type == 'int' and len(args) == len(function._params) and \
+        all(arg and param_type in CALL_PARAM_TYPES for arg, (param_type, _) in zip(args, function._params))
+
+
+def compile_tree(root, slots):
+    """
+    This turns an expression tree into a function of the values of its operands.
+    The operands of a tree are its leaves from left to right, which is the order they were written in
+    :param root: the root of the tree (which has already been checked by tree_type)
+    :param slots: for each leaf, in order: the position of its value, or None for a literal
+    :return: the function, which takes the list of values of the operands
+    """
+    op = root.op
+    if op is Operator.INT or op is Operator.BOOL:
+        slot = next(slots)
+        if slot is not None:
+            return itemgetter(slot)
+        value = root.val
+        return lambda values: value
+
+    left = compile_tree(root.left, slots)
+    right = compile_tree(root.right, slots)
+    if op is Operator.AND:
+        return lambda values: left(values) and right(values)
+    if op is Operator.OR:
+        return lambda values: left(values) or right(values)
+    func = BINARY_OPERATOR_MAP[op]
+    return lambda values: func(left(values), right(values))
@@ -0,0 +1,436 @@
+import os
+
+from binp.builtins import BUILTINS
+from binp.errors import BinPSyntaxError, BinPValueError, BinPArgumentError, BinPRuntimeError
+from binp.evaluators import parse_value, INT_OPERATORS
+from binp.expressions import gen_bool_tree, gen_math_tree, tree_type
+from binp.formatting import format_file
+from binp.functions import parse_parameter_declaration, split_arguments
+from binp.interpreter import valid_name
+from binp.modules import load_module, module_name
+
+VARIABLE_TYPES = {'int', 'str', 'bool', 'seq', 'map', 'file'}
+RETURN_TYPES = VARIABLE_TYPES | {'null'}
+BUILTIN_FUNCTIONS = {
+    'int_negate': ('int', 1),
+    'bool_negate': ('bool', 1),
+    **{name: (builtin._return_type, len(builtin._params)) for name, builtin in BUILTINS.items()},
+}
+PLACEHOLDERS = {'int': 0, 'bool': True}  # values with the right type, used to build expression trees
+
+
+class Block:
+    """
+    This class is a block which is still open while checking (an if, a while, a for or a function)
+    and must be closed by an end
+
+    :param kind: 'if', 'while', 'for' or 'func'
+    :param line_num: the line which opened the block
+    :param name: the name of the function (only for functions)
+    :param return_type: the return type of the function (only for functions)
+    """
+    def __init__(self, kind: str, line_num: int, name=None, return_type=None):
+        self.kind = kind
+        self.line_num = line_num
+        self.name = name
+        self.return_type = return_type
+        self.has_else = False
+
+
+class Checker:
+    """
+    This class statically checks an entire program before it runs. It verifies:
+        block structure (every if/while/for/func has its end, else is inside an if/while/for)
+        variable and parameter names and types
+        the types of expressions whose operands have a known type
+        return types of functions
+        the number of arguments of every call to a known function
+
+    Every error is collected, so a program reports all of its errors at once
+
+    A variable has a known type only when every declaration with that name in the whole program
+    has the same type. Since functions can see the variables of their caller, anything else
+    could have any type when the program runs, so it is not checked
+
+    function_ends maps the line declaring a function to how many lines later its 'end' is.
+    Lines declaring two different functions with the same text are left out
+
+    Imported modules are loaded (and cached) while checking, so calls to their functions are checked too.
+    The file of every module is checked as well (once, however many times it is imported),
+    and its errors are reported on the line of the import
+
+    :param lines: the formatted lines of the program
+    :param search_path: the directories imported modules are searched for in
+    :param checked_modules: the paths of the modules which have already been checked
+    """
+    def __init__(self, lines: list[str], search_path: list[str] = None, checked_modules: set[str] = None):
+        self.lines = lines
+        self.search_path = search_path if search_path is not None else []
+        self.checked_modules = checked_modules if checked_modules is not None else set()
+        self.errors = []
+        self.function_ends = {}
+        self.variable_types = {}
+        self.functions = {name: {signature} for name, signature in BUILTIN_FUNCTIONS.items()}
+        self._duplicate_declarations = set()
+
+    def check(self) -> list[Exception]:
+        """
+        This runs every check over the program
+        :return: a list of every error found, in order of line number
+        """
+        self.collect_declarations()
+        self.check_lines()
+        self.errors.sort(key=lambda err: err._num)
+        for line in self._duplicate_declarations:
+            self.function_ends.pop(line, None)
+        return self.errors
+
+    def collect_declarations(self) -> None:
+        """
+        This finds the type of every variable and the signature of every function,
+        so that uses before a declaration (or in a function body) can be checked
+        """
+        for line_num, line in enumerate(self.lines):
+            match line.split():
+                case ['var', return_type, 'func', name, '=', '(', *params, ')', '=', '>']:
+                    try:
+                        params = parse_parameter_declaration(line_num, line, params)
+                    except BinPSyntaxError:
+                        continue  # reported when checking the line
+                    signatures = self.functions.setdefault(name, set())
+                    if any(arg_count != len(params) for _, arg_count in signatures):
+                        self.errors.append(BinPArgumentError(line_num, line, message=f"Function '{name}' is declared "
+                                                             f"with different numbers of parameters"))
+                    signatures.add((return_type, len(params)))
+                    self.variable_types.setdefault(name, set()).add('func')
+                    for param_type, param_name in params:
+                        self.variable_types.setdefault(param_name, set()).add(param_type)
+                case ['var', var_type, name, '=', *_]:
+                    self.variable_types.setdefault(name, set()).add(var_type)
+                case ['for', '(', 'int', name, '=', *_]:
+                    self.variable_types.setdefault(name, set()).add('int')
+                case ['import', *vals] if vals:
+                    try:
+                        module = load_module(line_num, line, module_name(vals), self.search_path)
+                    except (BinPSyntaxError, BinPValueError, BinPArgumentError, BinPRuntimeError) as err:
+                        self.errors.append(err)
+                        continue
+                    for name, function in module.functions.items():
+                        self.functions.setdefault(name, set()).add((function._return_type, len(function._params)))
+                        self.variable_types.setdefault(name, set()).add('func')
+                    self.check_module(line_num, line, module.path)
+
+    def check_module(self, line_num: int, line: str, path: str) -> None:
+        """
+        This checks the file of an imported module
+        :param line_num: the line number of the import, for error printing
+        :param line: the line of the import, for error printing
+        :param path: the absolute path of the module
+        """
+        if path in self.checked_modules:
+            return
+        self.checked_modules.add(path)
+        try:
+            with open(path) as file:
+                lines = format_file(file)
+        except OSError:
+            self.errors.append(BinPValueError(line_num, line, message=f"Unable to read module '{path}'"))
+            return
+
+        # a module imports relative to its own directory first, the same way it does when it is loaded
+        checker = Checker(lines, [os.path.dirname(path), *self.search_path], self.checked_modules)
+        for err in checker.check():
+            self.errors.append(BinPRuntimeError(line_num, line, message=f"Error in module '{path}'\n{err}"))
+
+    def check_lines(self) -> None:
+        """
+        This checks every line, keeping track of which blocks are open
+        """
+        blocks: list[Block] = []
+        for line_num, line in enumerate(self.lines):
+            match line.split():
+                case [] | ['$', *_]:
+                    pass
+
+                case ['output', *_]:
+                    pass
+
+                case ['import']:
+                    self.errors.append(BinPSyntaxError(line_num, line, message="Missing the module to import"))
+
+                case ['import', *_]:
+                    pass  # checked when the declarations were collected
+
+                case ['end', name] if any(block.kind == 'func' and block.name == name for block in blocks):
+                    # the function ends here, even if blocks inside of it were never closed
+                    while blocks[-1].kind != 'func' or blocks[-1].name != name:
+                        self.unclosed(blocks.pop())
+                    block = blocks.pop()
+                    self.record_function_end(block.line_num, line_num)
+
+                case ['end', *_]:
+                    if not blocks or blocks[-1].kind == 'func':
+                        self.errors.append(BinPSyntaxError(line_num, line, message="Unexpected 'end'"))
+                    else:
+                        blocks.pop()
+
+                case ['else', *_]:
+                    if not blocks or blocks[-1].kind == 'func' or blocks[-1].has_else:
+                        self.errors.append(BinPSyntaxError(line_num, line, message="Unexpected 'else'"))
+                    else:
+                        blocks[-1].has_else = True
+
+                case ['if' | 'while' as kind, '(', *conditions, ')', '=', '>']:
+                    self.check_expression(line_num, line, 'bool', conditions)
+                    blocks.append(Block(kind, line_num))
+
+                case ['for', '(', 'int', name, '=', *bounds, ')', '=', '>']:
+                    self.check_name(line_num, line, name)
+                    bounds = split_arguments(bounds)
+                    if len(bounds) not in {2, 3}:
+                        self.errors.append(BinPSyntaxError(line_num, line, message="A for loop needs a start, "
+                                                                                   "a stop and an optional step"))
+                    for bound in bounds:
+                        self.check_expression(line_num, line, 'int', bound)
+                    blocks.append(Block('for', line_num))
+
+                case ['var', return_type, 'func', name, '=', '(', *params, ')', '=', '>']:
+                    self.check_name(line_num, line, name)
+                    if return_type not in RETURN_TYPES:
+                        self.errors.append(BinPValueError(line_num, line,
+                                                          message=f"Unknown return type '{return_type}'"))
+                    self.check_parameters(line_num, line, params)
+                    blocks.append(Block('func', line_num, name=name, return_type=return_type))
+
+                case ['var', var_type, name, '=', 'input']:
+                    self.check_name(line_num, line, name)
+                    self.check_type(line_num, line, var_type)
+
+                case ['var', var_type, name, '=', *vals]:
+                    self.check_name(line_num, line, name)
+                    if self.check_type(line_num, line, var_type):
+                        self.check_expression(line_num, line, var_type, vals)
+
+                case ['var', *_]:
+                    self.errors.append(BinPSyntaxError(line_num, line, message="Invalid variable assignment"))
+
+                case ['return', *vals]:
+                    function = next((block for block in reversed(blocks) if block.kind == 'func'), None)
+                    if function is not None:
+                        self.check_return(line_num, line, function.return_type, vals)
+
+                case [func_name, '(', *params, ')']:
+                    self.check_calls(line_num, line, [func_name, '(', *params, ')'], statement=True)
+
+                case _:
+                    self.errors.append(BinPSyntaxError(line_num, line))
+
+        for block in blocks:
+            self.unclosed(block)
+
+    def unclosed(self, block: Block) -> None:
+        """
+        This reports a block which never found its end
+        :param block: the block without an end
+        """
+        line = self.lines[block.line_num]
+        if block.kind == 'func':
+            self.errors.append(BinPSyntaxError(block.line_num, line,
+                                               message=f"Unable to find end of func '{block.name}'"))
+        else:
+            self.errors.append(BinPSyntaxError(block.line_num, line, message="Missing 'end' of if statement"))
+
+    def record_function_end(self, start: int, end: int) -> None:
+        """
+        This remembers where a function ends, so the interpreter does not have to search for it
+        :param start: the line declaring the function
+        :param end: the line with the end of the function
+        """
+        line = self.lines[start]
+        if line in self.function_ends and self.function_ends[line] != end - start:
+            self._duplicate_declarations.add(line)
+        self.function_ends[line] = end - start
+
+    def check_name(self, line_num: int, line: str, name: str) -> None:
+        """
+        This checks a variable name is valid
+        :param line_num: the line number for error printing
+        :param line: the line for error printing
+        :param name: the name to check
+        """
+        try:
+            valid_name(line_num, line, name)
+        except BinPSyntaxError as err:
+            self.errors.append(err)
+
+    def check_type(self, line_num: int, line: str, var_type: str) -> bool:
+        """
+        This checks a variable type is a type that exists
+        :param line_num: the line number for error printing
+        :param line: the line for error printing
+        :param var_type: the type to check
+        :return: true if the type is valid
+        """
+        if var_type in VARIABLE_TYPES:
+            return True
+        self.errors.append(BinPValueError(line_num, line, message=f"Unknown type '{var_type}'"))
+        return False
+
+    def check_parameters(self, line_num: int, line: str, params: list[str]) -> None:
+        """
+        This checks the parameter declaration of a function
+        :param line_num: the line number for error printing
+        :param line: the line for error printing
+        :param params: the un-parsed parameters
+        """
+        try:
+            params = parse_parameter_declaration(line_num, line, params)
+        except BinPSyntaxError as err:
+            self.errors.append(err)
+            return
+
+        for param_type, param_name in params:
+            self.check_type(line_num, line, param_type)
+            self.check_name(line_num, line, param_name)
+
+    def check_return(self, line_num: int, line: str, return_type: str, vals: list[str]) -> None:
+        """
+        This checks a return statement matches the return type of its function
+        :param line_num: the line number for error printing
+        :param line: the line for error printing
+        :param return_type: the return type of the function this return is in
+        :param vals: the values being returned
+        """
+        if vals in ([], ['null']):
+            if return_type != 'null':
+                self.errors.append(BinPValueError(line_num, line, message=f"Returned 'null' for type '{return_type}'"))
+        elif return_type == 'null':
+            self.errors.append(BinPValueError(line_num, line, message="Returned a value from a 'null' function"))
+        elif return_type in VARIABLE_TYPES:
+            self.check_expression(line_num, line, return_type, vals)
+
+    def check_expression(self, line_num: int, line: str, var_type: str, vals: list[str]) -> None:
+        """
+        This checks an expression can have the given type
+        :param line_num: the line number for error printing
+        :param line: the line for error printing
+        :param var_type: the type the expression should have
+        :param vals: the expression
+        """
+        tokens = self.check_calls(line_num, line, vals)
+        if tokens is None or var_type in {'str', 'seq', 'map', 'file'}:
+            return  # anything can be a string, and a seq, a map or a file is only known once it is made
+
+        tokens = [self.static_value(token) for token in tokens]
+        try:
+            if var_type == 'int':
+                if any(callable(token) for token in tokens):
+                    return  # values of unknown type can only be checked when they are used
+                if any(type(token) is not int and token not in INT_OPERATORS for token in tokens):
+                    raise BinPValueError(line_num, line, message="Invalid cast of type 'int'")
+                gen_math_tree(tokens)
+            else:
+                root = gen_bool_tree(tokens)
+                if tree_type(root) is int:
+                    raise BinPValueError(line_num, line, message="Invalid cast of type 'bool'")
+        except BinPValueError as err:
+            self.errors.append(err)
+        except (AssertionError, IndexError, TypeError) as err:
+            message = str(err) or "Invalid expression"
+            self.errors.append(BinPRuntimeError(line_num, line, message=message))
+
+    def static_value(self, token):
+        """
+        This converts a token into a value with the type it will have when the program runs
+        (like 0 for an int variable), or a function when the type is unknown
+        :param token: the token to convert
+        :return: the placeholder value
+        """
+        if not isinstance(token, str):
+            return token
+        if token in self.variable_types:
+            types = self.variable_types[token]
+            if len(types) == 1 and next(iter(types)) in PLACEHOLDERS:
+                return PLACEHOLDERS[next(iter(types))]
+            return unknown_value
+        if token.isidentifier() and token not in {'true', 'True', 'false', 'False'}:
+            return unknown_value  # might be a variable of a caller, or a command line argument
+        return parse_value(token)
+
+    def check_calls(self, line_num: int, line: str, vals: list[str], statement=False) -> list | None:
+        """
+        This checks the number of arguments of every call to a known function in vals,
+        and replaces each call with a value of its return type
+        :param line_num: the line number for error printing
+        :param line: the line for error printing
+        :param vals: the values to search for function calls
+        :param statement: true if vals is a function call on its own line
+        :return: vals with each call replaced, or None if a call is invalid
+        """
+        retval = []
+        i = 0
+        while i < len(vals):
+            name = vals[i]
+            if i + 1 >= len(vals) or vals[i+1] != '(' or name not in self.functions:
+                if statement and i == 0:
+                    self.errors.append(BinPValueError(line_num, line, message=f"Unable to find function '{name}'"))
+                    return None
+                retval.append(name)
+                i += 1
+                continue
+
+            # find the end of the call, and count its arguments
+            depth = 0
+            arg_count = 0
+            end_i = i + 1
+            while end_i < len(vals):
+                if vals[end_i] == '(':
+                    depth += 1
+                elif vals[end_i] == ')':
+                    depth -= 1
+                    if depth == 0:
+                        break
+                elif vals[end_i] == ',' and depth == 1:
+                    arg_count += 1
+                end_i += 1
+            if end_i == len(vals):
+                self.errors.append(BinPSyntaxError(line_num, line, message="Improper end to function call"))
+                return None
+            if end_i > i + 2:
+                arg_count += 1  # there is one more argument than commas
+
+            signatures = self.functions[name]
+            if arg_count not in {count for _, count in signatures}:
+                self.errors.append(BinPArgumentError(line_num, line,
+                                                     message=f"Incorrect number of arguments in {name} call"))
+            self.check_calls(line_num, line, vals[i+2:end_i])  # calls inside the arguments
+
+            return_types = {return_type for return_type, _ in signatures}
+            if len(return_types) == 1 and next(iter(return_types)) in PLACEHOLDERS:
+                retval.append(PLACEHOLDERS[next(iter(return_types))])
+            else:
+                retval.append(unknown_value)
+            i = end_i + 1
+
+        return retval
+
+
+def unknown_value():
+    """
+    A placeholder for a value whose type is not known until the program runs
+    (expression trees treat it like a function call)
+    """
+    return None
+
+
+def check_program(lines: list[str], search_path: list[str] = None) -> (list[Exception], dict):
+    """
+    This statically checks a program before running it
+    :param lines: the formatted lines of the program
+    :param search_path: the directories imported modules are searched for in
+    :return: a list of every error found, and where each function ends
+            (a dictionary from the line declaring the function to the number of lines until its end)
+    """
+    checker = Checker(lines, search_path)
+    errors = checker.check()
+    return errors, checker.function_ends
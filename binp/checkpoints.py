@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+import time
+
+from binp.errors import BinPCheckpointError, BinPSessionError, BinPSyntaxError
+from binp.files import OpenFiles, FILE_MODES
+from binp.lexer import SourceLine
+from binp.sessions import encode_value, decode_value
+
+CHECKPOINT_FORMAT = 'binp-checkpoint'
+CHECKPOINT_VERSION = 2
+DEFAULT_INTERVAL = 60.0  # seconds between checkpoints, when --checkpoint-every is not given
+
+
+def source_hash(lines: list[str]) -> str:
+    """
+    :param lines: the lines of a program
+    :return: a hash of the program as it was written, so a checkpoint is never resumed by a different program
+    """
+    text = '\n'.join(line.raw if isinstance(line, SourceLine) else line for line in lines)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def can_checkpoint(lines: list[str]) -> bool:
+    """
+    A checkpoint can only be saved between the statements of the main program (and the iterations
+    of a while loop written straight in it). A program whose work is all done by one statement,
+    like a call of its main function or a for loop, can never save one
+    :param lines: the formatted lines of the main program
+    :return: true if the program has a top level while loop, or two top level statements which do work
+    """
+    from binp.records import block_end  # only loaded when it is used
+
+    statements = 0
+    line_num = 0
+    while line_num < len(lines):
+        words = lines[line_num].split()
+        match words:
+            case [] | ['$', *_] | ['import', *_]:
+                pass
+            case ['while', *_]:
+                return True
+            case ['var', _, 'func', *_]:
+                pass  # a function only does work when it is called
+            case _:
+                statements += 1
+        if words[-2:] == ['=', '>']:
+            try:
+                line_num = block_end(lines, line_num)
+            except BinPSyntaxError:
+                return True  # the program reports its missing end when it runs
+        line_num += 1
+    return statements >= 2
+
+
+class Checkpointer:
+    """
+    This class saves the state of a running program to a file every few seconds, for --checkpoint
+
+    A checkpoint is only taken between two statements of the main program (never inside of a function call
+    or an if), so the whole state of the program is its global namespace, its open files and the line it is on.
+    A while loop written straight in the main program goes back to its first line after every iteration,
+    so a long loop is checkpointed between its iterations. A while loop inside an if, another while,
+    a for loop or a function runs as one statement of its block, so it is not checkpointed until it finishes.
+    The stack of function calls is never saved, so a program which can never be checkpointed is refused
+    (see can_checkpoint) instead of running without ever saving one
+
+    The file is written to a temporary file first, then renamed over the old checkpoint,
+    so a program which is stopped while writing one always leaves the last complete checkpoint behind
+
+    :param path: the file to save checkpoints to
+    :param lines: the lines of the main program
+    :param interval: the least number of seconds between two checkpoints (0 checkpoints every statement)
+    """
+    def __init__(self, path: str, lines: list[str], interval: float = DEFAULT_INTERVAL):
+        self.path = path
+        self.lines = lines
+        self.interval = interval
+        self.saved = 0
+        self._hash = source_hash(lines)
+        self._next = time.monotonic() + interval
+
+    def due(self) -> bool:
+        """
+        :return: true if it is time for another checkpoint
+        """
+        return time.monotonic() >= self._next
+
+    def save(self, line_num: int, global_namespace: dict, lines_read: int, files: OpenFiles) -> None:
+        """
+        This writes a checkpoint
+        :param line_num: the line the program is about to run
+        :param global_namespace: the global namespace of the program
+        :param lines_read: the number of lines of input the program has read
+        :param files: the files the program has open, which are saved with where they are up to
+        """
+        try:
+            namespace = {name: encode_value(self.path, name, value) for name, value in global_namespace.items()}
+        except BinPSessionError as err:
+            raise BinPCheckpointError(self.path, message=err._reason)
+
+        checkpoint = {
+            'format': CHECKPOINT_FORMAT,
+            'version': CHECKPOINT_VERSION,
+            'source': self._hash,
+            'line': line_num,
+            'input_lines': lines_read,
+            'namespace': namespace,
+            'files': files.state(),
+            'next_handle': files.next_handle,
+        }
+        temporary = f'{self.path}.tmp'
+        try:
+            with open(temporary, 'w') as file:
+                json.dump(checkpoint, file, separators=(',', ':'))
+                file.flush()
+                os.fsync(file.fileno())  # the checkpoint has to survive the machine restarting, not just the program
+            os.replace(temporary, self.path)
+        except OSError as err:
+            raise BinPCheckpointError(self.path, message=f"Unable to write checkpoint ({err.strerror})")
+
+        self.saved += 1
+        self._next = time.monotonic() + self.interval
+
+    def load(self, files: OpenFiles) -> (int, dict, int):
+        """
+        This reads the checkpoint saved by a program which was stopped
+        :param files: the open files of the resumed program, which the files of the checkpoint are reopened into
+        :return: the line to continue from, the global namespace and the number of lines of input already read
+        """
+        try:
+            with open(self.path) as file:
+                checkpoint = json.load(file)
+        except OSError as err:
+            raise BinPCheckpointError(self.path, message=f"Unable to read checkpoint ({err.strerror})")
+        except json.JSONDecodeError:
+            raise BinPCheckpointError(self.path, message="File is not a checkpoint")
+
+        if not isinstance(checkpoint, dict) or checkpoint.get('format') != CHECKPOINT_FORMAT:
+            raise BinPCheckpointError(self.path, message="File is not a checkpoint")
+        if checkpoint.get('version') != CHECKPOINT_VERSION:
+            raise BinPCheckpointError(self.path, message=f"Unsupported checkpoint version {checkpoint.get('version')}")
+        if checkpoint.get('source') != self._hash:
+            raise BinPCheckpointError(self.path, message="The program has changed since the checkpoint was saved")
+
+        line_num = checkpoint.get('line')
+        if type(line_num) is not int or not 0 <= line_num <= len(self.lines):
+            raise BinPCheckpointError(self.path, message="Invalid line to resume from")
+        if not isinstance(checkpoint.get('namespace'), dict):
+            raise BinPCheckpointError(self.path, message="File is not a checkpoint")
+        handles = self.reopen_files(checkpoint, files)
+        try:
+            global_namespace = {name: decode_value(self.path, name, value, handles)
+                                for name, value in checkpoint['namespace'].items()}
+        except BinPSessionError as err:
+            raise BinPCheckpointError(self.path, message=err._reason)
+        return line_num, global_namespace, checkpoint.get('input_lines', 0)
+
+    def reopen_files(self, checkpoint: dict, files: OpenFiles) -> dict:
+        """
+        This opens the files which were open when the checkpoint was saved again, where they were up to
+        :param checkpoint: the checkpoint
+        :param files: the open files of the resumed program
+        :return: the number of each handle -> the handle
+        """
+        state, next_handle = checkpoint.get('files'), checkpoint.get('next_handle')
+        if type(state) is not list or type(next_handle) is not int or not all(
+                type(file) is list and len(file) == 4 and type(file[0]) is int and type(file[1]) is str and
+                file[2] in FILE_MODES and type(file[3]) is int for file in state):
+            raise BinPCheckpointError(self.path, message="Invalid open files")
+        try:
+            return files.restore(state, next_handle)
+        except OSError as err:
+            raise BinPCheckpointError(self.path, message=f"Unable to reopen file '{err.filename}' ({err.strerror})")
+
+    def remove(self) -> None:
+        """
+        This removes the checkpoint, once the program has finished
+        """
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,313 @@
+import os
+import sys
+import time
+
+from binp.builtins import get_builtins
+from binp.context import Context
+from binp.errors import BinPExit, BinPCheckpointError, BinPSyntaxError, eprint
+from binp.formatting import format_file
+from binp.inputs import stdin_reader
+from binp.interpreter import run_program, get_cli_args, get_unaries
+
+
+USAGE = "[--check] [--stats[=FILE]] [--memprofile[=FILE]] [--checkpoint=FILE [--checkpoint-every=SECONDS] " \
+        "[--resume]] [--each-line [--fields[=SEPARATOR]]] [--output-format=text|jsonl] [--emit-python=FILE] " \
+        "<SOURCE PROGRAM> <ARGUMENTS>"
+# options which can come before the source program
+OPTIONS = {'--check', '--stats', '--memprofile', '--checkpoint', '--checkpoint-every', '--resume',
+           '--each-line', '--fields', '--output-format', '--emit-python'}
+# options which can also be given a value, like --stats=FILE
+VALUE_OPTIONS = {'--stats', '--memprofile', '--checkpoint', '--checkpoint-every', '--fields', '--output-format',
+                 '--emit-python'}
+OUTPUT_FORMATS = {'text', 'jsonl'}
+
+
+def get_options(args: list[str]) -> tuple[dict[str, str | None], list[str]]:
+    """
+    This takes the leading options off of the command line arguments
+    (argparse is not used, it takes longer to import than most programs take to run)
+    :param args: the command line arguments, without the name of the script
+    :return: the options given (each one -> its value, or None) and the remaining arguments
+    """
+    options = {}
+    while args:
+        name, equals, value = args[0].partition('=')
+        if name not in OPTIONS or (equals and name not in VALUE_OPTIONS):
+            break
+        options[name] = value if equals else None
+        args = args[1:]
+    return options, args
+
+
+def get_source_file(filename: str):
+    """
+    Checks the source filename from the command line arguments
+    **This exits the program via sys.exit() if the file does not exist**
+
+    :param filename: the filename given on the command line
+    :returns the source file input from command line arguments
+    """
+    if not os.path.exists(filename):
+        eprint("The source program does not exist!")
+        eprint(f"python {sys.argv[0]} {USAGE}")
+        sys.exit(1)
+
+    if not os.path.isfile(filename):
+        eprint("The input is not a file!")
+        eprint(f"python {sys.argv[0]} {USAGE}")
+        sys.exit(1)
+
+    if filename[-5:] != '.binp':
+        eprint('Source file must be a .binp file!')
+        eprint(f"python {sys.argv[0]} {USAGE}")
+        sys.exit(1)
+
+    return filename
+
+
+def main() -> None:
+    """
+    takes a filename as an input, reads it and runs it as a binary+ program
+    :return: the output for the program
+    """
+    args = sys.argv
+    if len(args) <= 1:  # interactive version
+        from binp.repl import run_interactive  # the prompt (and sessions) are only loaded when they are used
+        global_namespace = get_builtins(get_unaries({}))  # interactive starts with no CLI and only builtins
+        try:
+            run_interactive(global_namespace, context=Context())
+        except BinPExit as stopped:
+            sys.exit(stopped.code)
+        return
+
+    if args[1] == '--session':  # interactive version, saved to and restored from a file
+        if len(args) != 3:
+            eprint(f"python {args[0]} --session <SESSION FILE>")
+            sys.exit(1)
+        from binp.repl import run_interactive
+        try:
+            run_interactive(get_builtins(get_unaries({})), session_file=args[2], context=Context())
+        except BinPExit as stopped:
+            sys.exit(stopped.code)
+        return
+
+    options, args = get_options(args[1:])
+    if not args:
+        eprint(f"python {sys.argv[0]} {USAGE}")
+        sys.exit(1)
+    output_format = get_output_format(options)
+
+    # getting and loading file
+    filename = get_source_file(args[0])
+    try:
+        file = open(filename)
+    except OSError:
+        eprint("Unable to open file")
+        sys.exit(1)
+
+    # running the code in the file
+    global_namespace = {
+        **get_cli_args(args[1:]),
+    }
+    global_namespace = get_builtins(get_unaries(global_namespace))
+    stats = None
+    if '--stats' in options:
+        from binp.stats import Stats  # only loaded when it is used
+        stats = Stats()
+    start = time.perf_counter()
+    lines = format_file(file)
+    memprofile = None
+    if '--memprofile' in options:
+        from binp.memprofile import MemoryProfiler  # only loaded when it is used
+        memprofile = MemoryProfiler()
+    checkpoint = get_checkpoint(options, lines)
+    context = Context(stdin=stdin_reader(), stats=stats, memprofile=memprofile, checkpoint=checkpoint,
+                      search_path=[os.path.dirname(os.path.abspath(filename))],  # imports are found next to the file
+                      output_format=output_format)
+    records = get_record_program(options, lines, context)
+    resume_line = 0
+    if '--resume' in options and os.path.exists(checkpoint.path):  # the first run starts from the beginning
+        resume_line, global_namespace, lines_read = load_checkpoint(checkpoint, context)
+        context.stdin.skip(lines_read)
+    if '--check' in options:
+        context.checked = True
+        context.function_ends = check_source(lines if records is None else records.program, context)
+    if '--emit-python' in options:
+        emit_python(options, filename, lines, context)
+    if stats is not None:
+        stats.parse_time = time.perf_counter() - start
+        stats.start()
+    if memprofile is not None:
+        memprofile.start(global_namespace)
+    try:
+        if records is not None:
+            from binp.records import run_records
+            run_records(records, global_namespace, context,
+                        fields='--fields' in options, separator=options.get('--fields') or None)
+        else:
+            run_program(lines, global_namespace, context, start=resume_line)
+        if checkpoint is not None:
+            checkpoint.remove()  # the program finished, so there is nothing left to resume
+    except BinPExit as stopped:
+        sys.exit(stopped.code)
+    finally:
+        if memprofile is not None:  # stopped first, so closing files and the reports are not charged to the program
+            memprofile.stop()
+        context.files.close_all()  # anything still buffered is written, even when the program exits with an error
+        if stats is not None:  # the report is written even when the program exits with an error
+            stats.stop()
+            stats.write(options['--stats'])
+        if memprofile is not None:
+            memprofile.write(options['--memprofile'])
+
+
+def get_output_format(options: dict[str, str | None]) -> str:
+    """
+    This gets the format of the output, from --output-format
+    **This exits the program via sys.exit() if the format is not one there is**
+
+    :param options: the options given on the command line
+    :return: 'text' (when --output-format is not given) or 'jsonl'
+    """
+    if '--output-format' not in options:
+        return 'text'
+    if options['--output-format'] not in OUTPUT_FORMATS:
+        eprint(f"--output-format needs one of {', '.join(sorted(OUTPUT_FORMATS))} (--output-format=FORMAT)")
+        sys.exit(1)
+    return options['--output-format']
+
+
+def get_record_program(options: dict[str, str | None], lines: list[str], context: Context):
+    """
+    This splits the program into its BEGIN and END blocks and its body, for --each-line
+    **This exits the program via sys.exit() if the options are invalid or a block has no end**
+
+    :param options: the options given on the command line
+    :param lines: the formatted lines of the program
+    :param context: the context the program runs in, which reports the error
+    :return: the RecordProgram, or None if the program does not run once per line
+    """
+    if '--each-line' not in options:
+        if '--fields' in options:
+            eprint("--fields can only be used with --each-line")
+            sys.exit(1)
+        return None
+    if '--checkpoint' in options:
+        eprint("--checkpoint can not be used with --each-line")
+        sys.exit(1)
+
+    from binp.records import split_blocks  # only loaded when it is used
+
+    try:
+        return split_blocks(lines)
+    except BinPSyntaxError as err:
+        context.error(err)
+        sys.exit(3)
+
+
+def emit_python(options: dict[str, str | None], filename: str, lines: list[str], context: Context) -> None:
+    """
+    This compiles the program to a python module instead of running it, for --emit-python
+    **This exits the program via sys.exit()**
+
+    :param options: the options given on the command line
+    :param filename: the file of the program
+    :param lines: the formatted lines of the program
+    :param context: the context the program runs in, which reports the error
+    """
+    if not options['--emit-python']:
+        eprint("--emit-python needs a file to write the module to (--emit-python=FILE)")
+        sys.exit(1)
+    if '--each-line' in options:
+        eprint("--emit-python can not be used with --each-line")
+        sys.exit(1)
+
+    from binp.transpiler import transpile  # only loaded when it is used
+
+    try:
+        source = transpile(lines, filename, options['--emit-python'])
+    except BinPSyntaxError as err:
+        context.error(err)
+        sys.exit(3)
+    try:
+        with open(options['--emit-python'], 'w') as module:
+            module.write(source)
+    except OSError:
+        eprint(f"Unable to write {options['--emit-python']}")
+        sys.exit(1)
+    sys.exit(0)
+
+
+def get_checkpoint(options: dict[str, str | None], lines: list[str]):
+    """
+    This makes the Checkpointer for --checkpoint
+    **This exits the program via sys.exit() if the options are invalid or the program can never be checkpointed**
+
+    :param options: the options given on the command line
+    :param lines: the formatted lines of the program
+    :return: the Checkpointer, or None if the program is not checkpointed
+    """
+    if '--checkpoint' not in options:
+        if '--resume' in options or '--checkpoint-every' in options:
+            eprint("--resume and --checkpoint-every need a checkpoint file (--checkpoint=FILE)")
+            sys.exit(1)
+        return None
+    if not options['--checkpoint']:
+        eprint("--checkpoint needs a file to save to (--checkpoint=FILE)")
+        sys.exit(1)
+
+    from binp.checkpoints import Checkpointer, DEFAULT_INTERVAL, can_checkpoint  # only loaded when it is used
+
+    if '--each-line' not in options and not can_checkpoint(lines):  # (--each-line reports its own error)
+        eprint("--checkpoint can never save a checkpoint of this program. Checkpoints are only saved between "
+               "the statements of the main program and the iterations of its while loops, "
+               "never inside a function call, an if or a for loop")
+        sys.exit(1)
+
+    interval = DEFAULT_INTERVAL
+    if '--checkpoint-every' in options:
+        try:
+            interval = float(options['--checkpoint-every'])
+        except (TypeError, ValueError):
+            interval = -1
+        if not interval >= 0:
+            eprint("--checkpoint-every needs a number of seconds (--checkpoint-every=SECONDS)")
+            sys.exit(1)
+    return Checkpointer(options['--checkpoint'], lines, interval)
+
+
+def load_checkpoint(checkpoint, context: Context) -> (int, dict, int):
+    """
+    This reads the checkpoint a program is resumed from
+    **This exits the program via sys.exit() if the checkpoint can not be resumed**
+
+    :param checkpoint: the Checkpointer of the program
+    :param context: the context the program runs in, which reports the error
+    :return: the line to continue from, the global namespace and the number of lines of input already read
+    """
+    try:
+        return checkpoint.load(context.files)
+    except BinPCheckpointError as err:
+        context.error(err)
+        sys.exit(1)
+
+
+def check_source(lines: list[str], context: Context) -> dict[str, int]:
+    """
+    This statically checks a program before it runs
+    **This exits the program via sys.exit() if any errors are found**
+
+    :param lines: the formatted lines of the program
+    :param context: the context the program runs in, with the directories imported modules are searched for in
+    :return: the line declaring each function -> the number of lines until its end
+    """
+    from binp.checker import check_program  # only loaded when it is used
+
+    errors, function_ends = check_program(lines, context.search_path)
+    if errors:
+        for error in errors:
+            context.error(error)
+        if context.output_format == 'text':
+            eprint(f"{len(errors)} error{'s' if len(errors) != 1 else ''} found")
+        sys.exit(3)
+    return function_ends
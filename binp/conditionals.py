@@ -1,5 +1,9 @@
-from errors import BinPSyntaxError
-from evaluators import bool_eval
+from binp import interpreter
+from binp.context import current_context
+from binp.errors import BinPSyntaxError, BinPValueError
+from binp.evaluators import bool_eval, int_eval, single_value, NO_VALUE
+from binp.functions import split_arguments
+from binp.formatting import format_line, INTERACTIVE_PRINT_NESTED
 
 
 def handle_if(line_num: int, lines: list[str], conditions: list[str], namespace: dict,
@@ -86,6 +90,76 @@ def handle_while(line_num: int, lines: list[str], conditions: list[str], namespa
     return namespace, line_of_while, retval
 
 
+def handle_for(line_num: int, lines: list[str], name: str, bounds: list[str], namespace: dict,
+               execute=True, interactive=False, skip_input=False) -> (dict, int, list[str]):
+    """
+    This runs a counted loop. The loop variable starts at the first bound and goes up by the step
+    (or down, when the step is negative) until it reaches the second bound, which is not included.
+    The bounds and the step are only evaluated once, before the loop starts,
+    and the loop variable is set at the start of every iteration
+
+    Just like a while loop, an else statement executes once after the loop finishes
+
+    for (int [name] = [start], [stop]) =>
+    [...]
+    end
+
+    for (int [name] = [start], [stop], [step]) =>
+    [...]
+    else =>
+    [...]
+    end
+
+    :param line_num: the line number for the start of the for loop
+    :param lines: this is needed to parse through what is in the for loop
+    :param name: the name of the loop variable
+    :param bounds: the start, stop and (optional) step, separated by commas
+    :param namespace: the namespace which will be edited in this for loop
+    :param execute: if this is false, do not actually execute anything inside the for loop
+    :param interactive: if this is false, we want to call a different run_condition that
+                        instead allows the user to type lines one at a time
+    :param skip_input: if this is true, we do not want to take input from the user
+            during interactive mode (this is for while loop)
+    :return: this returns the modified namespace, along with the line number of the end of the loop
+            it can also pass return values out of a function
+    """
+    def run_body(condition: bool, skip: bool):
+        if interactive:
+            return run_condition_interactive(line_num + 1, lines, condition, namespace,
+                                             execute=execute, skip_input=skip)
+        return run_condition(line_num + 1, lines, condition, namespace, execute=execute)
+
+    if not execute:
+        return run_body(False, skip_input)
+
+    line = lines[line_num]
+    if not current_context().checked:
+        interpreter.valid_name(line_num, line, name)
+    values = []
+    for bound in split_arguments(bounds):
+        value = single_value(bound, namespace, 'int')
+        values.append(int_eval(line_num, line, bound, namespace) if value is NO_VALUE else value)
+
+    match values:
+        case [start, stop]:
+            step = 1
+        case [start, stop, step] if step != 0:
+            pass
+        case [_, _, _]:
+            raise BinPValueError(line_num, line, message="The step of a for loop can not be 0")
+        case _:
+            raise BinPSyntaxError(line_num, line, message="A for loop needs a start, a stop and an optional step")
+
+    for i in range(start, stop, step):
+        namespace[name] = i
+        namespace, end_line, retval = run_body(True, skip_input)
+        if retval is not None:
+            return namespace, end_line, retval
+        skip_input = True  # the lines of the loop have been typed in now
+
+    return run_body(False, skip_input)  # run the else (if there is one) and find the end
+
+
 def run_condition(line_num: int, lines: list[str], condition: bool, namespace: dict,
                   execute=True) -> (dict, int, list[str]):
     """
@@ -103,8 +177,6 @@ def run_condition(line_num: int, lines: list[str], condition: bool, namespace: d
             as well as the line number of the end of this conditional,
             and a retval if something was returned from this conditional
     """
-    from main import parse_line
-
     if_statement_line_num = line_num  # stored for error printing later
     while line_num < len(lines):
         if lines[line_num] == '':
@@ -121,8 +193,8 @@ def run_condition(line_num: int, lines: list[str], condition: bool, namespace: d
                 line_num += 1
 
             case _:
-                namespace, line_num, retval = parse_line(line_num, lines, namespace,
-                                                         execute=(condition and execute))
+                namespace, line_num, retval = interpreter.parse_line(line_num, lines, namespace,
+                                                                     execute=(condition and execute))
                 if retval is not None:  # we got a return from a function, so we need to pass it on
                     return namespace, line_num, retval
 
@@ -151,11 +223,9 @@ def run_condition_interactive(line_num: int, lines: list[str], condition: bool,
             as well as the line number of the end of this conditional,
             and a retval if something was returned from this conditional
     """
-    from main import parse_line, format_line, INTERACTIVE_PRINT_NESTED
-
     while True:
         if not skip_input:
-            line = format_line(input(INTERACTIVE_PRINT_NESTED))
+            line = format_line(current_context().prompt(INTERACTIVE_PRINT_NESTED))
             lines.append(line)
         else:
             line = lines[line_num]
@@ -172,9 +242,9 @@ def run_condition_interactive(line_num: int, lines: list[str], condition: bool,
                 line_num += 1
 
             case _:
-                namespace, line_num, retval = parse_line(line_num, lines, namespace,
-                                                         execute=(condition and execute),
-                                                         interactive=True,
-                                                         skip_input=skip_input)
+                namespace, line_num, retval = interpreter.parse_line(line_num, lines, namespace,
+                                                                     execute=(condition and execute),
+                                                                     interactive=True,
+                                                                     skip_input=skip_input)
                 if retval is not None:  # we got a return from a function, so we need to pass it on
                     return namespace, line_num, retval
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import sys
+import time
+from contextvars import ContextVar
+
+from binp.errors import BinPExit
+from binp.files import OpenFiles
+from binp.formatting import BEGIN_PRINT
+from binp.inputs import InputReader
+
+# the profilers are only named in annotations here, and only loaded when --stats or --memprofile is given.
+# type checkers treat TYPE_CHECKING the same as typing.TYPE_CHECKING, which would take longer to import than hello_world
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from binp.memprofile import MemoryProfiler
+    from binp.stats import Stats
+
+
+class Context:
+    """
+    This class holds everything a running program uses besides its namespace:
+    where it reads input from and writes output to, its limits, its caches, its open files
+    and what the static checker found. Nothing about a running program is stored in a module,
+    so any number of programs can run at the same time (on different threads) as long as
+    each one has its own context
+
+    The context is passed to run_program (or run_interactive), which makes it the current context
+    for everything that program runs. Since it is a ContextVar, every thread has its own current context,
+    and the evaluators do not all need another parameter to pass it along
+
+    :param stdin: the InputReader for 'input', by default one which prompts with input()
+    :param stdout: the text stream output is written to, by default sys.stdout
+    :param stderr: the text stream errors are written to, by default sys.stderr
+    :param checked: true when the program passed the static checker, so repeated runtime checks can be skipped
+    :param function_ends: from the checker: the line declaring a function -> the number of lines until its end
+    :param max_call_depth: how deep function calls can go before the program stops, or None for no limit
+    :param stats: the Stats to count what the program does in (for --stats), or None to not count anything
+    :param memprofile: the MemoryProfiler to charge memory to lines with (for --memprofile), or None
+    :param search_path: the directories searched for imported modules (before BINP_PATH and the current directory)
+    :param checkpoint: the Checkpointer which saves the program every few seconds (for --checkpoint), or None
+    :param output_format: 'text' to output lines after ' >> ', or 'jsonl' to output (and report errors as)
+            one JSON record per line (for --output-format=jsonl)
+    """
+    def __init__(self, stdin: InputReader = None, stdout=None, stderr=None,
+                 checked=False, function_ends: dict[str, int] = None, max_call_depth: int = None,
+                 stats: Stats = None, memprofile: MemoryProfiler = None, search_path: list[str] = None,
+                 checkpoint=None, output_format: str = 'text'):
+        self.stdin = stdin if stdin is not None else InputReader()
+        self.stdout = stdout
+        self.stderr = stderr
+        self.checked = checked
+        self.function_ends = function_ends if function_ends is not None else {}
+        self.max_call_depth = max_call_depth
+        self.call_depth = 0
+        self.stats = stats
+        self.memprofile = memprofile
+        self.search_path = search_path if search_path is not None else []
+        self.checkpoint = checkpoint
+        self.output_format = output_format
+
+        # (id of the lines, line number of the declaration) -> (the lines, the function, the line of its end)
+        # the lines are kept so their id can never be reused by a different list
+        self.function_templates = {}
+        self.files = OpenFiles()
+
+    def output(self, text: str) -> None:
+        """
+        This writes a line of output
+        :param text: the text to write
+        """
+        self.write(f'{BEGIN_PRINT}{text}')
+
+    def write(self, text: str) -> None:
+        """
+        This writes a line to stdout as it is (a line of output, or a record for --output-format=jsonl)
+        :param text: the line to write
+        """
+        if self.stats is None:
+            print(text, file=self.stdout if self.stdout is not None else sys.stdout)
+            return
+
+        start = time.perf_counter()
+        text = f'{text}\n'
+        (self.stdout if self.stdout is not None else sys.stdout).write(text)
+        self.stats.io_time += time.perf_counter() - start
+        self.stats.output(text)
+
+    def error(self, err) -> None:
+        """
+        This writes an error
+        :param err: the error (or message) to write
+        """
+        if self.output_format == 'jsonl':  # the error is a record like the output, so it goes to the same stream
+            from binp.jsonl import error_record  # only loaded when it is used
+            self.write(error_record(err))
+            return
+        print(err, file=self.stderr if self.stderr is not None else sys.stderr)
+
+    def prompt(self, text: str) -> str:
+        """
+        This reads a line typed into the interactive prompt
+        :param text: the prompt to show
+        :return: the line that was typed
+        """
+        return input(text)
+
+    def exit(self, code: int):
+        """
+        This stops the program
+        :param code: the exit code
+        """
+        raise BinPExit(code)
+
+
+CURRENT_CONTEXT: ContextVar[Context] = ContextVar('binp_context')
+
+
+def current_context() -> Context:
+    """
+    This gets the context of the program running on this thread
+    (a new one, when something is run without giving it a context)
+    :return: the current context
+    """
+    context = CURRENT_CONTEXT.get(None)
+    if context is None:
+        context = Context()
+        CURRENT_CONTEXT.set(context)
+    return context
@@ -13,6 +13,7 @@ class BinPRuntimeError(SyntaxError):
     def __init__(self, line_num: int, line: str, message=''):
         self._num = line_num
         self._line = line
+        self._reason = message
         self._message = f"Runtime Error on line {line_num+1}: {message}" \
                         f"\n{line}"
         super().__init__(self._message)
@@ -22,6 +23,7 @@ class BinPSyntaxError(SyntaxError):
     def __init__(self, line_num: int, line: str, message=''):
         self._num = line_num
         self._line = line
+        self._reason = message
         self._message = f"Syntax Error on line {line_num+1}: {message}" \
                         f"\n{line}"
         super().__init__(self._message)
@@ -31,6 +33,7 @@ class BinPValueError(ValueError):
     def __init__(self, line_num: int, line: str, message=''):
         self._num = line_num
         self._line = line
+        self._reason = message
         self._message = f"Value Error on line {line_num+1}: {message}" \
                         f"\n{line}"
         super().__init__(self._message)
@@ -40,6 +43,34 @@ class BinPArgumentError(ValueError):
     def __init__(self, line_num: int, line: str, message=''):
         self._num = line_num
         self._line = line
+        self._reason = message
         self._message = f"Argument Error on line {line_num+1}: {message}" \
                         f"\n{line}"
         super().__init__(self._message)
+
+
+class BinPSessionError(ValueError):
+    def __init__(self, filename: str, message=''):
+        self._filename = filename
+        self._reason = message
+        self._message = f"Session Error in '{filename}': {message}"
+        super().__init__(self._message)
+
+
+class BinPCheckpointError(ValueError):
+    def __init__(self, filename: str, message=''):
+        self._filename = filename
+        self._message = f"Checkpoint Error in '{filename}': {message}"
+        super().__init__(self._message)
+
+
+class BinPExit(BaseException):
+    """
+    This is raised to stop a running program (after its error has been printed), instead of sys.exit().
+    Only whatever started the program (like the command line) decides what stopping means,
+    so other programs running in the same process keep going.
+    It is a BaseException so that 'except Exception' in the evaluators never catches it
+    """
+    def __init__(self, code: int):
+        self.code = code
+        super().__init__(code)
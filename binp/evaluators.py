@@ -0,0 +1,519 @@
+from collections.abc import Callable
+
+from binp import caches, functions
+from binp.errors import BinPSyntaxError, BinPValueError, BinPArgumentError, BinPRuntimeError
+from binp.expressions import gen_bool_tree, eval_tree, gen_math_tree, tree_type
+from binp.formatting import format_line, remove_spaces
+from binp.lexer import SourceLine, IDENTIFIER, STRING, QUOTES, unquote
+from binp.handles import BinPHandle
+from binp.maps import BinPMap
+from binp.sequences import BinPSeq
+from binp.strings import Rope, append_str
+
+EVAL_FUNC = Callable[[int, str, list[int], dict], bool | str | int]
+
+# values are stored as native python values, so their type is the tag we check against
+TYPE_TAGS = {'int': int, 'bool': bool, 'str': str, 'seq': BinPSeq, 'map': BinPMap, 'file': BinPHandle}
+INT_OPERATORS = {"+", "-", "*", "/", "%", "(", ")"}
+BOOL_SYMBOLS = {"&&", "||", "==", "!=", "<", "<=", ">", ">="}
+SYMBOLS = INT_OPERATORS | BOOL_SYMBOLS | {","}
+NO_VALUE = object()  # returned by single_value when the expression needs to be evaluated
+
+
+def int_eval(line_num: int, line: str, vals: list[str], local_namespace: dict) -> int:
+    """
+    This is where we compute an arithmetic expression for an integer
+    :param line_num: the line number for error printing
+    :param line: the entire line with the expression
+    :param vals: a list of strings containing (hopefully) ints and +-*/%()
+    :param local_namespace: the namespace with all variables in it
+    :return: the integer result of calculating everything in vals
+    """
+    stats = functions.current_context().stats
+    cache = caches.cached_expression(line, vals, local_namespace, False)
+    if cache is not None:
+        value = cached_value(line_num, line, cache, local_namespace, stats)
+        if value is not NO_VALUE:
+            return value
+
+    tokens = int_replacement(line_num, line, vals, local_namespace)
+    if stats is not None:
+        stats.expression_trees += 1
+    try:
+        root = gen_math_tree(tokens)
+        return eval_tree(root)
+    except Exception as e:
+        raise BinPRuntimeError(line_num, line, message=str(e))
+
+
+def int_replacement(line_num: int, line: str, vals: list[str], local_namespace: dict) -> list[bool | str]:
+    """
+    This searches through an int expression and replaces any variable names with ints
+    :param line_num: the line of this expression for error message
+    :param line: the entire line for error message
+    :param vals: the vals to be converted into a list of bool vals
+    :param local_namespace: the variables which could contain int values
+    :return: a list of booleans and strings (the strings for any integer operators)
+    """
+    vals = replace_all_variables(line_num, line, vals, local_namespace)
+    retval = []
+
+    for val in vals:
+        if type(val) is int:
+            retval.append(val)
+        elif type(val) is not str:
+            raise BinPValueError(line_num, line, message="Invalid cast of type 'int'")
+        elif val in INT_OPERATORS:
+            retval.append(val)
+        else:
+            val = local_namespace.get(val, val)
+            if type(val) is str:
+                val = parse_value(val)
+            if type(val) is not int:
+                raise BinPValueError(line_num, line, message="Invalid cast of type 'int'")
+            retval.append(val)
+
+    return retval
+
+
+def bool_eval(line_num: int, line: str, vals: list[str], local_namespace: dict) -> bool:
+    """
+    This is where we compute a boolean expression
+    :param line_num: the line number for error printing
+    :param line: the entire line with the expression
+    :param vals: a list of strings containing (hopefully) bools, ints, comparisons, arithmetic and or/and/()
+    :param local_namespace: the namespace with possible boolean values to replace
+    :return: the boolean result of calculating everything in vals
+    """
+    stats = functions.current_context().stats
+    cache = caches.cached_expression(line, vals, local_namespace, True)
+    if cache is not None:
+        value = cached_value(line_num, line, cache, local_namespace, stats)
+        if value is not NO_VALUE:
+            return value
+
+    tokens = bool_replacement(line_num, line, vals, local_namespace)  # convert into all booleans or &&/||
+    if stats is not None:
+        stats.expression_trees += 1
+    try:
+        root = gen_bool_tree(tokens)
+        root_type = tree_type(root)
+    except Exception as e:
+        raise BinPRuntimeError(line_num, line, message=str(e))
+    if root_type is int:
+        raise BinPValueError(line_num, line, message="Invalid cast of type 'bool'")
+
+    try:
+        return eval_tree(root)
+    except (BinPSyntaxError, BinPValueError, BinPArgumentError, BinPRuntimeError):
+        raise  # errors from inside a function call already point to the right line
+    except Exception as e:
+        raise BinPRuntimeError(line_num, line, message=str(e))
+
+
+def cached_value(line_num: int, line: str, cache: caches.CachedExpression, local_namespace: dict, stats):
+    """
+    This evaluates an expression with its inline cache
+    :param line_num: the line number for error printing
+    :param line: the entire line with the expression
+    :param cache: the inline cache of the expression
+    :param local_namespace: the namespace with all variables in it
+    :param stats: the Stats of the running program, or None
+    :return: the value of the expression, or NO_VALUE if the cache missed
+    """
+    values = cache.operands(line_num, line, local_namespace)
+    if stats is not None:
+        if values is NO_VALUE:
+            stats.cache_misses += 1
+        else:
+            stats.cache_hits += 1
+    if values is NO_VALUE:
+        return NO_VALUE
+
+    try:
+        return cache.func(values)
+    except Exception as e:
+        raise BinPRuntimeError(line_num, line, message=str(e))
+
+
+def bool_replacement(line_num: int, line: str, vals: list[str], local_namespace: dict) -> list[bool | str]:
+    """
+    This searches through a boolean expression and replaces any variable names with booleans, and it also converts
+    true/True/1 to True and false/False/0 to false
+
+    Function calls are not run here. Each call is replaced with a function which runs it,
+    so the expression tree can skip calls on the side of && and || which is never evaluated
+    :param line_num: the line of this expression for error message
+    :param line: the entire line for error message
+    :param vals: the vals to be converted into a list of bool vals
+    :param local_namespace: the variables which could contain boolean values
+    :return: a list of booleans, ints, deferred calls and strings (the strings for any operators)
+    """
+    vals = replace_variables(vals, local_namespace)
+    vals = functions.defer_function_calls(line_num, line, vals, local_namespace)
+    vals = convert_str_to_ints(vals)
+    retval = []
+
+    for val in vals:
+        match val:
+            case True | 'true' | 'True':
+                retval.append(True)
+            case False | 'false' | 'False':
+                retval.append(False)
+            case '&&' | '||' | '(' | ')' | \
+                 '==' | '!=' | '<' | '<=' | '>' | '>=' | \
+                 '+' | '-' | '*' | '/' | '%' | \
+                 int():
+                retval.append(val)
+            case _ if callable(val):
+                retval.append(val)
+            case _:
+                raise BinPValueError(line_num, line, message="Invalid cast of type 'bool'")
+
+    return retval
+
+
+def str_eval(line_num: int, line: str, vals: list[str], local_namespace: dict) -> str | Rope:
+    """
+    This is where we calculate a string expression
+    :param line_num: the current line in the program
+    :param line: the entire line with the expression
+    :param vals: the line split by spaces
+    :param local_namespace: the namespace for checking any variables
+    :return: the string result of calculating everything in vals (a rope when it adds to a string variable)
+    """
+    # a string which starts with a function call and ends with a ')' has its calls run (like fread_str(f))
+    if len(vals) > 2 and vals[1] == '(' and vals[-1] == ')' \
+            and isinstance(local_namespace.get(vals[0]), functions.BinPFunction):
+        vals = replace_variables(list(vals), local_namespace)
+        vals, _ = functions.parse_function_call(line_num, line, vals, local_namespace)
+        if len(vals) == 1 and (type(vals[0]) is str or type(vals[0]) is Rope):
+            return vals[0]
+        return remove_spaces(" ".join(map(str, vals)))
+
+    # the expression keeps the spacing it was written with, so its text is taken from the line as it was written.
+    # values which are not the end of the line (like a return, evaluated with the line of its call)
+    # are joined back together and lexed again
+    start = line.start_of(vals) if isinstance(line, SourceLine) else None
+    if start is None:
+        line = format_line(remove_spaces(" ".join(vals)))
+        start = 0
+    return interpolate(line, start, local_namespace)
+
+
+def interpolate(line: SourceLine, start: int, local_namespace: dict) -> str | Rope:
+    """
+    This takes the text of a line from a position, as it was written, and replaces every
+    variable name in it with its value. Strings in single quotes lose their quotes
+    and are never searched for variables
+
+    When the text starts with a string variable the rest of the text is appended to it as a rope,
+    which means building a string in a loop ('var str s = s x') never copies what it already has
+    :param line: the lexed line
+    :param start: the position in the raw line where the text starts
+    :param local_namespace: the namespace with variable names and values
+    :return: the text with variable names substituted with values
+    """
+    raw = line.raw
+    get = local_namespace.get
+    pieces = []
+    first = NO_VALUE
+    position = start
+    for token in line.tokens:
+        if token.col < start:
+            continue
+        if token.kind == IDENTIFIER:
+            value = get(token.text, NO_VALUE)
+            if value is NO_VALUE:
+                continue
+            if token.col == start and (type(value) is str or type(value) is Rope):
+                first = value  # strings never change, so the value can be shared
+                position = token.col + len(token.text)
+                continue
+            value = str(value)
+        elif token.kind == STRING:
+            value = unquote(token.text)
+        else:
+            continue
+        pieces.append(raw[position:token.col])
+        pieces.append(value)
+        position = token.col + len(token.text)
+
+    if first is not NO_VALUE:
+        if not pieces and position == len(raw):
+            return first
+        pieces.append(raw[position:])
+        return append_str(first, "".join(pieces))
+    pieces.append(raw[position:])
+    return "".join(pieces)
+
+
+def namespace_replacement(line: SourceLine, start: int, local_namespace: dict) -> str:
+    """
+    This nifty little function searches through a line and replaces every valid mention of a variable
+    with its value inside the namespace
+    :param line: the lexed line possibly containing variable names
+    :param start: the position in the raw line where the text to replace starts
+    :param local_namespace: the namespace with variable names and values
+    :return: the text of the line from start with variable names substituted with values
+    """
+    return f'{interpolate(line, start, local_namespace)} '
+
+
+def reference_eval(line_num: int, line: str, vals: list[str], local_namespace: dict, type_name: str):
+    """
+    This is where we get a seq, a map or a file. they have no operators, so the expression has to be a single
+    variable or a call of a function which returns one (like seq_range, map_new or fopen)
+    :param line_num: the line number for error printing
+    :param line: the entire line with the expression
+    :param vals: the values of the expression
+    :param local_namespace: the namespace with all variables in it
+    :param type_name: 'seq', 'map' or 'file'
+    :return: the seq, map or file
+    """
+    vals = replace_all_variables(line_num, line, list(vals), local_namespace)
+    if len(vals) == 1 and type(vals[0]) is TYPE_TAGS[type_name]:
+        return vals[0]
+    raise BinPValueError(line_num, line, message=f"Invalid cast of type '{type_name}'")
+
+
+def seq_eval(line_num: int, line: str, vals: list[str], local_namespace: dict) -> BinPSeq:
+    """
+    This is where we get a seq (see reference_eval)
+    """
+    return reference_eval(line_num, line, vals, local_namespace, 'seq')
+
+
+def map_eval(line_num: int, line: str, vals: list[str], local_namespace: dict) -> BinPMap:
+    """
+    This is where we get a map (see reference_eval)
+    """
+    return reference_eval(line_num, line, vals, local_namespace, 'map')
+
+
+def file_eval(line_num: int, line: str, vals: list[str], local_namespace: dict) -> BinPHandle:
+    """
+    This is where we get a file handle (see reference_eval)
+    """
+    return reference_eval(line_num, line, vals, local_namespace, 'file')
+
+
+def value_eval(line_num: int, line: str, vals: list[str], local_namespace: dict):
+    """
+    This is where we compute a value which can have any type, like a key or a value of a map.
+    the type comes from the expression: a single value keeps its own type, an expression with
+    a comparison, && or || is a bool, an arithmetic expression of ints is an int and anything else is a str
+    :param line_num: the line number for error printing
+    :param line: the entire line with the expression
+    :param vals: the values of the expression
+    :param local_namespace: the namespace with all variables in it
+    :return: the value of the expression
+    """
+    if len(vals) == 1 and type(vals[0]) is str:
+        val = vals[0]
+        if val[:1] == "'":
+            return unquote(val)  # a string in quotes is always a str, even '5'
+        value = local_namespace.get(val, NO_VALUE)
+        if value is NO_VALUE:
+            return parse_value(val)
+        if not isinstance(value, functions.BinPFunction):
+            return str(value) if type(value) is Rope else value
+
+    tokens = convert_str_to_ints(replace_all_variables(line_num, line, list(vals), local_namespace))
+    if len(tokens) == 1 and type(tokens[0]) is not str:
+        return tokens[0]
+    if any(type(token) is bool or (type(token) is str and token in BOOL_SYMBOLS) for token in tokens):
+        return bool_eval(line_num, line, tokens, local_namespace)
+    if any(type(token) is int for token in tokens) and \
+            all(type(token) is int or (type(token) is str and token in INT_OPERATORS) for token in tokens):
+        return int_eval(line_num, line, tokens, local_namespace)
+    return str_arg_eval(line_num, line, tokens, local_namespace)
+
+
+def seq_or_int_eval(line_num: int, line: str, vals: list[str], local_namespace: dict) -> BinPSeq | int:
+    """
+    This evaluates an argument of a seq builtin which takes either a seq or an int (like the y of seq_add(xs, y))
+    :param line_num: the line number for error printing
+    :param line: the entire line with the expression
+    :param vals: the values of the expression
+    :param local_namespace: the namespace with all variables in it
+    :return: the seq, or the value of the int expression
+    """
+    vals = replace_all_variables(line_num, line, list(vals), local_namespace)
+    if len(vals) == 1 and type(vals[0]) is BinPSeq:
+        return vals[0]
+    return int_eval(line_num, line, vals, local_namespace)
+
+
+def determine_evaluator(variable_type: str) -> EVAL_FUNC:
+    """
+    This takes in a type and returns the specific evaluator function for that type
+    :param variable_type: the type of the variable(s)
+    :return: the evaluator function for that type
+
+    NOTE: ignore these type warnings, IDK why pycharm is yelling at me, this is perfectly valid
+    """
+    match variable_type:
+        case 'int':
+            return int_eval
+        case 'str':
+            return str_eval
+        case 'bool':
+            return bool_eval
+        case 'seq':
+            return seq_eval
+        case 'seq|int':
+            return seq_or_int_eval
+        case 'map':
+            return map_eval
+        case 'file':
+            return file_eval
+        case 'any':
+            return value_eval
+        case 'func':
+            pass
+        case 'null':
+            pass
+        case _:
+            return str_eval
+
+
+def str_arg_eval(line_num: int, line: str, vals: list, local_namespace: dict) -> str:
+    """
+    This is where we calculate a string argument passed into a function call.
+    Unlike str_eval we do not need the line, since the argument has already been
+    split out of the call and its variables have been replaced. Its values are joined back
+    together without the spaces the lexer put around operators, except for text in quotes,
+    which is kept exactly as it was written
+    :param line_num: the current line in the program
+    :param line: the entire line with the function call
+    :param vals: the values making up this single argument
+    :param local_namespace: the namespace for checking any variables
+    :return: the string value of the argument
+    """
+    pieces = []
+    words = []  # the values since the last text in quotes
+    for v in vals:
+        if isinstance(v, str) and len(v) > 1 and v[0] in QUOTES and v[-1] == v[0]:
+            if words:
+                pieces.append(remove_spaces(" ".join(words)))
+                words = []
+            pieces.append(unquote(v))
+        else:
+            words.append(str(local_namespace.get(v, v)) if isinstance(v, str) else str(v))
+    if words:
+        pieces.append(remove_spaces(" ".join(words)))
+    return " ".join(pieces)
+
+
+def determine_argument_evaluator(variable_type: str) -> EVAL_FUNC:
+    """
+    This takes in a parameter type and returns the evaluator function used to
+    turn an argument of a function call into a value of that type
+    :param variable_type: the type of the parameter
+    :return: the evaluator function for that type
+    """
+    evaluator = determine_evaluator(variable_type)
+    if evaluator is str_eval:
+        return str_arg_eval
+    return evaluator
+
+
+def replace_all_variables(line_num: int, line: str, vals: list[str], local_namespace: dict) -> list[str]:
+    """
+    This replaces every variable in the namespace with its value.
+    it then looks for every function call and evaluates its return.
+    at the end we have a list of values which can be parsed into
+    a boolean or int tree
+    :param line_num: the current line number for error printing
+    :param line: the current line for error printing
+    :param vals: the values that need to be replaced with variables or function returns
+    :param local_namespace: the namespace with all variables and functions
+    :return: list of all values replaced with their evaluation in the namespace
+    """
+    vals = replace_variables(vals, local_namespace)
+
+    vals, i = functions.parse_function_call(line_num, line, vals, local_namespace)
+    return vals
+
+
+def replace_variables(vals: list[str], local_namespace: dict) -> list[str]:
+    """
+    This replaces every variable in the namespace with its value, leaving function names alone
+    :param vals: the values that need to be replaced with variables
+    :param local_namespace: the namespace with all variables and functions
+    :return: the same list, with variable names substituted with values
+    """
+    get = local_namespace.get
+    for i, val in enumerate(vals):
+        if val in SYMBOLS:
+            continue
+        value = get(val, NO_VALUE)
+        if value is not NO_VALUE and not isinstance(value, functions.BinPFunction):
+            vals[i] = str(value) if type(value) is Rope else value
+    return vals
+
+
+def convert_str_to_ints(vals: list[str]) -> list[str, int]:
+    """
+    Given a list of strings, if a string holds an integer, it is converted to a
+    Python integer object. If the string does not contain an integer,
+    it is left alone and is not modified
+
+    This function will not convert variables to numbers.
+    If this is desired, @replace_all_variables should be called first.
+
+    This function also assumes that each element does not have leading or trailing
+    whitespace surrounding the elements
+    :param vals: the values to search for strings containing integers
+    :return a new list with int strings converted to integers
+    """
+
+    def convert_type(v):
+        if type(v) is str:
+            parsed = parse_value(v)
+            if type(parsed) is int:
+                return parsed
+        return v
+
+    return list(map(convert_type, vals))
+
+
+def parse_value(raw: str) -> int | bool | str:
+    """
+    This converts raw text (a literal, a command line argument or user input) into a typed value.
+    Only text which converts back to exactly the same text becomes an int, so '007' stays a string
+    :param raw: the text to convert
+    :return: an int, a bool or the original string
+    """
+    if raw in {'true', 'True'}:
+        return True
+    if raw in {'false', 'False'}:
+        return False
+    digits = raw[1:] if raw[:1] == '-' else raw  # only one minus sign, '--5' is not a number
+    if digits.isdecimal() and str(int(raw)) == raw:
+        return int(raw)
+    return raw
+
+
+def single_value(vals: list, local_namespace: dict, var_type: str):
+    """
+    This checks if an expression is a single value which already has the type we want.
+    This lets assignments like 'var int y = x' and 'return x' skip building an expression tree
+    :param vals: the values of the expression
+    :param local_namespace: the namespace with all variables in it
+    :param var_type: the type the expression should have
+    :return: the value, or NO_VALUE if the expression needs to be evaluated
+    """
+    if len(vals) != 1:
+        return NO_VALUE
+
+    val = vals[0]
+    if type(val) is str:
+        if val[:1] == "'":
+            return NO_VALUE  # a string in quotes loses its quotes when it is evaluated
+        value = local_namespace.get(val, NO_VALUE)
+        val = parse_value(val) if value is NO_VALUE else value
+    if type(val) is TYPE_TAGS.get(var_type):
+        return val
+    return NO_VALUE
@@ -0,0 +1,405 @@
+# A class which holds valid types for each OpNode
+# (this works like an Enum, but without importing the enum module when the interpreter starts)
+class Operator:
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}.{self.name}"
+
+    def __str__(self):
+        return self.name
+
+
+Operator.INT = Operator('INT')
+Operator.BOOL = Operator('BOOL')
+Operator.ADD = Operator('ADD')
+Operator.SUB = Operator('SUB')
+Operator.DIV = Operator('DIV')
+Operator.MUL = Operator('MUL')
+Operator.OR = Operator('OR')
+Operator.AND = Operator('AND')
+Operator.MODULUS = Operator('MODULUS')
+Operator.GREATER_THAN = Operator('GREATER_THAN')
+Operator.LESS_THAN = Operator('LESS_THAN')
+Operator.GREATER_EQUAL = Operator('GREATER_EQUAL')
+Operator.LESS_EQUAL = Operator('LESS_EQUAL')
+Operator.EQUAL = Operator('EQUAL')
+Operator.NOT_EQUAL = Operator('NOT_EQUAL')
+Operator.CALL = Operator('CALL')
+
+
+BINARY_OPERATOR_MAP = {
+    Operator.ADD: lambda x, y: x + y,
+    Operator.SUB: lambda x, y: x - y,
+    Operator.DIV: lambda x, y: x // y,
+    Operator.MUL: lambda x, y: x * y,
+    Operator.OR:  lambda x, y: x or y,
+    Operator.AND: lambda x, y: x and y,
+
+    Operator.MODULUS:       lambda x, y: x % y,
+    Operator.GREATER_THAN:  lambda x, y: x > y,
+    Operator.LESS_THAN:     lambda x, y: x < y,
+    Operator.GREATER_EQUAL: lambda x, y: x >= y,
+    Operator.LESS_EQUAL:    lambda x, y: x <= y,
+    Operator.EQUAL:         lambda x, y: x == y,
+    Operator.NOT_EQUAL:     lambda x, y: x != y
+}
+
+BOOL_OPERATORS = {
+    "||": Operator.OR,
+    "&&": Operator.AND,
+
+    ">":  Operator.GREATER_THAN,
+    "<":  Operator.LESS_THAN,
+    ">=": Operator.GREATER_EQUAL,
+    "<=": Operator.LESS_EQUAL,
+    "==": Operator.EQUAL,
+    "!=": Operator.NOT_EQUAL,
+}
+
+RELATIONAL_OPERATORS = {">", "<", ">=", "<=", "==", "!="}
+
+ARITH_OPERATORS = {Operator.ADD, Operator.SUB, Operator.DIV, Operator.MUL, Operator.MODULUS}
+LOGIC_OPERATORS = {Operator.AND, Operator.OR}
+ORDER_OPERATORS = {Operator.GREATER_THAN, Operator.LESS_THAN, Operator.GREATER_EQUAL, Operator.LESS_EQUAL}
+
+
+class OpNode:
+    """
+    This class is used to represent a series of operations
+    in a tree-like manner. The root can contain either an operator
+    or a value (a boolean or integer) and the leaves can be
+    an OpNode subtree or None
+
+    :param op: the operator which the node contains
+    :param val: used if the node contains some sort of integer or boolean value
+    """
+
+    def __init__(self, op: Operator, val=None):
+        self.op = op
+        self.val = val
+        self.left = None
+        self.right = None
+
+    def __repr__(self):
+        return f"OpNode({repr(self.op)},{repr(self.val)})"
+
+
+def eval_tree(root: OpNode) -> int | bool:
+    """
+    Given a boolean tree or int tree, evaluate it into a single return value
+    Variables are not supported; each node must either contain an operation,
+    a constant value (10, false, etc.) or a deferred function call (CALL)
+
+    && and || short-circuit, so the right subtree (and any function calls inside it)
+    is only evaluated when it can change the result
+
+    This function assumes all the nodes are comparable
+    (boolean operatores are not mixed with ints, etc.)
+
+    :param root: The root of the expression tree
+    :return: the evaluated boolean or integer from the given expression tree
+    """
+    match root.op:
+        case Operator.INT | Operator.BOOL:
+            return root.val
+
+        case Operator.CALL:
+            return root.val()  # the function is only called once we actually need its value
+
+        case Operator.AND:
+            return logic_operand(root.left) and logic_operand(root.right)
+
+        case Operator.OR:
+            return logic_operand(root.left) or logic_operand(root.right)
+
+        case x if x in BINARY_OPERATOR_MAP:
+            binary_op_func = BINARY_OPERATOR_MAP[x]
+            left = eval_tree(root.left)
+            right = eval_tree(root.right)
+            return binary_op_func(left, right)
+
+        case _:
+            assert False, "Invalid operator given"
+
+
+def logic_operand(root: OpNode) -> bool:
+    """
+    Evaluate one side of a && or || operation, making sure it really is a boolean.
+    This is needed for function calls, since we only know what they return after calling them
+    :param root: the root of the operand subtree
+    :return: the boolean value of the subtree
+    """
+    val = eval_tree(root)
+    assert type(val) == bool, "Booleans only support && and || operations"
+    return val
+
+
+def gen_math_tree(tokens: list[str]) -> OpNode:
+    """
+    Given a list of tokens representing a mathematical expression,
+    create a traversable tree that effectively represents evaluation heirarchy
+
+    :param tokens: a list of tokens where each item (parens, plus, ints, etc.)
+                   are separate elements within the list
+
+    :returns: the root of the expression tree
+    """
+    return arith_expr(tokens)
+
+
+def arith_expr(tokens: list[str], factor=None) -> OpNode:
+    """
+    The beginning of searching an arithmetic expression.
+
+    :param tokens: a list of tokens which to parse into a tree
+    :param factor: the function used to parse the innermost values (arith_factor by default).
+            boolean expressions pass bool_factor, so parenthesis can contain comparisons
+    :return: the root of the final parse tree
+    """
+    factor = factor or arith_factor
+    lchild = arith_term(tokens, factor)
+    return arith_expr1(tokens, lchild, factor)
+
+
+def arith_expr1(tokens: list[str], lchild: OpNode, factor=None) -> OpNode:
+    """
+    Check if token list starts with a addition/subtraction operator.
+    If so, handle the node creation now. Otherwise, return lchild
+
+    :param tokens: a list of tokens which to parse into a tree
+    :param lchild: the left child node to add to the mathmatical expression
+    :param factor: the function used to parse the innermost values
+    :return: the root of the parse tree
+    """
+    # Epsilon
+    if len(tokens) == 0:
+        return lchild
+
+    match tokens[0]:
+        case "+":
+            op = Operator.ADD
+        case "-":
+            op = Operator.SUB
+        case _:
+            # Epsilon
+            return lchild
+
+    tokens.pop(0)
+    root = OpNode(op)
+    root.left = lchild
+    root.right = arith_term(tokens, factor)
+    return arith_expr1(tokens, root, factor)
+
+
+def arith_term(tokens: list[str], factor=None) -> OpNode:
+    """
+    Check for higher precedence operators
+    :param tokens: a list of tokens which to parse into a tree
+    :param factor: the function used to parse the innermost values
+    :return: the root of the parse tree
+    """
+    factor = factor or arith_factor
+    lchild = factor(tokens)
+    return arith_term1(tokens, lchild, factor)
+
+
+def arith_term1(tokens: list[str], lchild: OpNode, factor=None) -> OpNode:
+    """
+    Check if token list starts with a multiplication/division/modulus operator.
+    If so, handle the node creation now. Otherwise, return lchild
+
+    :param tokens: a list of tokens which to parse into a tree
+    :param lchild: the left child node to add to the mathmatical expression
+    :param factor: the function used to parse the innermost values
+    :return: the root of the parse tree
+    """
+    factor = factor or arith_factor
+    # Epsilon
+    if len(tokens) == 0:
+        return lchild
+
+    match tokens[0]:
+        case "*":
+            op = Operator.MUL
+        case "/":
+            op = Operator.DIV
+        case "%":
+            op = Operator.MODULUS
+        case _:
+            # Epsilon
+            return lchild
+
+    tokens.pop(0)
+    root = OpNode(op)
+    root.left = lchild
+    root.right = factor(tokens)
+
+    return arith_term1(tokens, root, factor)
+
+
+def arith_factor(tokens: list[str]) -> OpNode:
+    """
+    Check if the token list has an integer or paranthesis
+    :param tokens: a list of tokens which to parse into a tree
+    :return: the root of the parse tree
+    """
+    mine = tokens.pop(0)
+    if isinstance(mine, int):
+        return OpNode(Operator.INT, mine)
+    if callable(mine):
+        return OpNode(Operator.CALL, mine)
+
+    assert mine == "(", "Invalid syntax. Expected parenthesis"
+    root = arith_expr(tokens)
+    assert tokens.pop(0) == ")", "Expected closing paranthesis"
+    return root
+
+
+def gen_bool_tree(tokens) -> OpNode | None:
+    """
+    Given a list of tokens representing a boolean expression, create a traversable tree.
+    Operands can be booleans, integers, arithmetic expressions or deferred function calls,
+    and parenthesis can wrap any part of the expression
+
+    Precedence (highest to lowest): parenthesis, * / %, + -, comparisons, &&, ||
+
+    bool_expr -> bool_term bool_expr1
+    bool_expr1 -> || bool_term bool_expr1 | -- epsilon --
+    bool_term -> bool_relation bool_term1
+    bool_term1 -> && bool_relation bool_term1 | -- epsilon --
+    bool_relation -> arith_expr | arith_expr <relational_op> arith_expr
+    (where the arith_expr factors are parsed by bool_factor)
+
+    :param tokens: a list of tokens which to parse into a tree
+    :return: the root of the parse tree
+    """
+    root = bool_expr(tokens)
+    assert len(tokens) == 0, "Invalid syntax. Unexpected tokens at the end of the expression"
+    return root
+
+
+def bool_expr(tokens: list) -> OpNode:
+    """
+    Parse the lowest precedence level of a boolean expression (||)
+    :param tokens: a list of tokens which to parse into a tree
+    :return: the root of the parse tree
+    """
+    root = bool_term(tokens)
+    while len(tokens) > 0 and tokens[0] == "||":
+        tokens.pop(0)
+        node = OpNode(Operator.OR)
+        node.left = root
+        node.right = bool_term(tokens)
+        root = node
+    return root
+
+
+def bool_term(tokens: list) -> OpNode:
+    """
+    Parse the && level of a boolean expression
+    :param tokens: a list of tokens which to parse into a tree
+    :return: the root of the parse tree
+    """
+    root = bool_relation(tokens)
+    while len(tokens) > 0 and tokens[0] == "&&":
+        tokens.pop(0)
+        node = OpNode(Operator.AND)
+        node.left = root
+        node.right = bool_relation(tokens)
+        root = node
+    return root
+
+
+def bool_relation(tokens: list) -> OpNode:
+    """
+    Parse a comparison between two arithmetic expressions, or a single operand.
+    Comparisons do not chain, so 1 < 2 < 3 is invalid
+    :param tokens: a list of tokens which to parse into a tree
+    :return: the root of the parse tree
+    """
+    lchild = arith_expr(tokens, bool_factor)
+    if len(tokens) == 0 or not isinstance(tokens[0], str) or tokens[0] not in RELATIONAL_OPERATORS:
+        return lchild
+
+    root = bool_op(tokens.pop(0))
+    root.left = lchild
+    root.right = arith_expr(tokens, bool_factor)
+    return root
+
+
+def bool_factor(tokens: list) -> OpNode:
+    """
+    Check if the token list has a value or a parenthesized boolean expression
+    :param tokens: a list of tokens which to parse into a tree
+    :return: the root of the parse tree
+    """
+    assert len(tokens) > 0, "Invalid syntax. Expected a value"
+    if tokens[0] == "(":
+        tokens.pop(0)
+        root = bool_expr(tokens)
+        assert len(tokens) > 0 and tokens.pop(0) == ")", "Expected closing paranthesis"
+        return root
+
+    return bool_leaf(tokens.pop(0))
+
+
+def tree_type(root: OpNode) -> type | None:
+    """
+    Check that every operator in the tree is applied to operands of the right type
+    :param root: the root of the tree to check
+    :return: int or bool for the type of the tree, or None when it can only be known
+            after evaluating (function calls)
+    """
+    match root.op:
+        case Operator.INT:
+            return int
+        case Operator.BOOL:
+            return bool
+        case Operator.CALL:
+            return None
+
+    left, right = tree_type(root.left), tree_type(root.right)
+    if root.op in LOGIC_OPERATORS:
+        assert int not in {left, right}, "Booleans only support && and || operations"
+        return bool
+    if root.op in ARITH_OPERATORS:
+        assert bool not in {left, right}, "Booleans do not support arithmetic operations"
+        return int
+    if root.op in ORDER_OPERATORS:
+        assert bool not in {left, right}, "Booleans only support && and || operations"
+        return bool
+
+    assert left is None or right is None or left is right, "Both operands must be of the same type"
+    return bool
+
+
+def bool_op(token: str) -> OpNode:
+    """
+    Pull a boolean operator from the beginning of the token stream
+    :param tokens: a token to parse into a node
+    :return: the root of the parse tree
+    """
+    assert token in BOOL_OPERATORS, "Operator is not a valid boolean operator"
+    return OpNode(BOOL_OPERATORS[token])
+
+
+def bool_leaf(token):
+    """
+    Pull an integer, boolean or deferred function call from the beginning of the token stream
+    :param tokens: a token to parse into a node
+    :return: the root of the parse tree
+    """
+    if type(token) == int:
+        op = Operator.INT
+    elif type(token) == bool:
+        op = Operator.BOOL
+    elif callable(token):
+        op = Operator.CALL
+    else:
+        assert False, "Operand is not a boolean or integer"
+
+    return OpNode(op, token)
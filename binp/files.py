@@ -0,0 +1,215 @@
+import mmap
+
+from binp.errors import BinPRuntimeError, BinPValueError
+from binp.handles import BinPHandle
+from binp.inputs import InputReader, BUFFER_SIZE
+from binp.maps import BinPMap
+
+FILE_MODES = {'r', 'w', 'a'}
+
+
+class BinPFile:
+    """
+    This class is a file opened by a binp program with fopen
+
+    Files opened for reading are memory-mapped (so a file of any size is read without loading it),
+    and read one line at a time by the same reader as 'input'. Files opened for writing ('w' or 'a')
+    are written through a large buffer, one line per write
+
+    :param path: the path of the file
+    :param mode: 'r', 'w' or 'a'
+    :param offset: where to carry on reading or writing, when the file is reopened from a checkpoint.
+            anything written after it is cut off, since the program writes it again
+    """
+    def __init__(self, path: str, mode: str, offset: int = None):
+        self.path = path
+        self.mode = mode
+        self._reader = None
+        self._writer = None
+        if mode == 'r':
+            with open(path, 'rb') as file:
+                try:
+                    stream = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:  # empty files can not be mapped
+                    stream = open(path, 'rb', buffering=BUFFER_SIZE)
+            self._reader = InputReader(stream)
+            if offset is not None:
+                self._reader.seek(offset)
+        elif offset is not None:
+            self._writer = open(path, 'r+', buffering=BUFFER_SIZE)  # 'w' would empty the file, 'a' can not seek
+            self._writer.seek(offset)
+            self._writer.truncate()
+        else:
+            self._writer = open(path, mode, buffering=BUFFER_SIZE)
+
+    def read_value(self, line_num: int, line: str, var_type: str):
+        """
+        This reads the next line of the file as a value of var_type
+        :param line_num: the line number for error printing
+        :param line: the line for error printing
+        :param var_type: 'int', 'bool' or 'str'
+        :return: the value
+        """
+        if self._reader is None:
+            raise BinPRuntimeError(line_num, line, message=f"File '{self.path}' is not open for reading")
+        value = self._reader.read_value(line_num, line, var_type)
+        if var_type != 'str' and type(value) is str:
+            raise BinPValueError(line_num, line, message=f"Invalid cast of type '{var_type}'")
+        return value
+
+    def write(self, line_num: int, line: str, text: str) -> None:
+        """
+        This writes text to the file as a line
+        :param line_num: the line number for error printing
+        :param line: the line for error printing
+        :param text: the text to write
+        """
+        if self._writer is None:
+            raise BinPRuntimeError(line_num, line, message=f"File '{self.path}' is not open for writing")
+        self._writer.write(text)
+        self._writer.write('\n')
+
+    def at_eof(self) -> bool:
+        """
+        :return: true if there is nothing left to read (files open for writing are always at the end)
+        """
+        return self._reader is None or self._reader.at_eof()
+
+    def tell(self) -> int:
+        """
+        This finds where the file is up to, for a checkpoint. a file being written is flushed first,
+        so everything before the position is really in the file
+        :return: the position of the next line to read or write
+        """
+        if self._reader is not None:
+            return self._reader.tell()
+        self._writer.flush()
+        return self._writer.tell()
+
+    def close(self) -> None:
+        """
+        This closes the file, writing anything left in the buffer
+        """
+        if self._reader is not None:
+            self._reader.close()
+        else:
+            self._writer.close()
+
+
+class OpenFiles:
+    """
+    This class is the table of files a program has open, by handle.
+    Handle numbers only ever go up, so a function can find every file
+    opened while it ran by comparing against the next handle when it started
+    """
+    def __init__(self):
+        self._files: dict[BinPHandle, BinPFile] = {}
+        self.next_handle = 1
+
+    def open(self, line_num: int, line: str, path: str, mode: str) -> BinPHandle:
+        """
+        This opens a file and gives it a handle
+        :param line_num: the line number for error printing
+        :param line: the line for error printing
+        :param path: the path of the file
+        :param mode: 'r' to read, 'w' to write or 'a' to append
+        :return: the handle of the file
+        """
+        if mode not in FILE_MODES:
+            raise BinPValueError(line_num, line,
+                                 message=f"Unknown file mode '{mode}'. Valid modes are 'r', 'w' and 'a'")
+        try:
+            file = BinPFile(path, mode)
+        except OSError as e:
+            raise BinPRuntimeError(line_num, line, message=f"Unable to open file '{path}': {e.strerror}")
+
+        handle = BinPHandle(self.next_handle)
+        self.next_handle += 1
+        self._files[handle] = file
+        return handle
+
+    def get(self, line_num: int, line: str, handle: BinPHandle) -> BinPFile:
+        """
+        This finds an open file by its handle
+        :param line_num: the line number for error printing
+        :param line: the line for error printing
+        :param handle: the handle from fopen
+        :return: the open file
+        """
+        file = self._files.get(handle)
+        if file is None:
+            raise BinPValueError(line_num, line, message=f"No open file with handle {handle}")
+        return file
+
+    def close(self, line_num: int, line: str, handle: BinPHandle) -> None:
+        """
+        This closes a file and frees its handle
+        :param line_num: the line number for error printing
+        :param line: the line for error printing
+        :param handle: the handle from fopen
+        """
+        self.get(line_num, line, handle).close()
+        del self._files[handle]
+
+    def close_since(self, first_handle: int, keep=()) -> None:
+        """
+        This closes every file opened from first_handle onwards which is still open.
+        It is called when a function returns, so files opened in a function are closed with it,
+        unless the program can still reach their handle after the call
+        :param first_handle: the next handle when the function started
+        :param keep: the values which outlive the call (what it returned, its arguments and the namespace
+                of its caller). a handle in one of them, or in a map in one of them, stays open
+        """
+        opened = [handle for handle in self._files if handle.number >= first_handle]
+        if not opened:
+            return
+        reachable = reachable_handles(keep)
+        for handle in opened:
+            if handle not in reachable:
+                self._files.pop(handle).close()
+
+    def state(self) -> list[list]:
+        """
+        :return: the number, path, mode and position of every open file, so a checkpoint can reopen them
+        """
+        return [[handle.number, file.path, file.mode, file.tell()] for handle, file in self._files.items()]
+
+    def restore(self, state: list[list], next_handle: int) -> dict[int, BinPHandle]:
+        """
+        This reopens the files of a checkpoint where they were, when a program is resumed.
+        **This raises OSError if a file can not be opened again**
+        :param state: the files, as returned by state
+        :param next_handle: the next handle when the checkpoint was saved
+        :return: the number of each handle -> the handle, so the handles in the namespace can be found again
+        """
+        handles = {}
+        for number, path, mode, offset in state:
+            handle = BinPHandle(number)
+            self._files[handle] = BinPFile(path, mode, offset)
+            handles[number] = handle
+        self.next_handle = next_handle
+        return handles
+
+    def close_all(self) -> None:
+        """
+        This closes every open file, when the program ends
+        """
+        self.close_since(0)
+
+
+def reachable_handles(values) -> set[BinPHandle]:
+    """
+    :param values: the values to search
+    :return: every handle which is one of the values, or is stored in a map in them (or in a map in a map)
+    """
+    handles = set()
+    seen = set()  # a map can be stored in itself
+    values = list(values)
+    while values:
+        value = values.pop()
+        if type(value) is BinPHandle:
+            handles.add(value)
+        elif type(value) is BinPMap and id(value) not in seen:
+            seen.add(id(value))
+            values.extend(item for _, item in value.items())
+    return handles
@@ -0,0 +1,50 @@
+from binp.lexer import SourceLine, split_operands
+
+BEGIN_PRINT = " >> "
+INTERACTIVE_PRINT = " -- "
+INTERACTIVE_PRINT_NESTED = ' ---- '
+
+
+def format_file(file) -> list[SourceLine]:
+    """
+    This takes the file and lexes each of its lines
+    :param file: the file for the program
+    :return: a list of lines of code in this file
+    """
+    return [SourceLine(line, line_num) for line_num, line in enumerate(file.readlines())]
+
+
+def format_line(line: str, line_num: int = 0) -> SourceLine:
+    """
+    This lexes a single line, so we can parse it properly
+    We can use this in both format_file for running an entire program, or to format
+    a single line for the interactive system
+    :param line: a single line which will be run
+    :param line_num: the line number of the line
+    :return: the lexed line, which is also the line formatted with spaces around every operator
+    """
+    return SourceLine(line, line_num)
+
+
+def add_spaces(line: str) -> str:
+    """
+    This wraps every operator in the line with spaces, so the line can be split with split()
+    :param line: the line to add spaces to
+    :return: the line with spaces around every operator
+    """
+    return " ".join(split_operands(line))
+
+
+def remove_spaces(line: str) -> str:
+    """
+    This undoes add_spaces for a line of output, removing a single space
+    on both sides of each operator that has one
+    :param line: the line to remove spaces from
+    :return: the line without spaces around operators
+    """
+    pieces = split_operands(line)
+    for i in range(1, len(pieces) - 1, 2):  # odd pieces are operators
+        if pieces[i-1].endswith(' ') and pieces[i+1].startswith(' '):
+            pieces[i-1] = pieces[i-1][:-1]
+            pieces[i+1] = pieces[i+1][1:]
+    return "".join(pieces)
@@ -0,0 +1,533 @@
+from itertools import chain
+
+from binp import interpreter
+from binp.errors import BinPSyntaxError, BinPValueError, BinPArgumentError, BinPRuntimeError
+from binp.formatting import format_line, INTERACTIVE_PRINT_NESTED
+from binp.evaluators import determine_evaluator, determine_argument_evaluator, single_value, NO_VALUE, TYPE_TAGS
+from binp.context import current_context, Context
+
+UNSET = object()  # a slot which has not been assigned yet in this frame
+
+
+class Frame:
+    """
+    This class is the namespace of a single function call
+
+    Every parameter and local variable of a function gets a slot index when the function is created,
+    so a frame only stores a fixed-size list of values instead of a copy of the whole namespace.
+    Names which are not local (or have not been assigned yet) are read from the caller's namespace,
+    which keeps the old behaviour of functions seeing a copy of their caller's variables.
+    Writing never changes the caller's namespace.
+
+    _chain_names holds every name the callers that are frames have (their slots, and any names in their _extra,
+    like functions imported inside of a function), so a lookup of a global can go straight to the global namespace
+    instead of walking through every frame of a deep recursion. A caller is not running while its callee is,
+    so its names can not change while the callee's frame exists
+    """
+    __slots__ = ('_slots', '_values', '_parent', '_globals', '_chain_names', '_extra')
+
+    def __init__(self, slots: dict[str, int], parent):
+        self._slots = slots
+        self._values = [UNSET] * len(slots)
+        self._parent = parent
+        self._extra = None  # names which were not found when resolving slots (rare)
+        if isinstance(parent, Frame):
+            self._globals = parent._globals
+            parent_names = parent._slots.keys()
+            if parent._extra is not None:
+                self._chain_names = parent._chain_names | parent_names | parent._extra.keys()
+            elif parent_names <= parent._chain_names:
+                self._chain_names = parent._chain_names  # recursion reuses the same set
+            else:
+                self._chain_names = parent._chain_names | parent_names
+        else:
+            self._globals = parent
+            self._chain_names = frozenset()
+
+    def get(self, name, default=None):
+        i = self._slots.get(name)
+        if i is not None and self._values[i] is not UNSET:
+            return self._values[i]
+        if self._extra is None and name not in self._chain_names:
+            return self._globals.get(name, default)  # the common case for globals and functions
+
+        frame = self
+        while True:
+            i = frame._slots.get(name)
+            if i is not None and frame._values[i] is not UNSET:
+                return frame._values[i]
+            if frame._extra is not None and name in frame._extra:
+                return frame._extra[name]
+            if name not in frame._chain_names:
+                return frame._globals.get(name, default)
+            frame = frame._parent
+
+    def __getitem__(self, name):
+        value = self.get(name, UNSET)
+        if value is UNSET:
+            raise KeyError(name)
+        return value
+
+    def __contains__(self, name) -> bool:
+        return self.get(name, UNSET) is not UNSET
+
+    def __setitem__(self, name, value):
+        i = self._slots.get(name)
+        if i is not None:
+            self._values[i] = value
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[name] = value
+
+    def locals(self) -> dict:
+        """
+        :return: a dictionary of the names which have been assigned in this frame
+        """
+        retval = {name: self._values[i] for name, i in self._slots.items() if self._values[i] is not UNSET}
+        if self._extra is not None:
+            retval.update(self._extra)
+        return retval
+
+    def visible(self) -> dict:
+        """
+        This builds a dictionary with every name this frame can see, and its value
+        It is only used when the whole namespace is needed (like outputting a line)
+        :return: a dictionary of every visible name
+        """
+        retval = self._collect()
+        stats = current_context().stats
+        if stats is not None:
+            stats.copy(len(retval))
+        return retval
+
+    def _collect(self) -> dict:
+        if isinstance(self._parent, Frame):
+            retval = self._parent._collect()
+        else:
+            retval = dict(self._parent)
+        retval.update(self.locals())
+        return retval
+
+    def __iter__(self):
+        return iter(self.visible())
+
+    def __len__(self) -> int:
+        return len(self.visible())
+
+    def items(self):
+        return self.visible().items()
+
+    def values(self):
+        """
+        :return: the value of every name this frame can see (this is not counted as a copy by --stats)
+        """
+        return self._collect().values()
+
+    def copy(self) -> dict:
+        return self.visible()
+
+
+class BinPFunction:
+    """
+    This class represents a function which is callable
+
+    they have the following syntax:
+    var [type] func [name] = ([type name, type name...]) =>
+    [...]
+    end [name]
+
+    example:
+    var int func add1 = (int x) =>
+        output 'x' before is x
+        return x + 1
+    end add1
+
+    __init__: creates a function object which is a name, return type, parameters, and lines of program
+    run: this is called to actually run the function
+    __str__: is only used for debug purposes
+
+    checked is true when the lines of the function come from a program which passed the static checker.
+    A function which did not (like one from a module cached before the program was checked)
+    runs with the runtime checks turned back on
+    """
+    def __init__(self, name: str, return_type: str, params: list[(str, str)], lines: list[str], checked=False):
+        self._name = name
+        self._return_type = return_type
+        self._params = params
+        self._lines = lines
+        self._checked = checked
+
+        # resolved once here, so calls do not need to look up evaluators for every argument
+        self._slots = resolve_slots(params, lines)
+        self._param_types = [TYPE_TAGS.get(param_type) for param_type, _ in params]
+        self._param_evaluators = [determine_argument_evaluator(param_type) for param_type, _ in params]
+        self._return_eval = determine_evaluator(return_type)
+
+    def __str__(self):
+        """
+        This is called when we output a function instead of its return type.
+        This can be used for debugging function calls inside binp programs
+        It has the following format:
+        name: (param_type1, param_type2, ...) -> return_type
+        :return: a string representation of this function
+        """
+        return f'{self._name}: ({", ".join(elem[0] for elem in self._params)}) -> {self._return_type}'
+
+    def evaluate_arguments(self, line_num: int, line: str, args: list[list], namespace: dict, context: Context) -> list:
+        """
+        This turns the arguments of a call into values with the types of the parameters
+        :param line_num: line number for errors
+        :param line: line for errors
+        :param args: the arguments passed into the function call, one list of values per argument
+        :param namespace: the namespace of the caller, which the arguments are evaluated in
+        :param context: the context of the running program
+        :return: the value of each argument
+        """
+        # make sure the parameters passed are the correct length (the static checker already did this)
+        if not context.checked and len(args) != len(self._params):
+            raise BinPArgumentError(line_num, line, message=f"Incorrect number of arguments in {self._name} call"
+                                                            f"\n{self}")
+
+        values = []
+        for i, arg in enumerate(args):
+            if len(arg) == 1 and type(arg[0]) is self._param_types[i] and \
+                    (type(arg[0]) is not str or arg[0][:1] != "'"):  # a string in quotes still loses its quotes
+                values.append(arg[0])  # already a value of the right type, no need to evaluate it again
+            else:
+                values.append(self._param_evaluators[i](line_num, line, arg, namespace))
+        return values
+
+    def run(self, line_num: int, line: str, args: list[list], namespace: dict):
+        """
+        This runs the function by calling run_program on the lines of code for this function
+        :param line_num: line number for errors
+        :param line: line for errors
+        :param args: the arguments passed into the function call, one list of values per argument
+        :param namespace: the namespace of the caller. the function runs in a new Frame on top of it,
+                so the function can read it but never changes it
+        :return: a value which this function returns
+        """
+        context = current_context()
+        function_namespace = Frame(self._slots, namespace)
+
+        # bind each argument to its parameter by position
+        arguments = self.evaluate_arguments(line_num, line, args, namespace, context)
+        for i, value in enumerate(arguments):
+            function_namespace[self._params[i][1]] = value
+
+        if context.max_call_depth is not None and context.call_depth >= context.max_call_depth:
+            raise BinPRuntimeError(line_num, line, message=f"Function calls went deeper than the limit of "
+                                                           f"{context.max_call_depth}")
+        first_handle = context.files.next_handle
+        checked = context.checked
+        if checked and not self._checked:
+            context.checked = False  # nothing checked the calls and names in its lines
+        context.call_depth += 1
+        if context.stats is not None:
+            context.stats.call(context.call_depth, len(self._slots))
+        if context.memprofile is not None:
+            context.memprofile.enter(self._name, function_namespace)
+        try:
+            value = self.run_lines(line_num, line, function_namespace)
+        finally:
+            context.checked = checked
+            context.call_depth -= 1
+            if context.memprofile is not None:
+                context.memprofile.leave()
+        if context.files.next_handle != first_handle:  # close the files this call opened, unless they are still used
+            context.files.close_since(first_handle, keep=chain([value], arguments, namespace.values()))
+        return value
+
+    def run_lines(self, line_num: int, line: str, function_namespace: Frame):
+        """
+        This runs the lines of the function and evaluates what it returns
+        :param line_num: line number for errors
+        :param line: line for errors
+        :param function_namespace: the frame with the arguments bound
+        :return: a value which this function returns
+        """
+        end_line, function_return = interpreter.run_program(self._lines, function_namespace)
+
+        # returned nothing
+        if function_return is None or function_return == [] or function_return == ['null']:
+            if self._return_type != 'null':
+                raise BinPValueError(line_num, line, message=f"Returned 'null' for type '{self._return_type}'")
+            return 'null'
+
+        value = single_value(function_return, function_namespace, self._return_type)
+        if value is not NO_VALUE:
+            return value
+        if self._return_type == 'str':
+            line = end_line  # a string keeps the spacing it has in its return line, which str_eval finds in the line
+        return self._return_eval(line_num, line, function_return, function_namespace)
+
+
+def resolve_slots(params: list[(str, str)], lines: list[str]) -> dict[str, int]:
+    """
+    This gives every parameter and local variable of a function a slot index.
+    Parameters come first (in order), then every name assigned with 'var' (or a for loop) in the body.
+    The bodies of nested functions are skipped, since those variables belong to the nested function
+    :param params: the (type, name) parameters of the function
+    :param lines: the lines of the function body
+    :return: a dictionary from each local name to its slot index
+    """
+    slots = {}
+    for _, name in params:
+        slots.setdefault(name, len(slots))
+
+    nested_end = None
+    for line in lines:
+        match line.split():
+            case ['end', name] if name == nested_end:
+                nested_end = None
+            case _ if nested_end is not None:
+                pass
+            case ['var', _, 'func', name, '=', *_]:
+                slots.setdefault(name, len(slots))
+                nested_end = name
+            case ['var', _, name, '=', *_] | ['for', '(', 'int', name, '=', *_]:
+                slots.setdefault(name, len(slots))
+    return slots
+
+
+def create_function(line_num: int, lines: list[str], return_type: str, name: str,
+                    params: list[str], interactive=False):
+    """
+    This takes in a line and parses it into a BinPFunction object.
+    We need to parse the parameters and determine which lines of the program are in this function
+    :param line_num: the line number where the function starts
+    :param lines: the entire lines of this block of code (either entire program or another function)
+    :param return_type: the return type of this function
+    :param name: the name of this function
+    :param params: the parameters, which is an un-parsed list of alternating types and names
+    :param interactive: if this is true, we are taking input from the user one line at a time
+    :return: this returns a BinPFunction object as well as an integer for the line number of the end of the function
+    """
+    # a declaration which has run before (in a loop, or inside a function) already has its function.
+    # functions never change once they are made, so the same one is shared by every run of the declaration
+    function_templates = current_context().function_templates
+    key = (id(lines), line_num)
+    template = function_templates.get(key)
+    if template is not None and template[0] is lines and not interactive:
+        return template[1], template[2]
+
+    # parse params into (type, name)
+    params = parse_parameter_declaration(line_num, lines[line_num], params)
+
+    # find the lines of code that reference the function
+    function_lines, end_line_num = parse_function_lines(line_num, lines, name, interactive=interactive)
+
+    function = BinPFunction(name, return_type, params, function_lines, checked=current_context().checked)
+    if not interactive:  # typed lines are read again every time, so they can not be reused
+        function_templates[key] = (lines, function, end_line_num)
+    return function, end_line_num
+
+
+def parse_parameter_declaration(line_num, line, params: list[str]) -> list[(str, str)]:
+    """
+    This takes an alternating list of types and names and converts it to a list of tuples of (type, name)
+    :param line_num: the line number for error printing
+    :param line: the line for error printing
+    :param params: the parameters that need to be parsed
+    :return: a list of (type, name) tuples for the parameters
+    """
+    param_len = len(params)
+    if param_len % 3 != 2 and param_len != 0:
+        raise BinPSyntaxError(line_num, line, message="Incorrect Parameter Declaration")
+
+    parsed_params: list[(str, str)] = []
+    i = 0
+    while i <= param_len-2:
+        type_name = (params[i], params[i+1])  # tuple of (type, name)
+        parsed_params.append(type_name)
+
+        if i+2 < param_len and params[i+2] != ',':
+            raise BinPSyntaxError(line_num, line, message="Incorrect Parameter Declaration")
+        i += 3
+
+    return parsed_params
+
+
+def parse_function_lines(line_num: int, lines: list[str], name: str, interactive=False) -> (list[str], int):
+    """
+    This determines which lines of the program are associated with a specific function. we are searching for:
+    end [name]
+    this marks the end of the function, in which case we return the correct lines
+    as well as the line number for the end of this function
+    :param line_num: the line number for the start of the number
+    :param lines: the lines of the code which need to be associated with this function
+    :param name: the name of this function
+    :param interactive: if this is true, we are taking input from the user one line at a time
+    :return: the lines for this function and the line number of the end
+    """
+    context = current_context()
+    if interactive:
+        lines = []
+        while True:
+            try:
+                line = format_line(context.prompt(INTERACTIVE_PRINT_NESTED))
+                if line.split() == ['end', name]:
+                    return lines, line_num
+                lines.append(line)
+            except KeyboardInterrupt:
+                context.exit(3)
+
+    end_offset = context.function_ends.get(lines[line_num])
+    if end_offset is not None:  # the static checker already found the end of this function
+        return lines[line_num+1:line_num+end_offset], line_num + end_offset
+
+    end_line = line_num
+    for i in range(line_num, len(lines)):
+        line = lines[i].split()
+        if line == ['end', name]:
+            end_line = i
+            break
+
+    if end_line == line_num:
+        raise BinPSyntaxError(line_num, lines[line_num], message=f"Unable to find end of func '{name}'")
+
+    return lines[line_num+1:end_line], end_line
+
+
+def call_function(line_num: int, line: str, name: str, params: list[str], namespace: dict) -> dict:
+    """
+    This serves as a middle ground between actually running the function.
+    This needs to parse the information from running into usable information in the run function
+
+    This may be called by namespace_replacement to substitute in the function value
+    :param line_num: the number of this current line
+    :param line: the line which calls the function
+    :param name: the name of the function being called (to search for in namespace)
+    :param params: the parameters passed into the function
+    :param namespace: the namespace of the caller, which is not modified by the function call
+    :return: the value which the function returns
+    """
+    func = namespace.get(name)
+    if func is None:
+        raise BinPValueError(line_num, line, message=f"Unable to find function '{name}'")
+
+    return func.run(line_num, line, split_arguments(params), namespace)
+
+
+def split_arguments(params: list) -> list[list]:
+    """
+    This splits the values inside a function call into one list of values per argument.
+    Only commas outside of parenthesis separate arguments, and values which have already
+    been evaluated (even strings containing commas) are never split
+    :param params: the values between the parenthesis of the function call
+    :return: a list with the values of each argument
+    """
+    if not params:
+        return []
+
+    args = [[]]
+    depth = 0
+    for param in params:
+        if isinstance(param, str):
+            if param == '(':
+                depth += 1
+            elif param == ')':
+                depth -= 1
+            elif param == ',' and depth == 0:
+                args.append([])
+                continue
+        args[-1].append(param)
+    return args
+
+
+def parse_function_call(line_num: int, line: str, vals: list[str], namespace: dict,
+                        index=0, depth=0) -> (list[str], int):
+    """
+    This takes a list of values and recursively parses it into smaller
+    function calls until we are at a base case.
+    In that situation it calls the function and passes its return value
+    to its caller. This means the value returns up the tree and continues
+    to be used in further function calls.
+
+    The end result is the list of values passed in, but every function
+    call is replaced with its return value. This can then be stored as
+    a parameter, or evaluated as a parameter in another function call
+    (hence the recursive nature)
+    :param line_num: the line number of the function parsing
+    :param line: which line we are on for error printing
+    :param vals: the values to parse for this current call
+    :param namespace: used for running the function
+    :param index: the index in this list to use. this is faster than popping, removing items, or slicing
+    :param depth: the current function depth we are in,
+            use this to evaluate parenthesis-wrapped expression inside functions
+    :return: a list of values with function calls substituted in
+            it also returns the index in the list where to continue parsing
+    """
+    i = index
+    parsed_vals = []
+    while i < len(vals):
+        try:
+            if i + 1 < len(vals) and vals[i+1] == '(' and isinstance(namespace.get(vals[i]), BinPFunction):
+                # if we have found a function name, and it has a parenthesis after it
+                function_params, end_i = parse_function_call(line_num, line, vals, namespace, index=i+2, depth=0)
+
+                # parsed the parameters recursively, now evaluate this function call
+                function_return = call_function(line_num, line, vals[i], function_params, namespace)
+                parsed_vals.append(function_return)
+                i = end_i  # end_i is the index after we have evaluated this function,
+                # that way we don't parse over already-parsed data
+
+            elif vals[i] == '(':
+                parsed_vals.append(vals[i])
+                depth += 1  # increase depth counter by 1, so we don't exit from a function call too early
+            elif vals[i] == ')':
+                if depth > 0:
+                    parsed_vals.append(vals[i])
+                    depth -= 1  # closing out of a () expression
+                else:
+                    return parsed_vals, i  # closing out of a function
+
+            else:
+                parsed_vals.append(vals[i])
+        except IndexError:
+            raise BinPSyntaxError(line_num, line, message="Improper end to function call")
+
+        i += 1
+
+    return parsed_vals, len(vals)
+
+
+def defer_function_calls(line_num: int, line: str, vals: list, namespace: dict) -> list:
+    """
+    This replaces every function call in vals with a function that runs the call when it is needed.
+    This is used by boolean expressions, so that calls on the skipped side of && and || never run
+    :param line_num: the line number for error printing
+    :param line: the line for error printing
+    :param vals: the values to search for function calls
+    :param namespace: the namespace with the functions, used when the call is finally run
+    :return: a new list of values where each function call is a single callable
+    """
+    deferred = []
+    i = 0
+    while i < len(vals):
+        if i + 1 < len(vals) and vals[i+1] == '(' and isinstance(namespace.get(vals[i]), BinPFunction):
+            # find the parenthesis which closes this function call
+            depth = 0
+            end_i = i + 1
+            while end_i < len(vals):
+                if vals[end_i] == '(':
+                    depth += 1
+                elif vals[end_i] == ')':
+                    depth -= 1
+                    if depth == 0:
+                        break
+                end_i += 1
+            if end_i == len(vals):
+                raise BinPSyntaxError(line_num, line, message="Improper end to function call")
+
+            call_vals = vals[i:end_i+1]
+            deferred.append(lambda call_vals=call_vals:
+                            parse_function_call(line_num, line, list(call_vals), namespace)[0][0])
+            i = end_i + 1
+            continue
+
+        deferred.append(vals[i])
+        i += 1
+
+    return deferred
@@ -0,0 +1,17 @@
+class BinPHandle:
+    """
+    This class is a handle returned by fopen, the value of a 'file' variable
+
+    Handles have their own type so that an int which happens to equal a handle is never mistaken for it
+    (a function which returns an int does not keep a file it opened open). Each handle has a number
+    which only ever goes up, so a function can find every file opened while it ran
+
+    :param number: the number of the handle
+    """
+    __slots__ = ('number',)
+
+    def __init__(self, number: int):
+        self.number = number
+
+    def __str__(self):
+        return str(self.number)
@@ -0,0 +1,152 @@
+import mmap
+import sys
+
+from binp.errors import BinPRuntimeError
+from binp.evaluators import parse_value, TYPE_TAGS
+from binp.formatting import BEGIN_PRINT
+
+BUFFER_SIZE = 1 << 16  # piped input is read in chunks of this many bytes
+
+
+class InputReader:
+    """
+    This class reads the values for 'var type name = input'
+
+    When a person is typing (stdin is a terminal, or the interactive prompt is running)
+    each value is read with input() after printing the ' >> ' prompt.
+    When stdin is piped in, it is read through a large buffer with no prompts,
+    and ints are parsed straight from the bytes in the buffer
+
+    It also reads files opened with fopen, from a memory map
+
+    :param stream: a binary buffered stream (or memory map) to read from, or None to prompt with input()
+    """
+    def __init__(self, stream=None):
+        self._stream = stream
+        self._eof = False
+        self.lines_read = 0  # so a program resumed from a checkpoint can skip what it already read
+
+    def read_value(self, line_num: int, line: str, var_type: str):
+        """
+        This reads the next line of input
+        :param line_num: the line number for error printing
+        :param line: the line for error printing
+        :param var_type: the type of the variable being read
+        :return: the value if the whole line is a value of var_type, otherwise the text of the line
+        """
+        if self._stream is None:
+            try:
+                raw_input = input(BEGIN_PRINT)
+            except EOFError:
+                self._eof = True
+                raise BinPRuntimeError(line_num, line, message="No more input to read")
+            self.lines_read += 1
+            return typed_value(raw_input, var_type)
+
+        raw_input = self._stream.readline()
+        if not raw_input:
+            self._eof = True
+            raise BinPRuntimeError(line_num, line, message="No more input to read")
+        self.lines_read += 1
+
+        if var_type == 'int':
+            value = raw_input.strip()
+            digits = value[1:] if value[:1] == b'-' else value
+            if digits.isdigit():
+                number = int(value)
+                if str(number).encode() == value:  # the same rule as parse_value, so '007' is not an int
+                    return number
+
+        return typed_value(raw_input.decode().rstrip('\r\n'), var_type)
+
+    def read_line(self) -> str | None:
+        """
+        This reads the next line of input as text, for --each-line
+        :return: the line (without its newline), or None once there is nothing left to read
+        """
+        if self._stream is None:
+            try:
+                raw_input = input(BEGIN_PRINT)
+            except EOFError:
+                self._eof = True
+                return None
+            self.lines_read += 1
+            return raw_input
+
+        raw_input = self._stream.readline()
+        if not raw_input:
+            self._eof = True
+            return None
+        self.lines_read += 1
+        return raw_input.decode().rstrip('\r\n')
+
+    def skip(self, count: int) -> None:
+        """
+        This skips lines which were already read before a checkpoint was saved.
+        Only piped input can be skipped, a person typing input is not asked for it again
+        :param count: the number of lines to skip
+        """
+        if self._stream is None:
+            return
+        for _ in range(count):
+            if not self._stream.readline():
+                break
+            self.lines_read += 1
+
+    def tell(self) -> int:
+        """
+        :return: the position of the next line in the stream, so a checkpoint can reopen a file where it was
+        """
+        return self._stream.tell()
+
+    def seek(self, offset: int) -> None:
+        """
+        This moves to a position returned by tell, when a file is reopened from a checkpoint
+        :param offset: the position of the next line to read
+        """
+        self._stream.seek(offset)
+
+    def at_eof(self) -> bool:
+        """
+        This checks if there is nothing left to read
+        When prompting, this only knows about the end of input once a read has hit it
+        :return: true if there is no more input
+        """
+        if self._stream is None:
+            return self._eof
+        if type(self._stream) is mmap.mmap:
+            return self._stream.tell() >= len(self._stream)
+        return not self._stream.peek(1)
+
+    def close(self) -> None:
+        """
+        This closes the stream being read
+        """
+        if self._stream is not None:
+            self._stream.close()
+
+
+def typed_value(raw_input: str, var_type: str):
+    """
+    This converts a line of input into a value when it is exactly a value of the type being read
+    :param raw_input: the line of input
+    :param var_type: the type of the variable being read
+    :return: the value, or the line itself when it has to be evaluated as an expression
+    """
+    if var_type != 'str':
+        value = parse_value(raw_input.strip())
+        if type(value) is TYPE_TAGS.get(var_type):
+            return value
+    return raw_input
+
+
+def stdin_reader() -> InputReader:
+    """
+    This makes the reader for a program run from a file. It prompts when stdin is a terminal
+    and reads through a large buffer when stdin is piped in
+    (the interactive prompt always reads with input())
+    :return: the reader for stdin
+    """
+    if sys.stdin is not None and not sys.stdin.isatty():
+        return InputReader(open(sys.stdin.fileno(), 'rb', buffering=BUFFER_SIZE, closefd=False))
+    return InputReader()
@@ -0,0 +1,302 @@
+import time
+
+from binp.errors import BinPSyntaxError, BinPValueError, BinPArgumentError, BinPRuntimeError, BinPExit, \
+    BinPCheckpointError
+from binp.functions import create_function, parse_function_call, BinPFunction
+from binp.evaluators import namespace_replacement, interpolate, determine_evaluator, replace_variables, parse_value, \
+    single_value, NO_VALUE, TYPE_TAGS
+from binp.conditionals import handle_if, handle_while, handle_for
+from binp.formatting import format_line
+from binp.lexer import KEYWORDS, SourceLine
+from binp.context import Context, CURRENT_CONTEXT, current_context
+
+INVALID_VARIABLE_NAMES = KEYWORDS
+VALID_VARIABLE_CHARS = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ123456789_')
+
+
+def parse_line(line_num: int, lines: list[str], local_namespace: dict,
+               execute=True, interactive=False, skip_input=False) -> (dict, int, list[str] | None):
+    """
+    This is the highest level for parsing input. it handles:
+        comments, output, variable assignment, if statements, while loops, for loops, imports
+
+    Each of these lines is passed into a new parser for that specific type
+    It also throws CustomSyntaxErrors when parsing fails
+    :param line_num: the current line number of the program
+    :param lines: all the lines (needed to find end of functions)
+    :param local_namespace: namespace of the current line being run.
+            this can be the global namespace or a copied namespace
+            within a function call
+    :param execute: if this is false, we do not want to execute this line of code,
+            rather just act like we did, and move the line_number along accordingly
+    :param interactive: if this is true, we are taking input from the user one line at a time
+    :param skip_input: this is passed through to interactive while loops, so they don't ask
+            for input after being created
+    :return: the new namespace with added variables
+    """
+    retval = None
+    context = current_context()
+    if execute and context.stats is not None:
+        context.stats.statement(lines[line_num])
+    if execute and context.memprofile is not None:
+        context.memprofile.statement(lines[line_num])
+
+    match lines[line_num].split():
+        case []:
+            pass  # skip blank lines
+        case ['$', *_]:
+            pass  # skip comments
+
+        case ['output', *_]:  # output a value
+            if execute:
+                output(lines[line_num], local_namespace)
+
+        case ['var', *x]:  # variable assignment
+            if execute or x[1:2] == ['func']:  # a function which is not run still needs to skip to its end
+                local_namespace, line_num = var_assign(x, line_num, lines, local_namespace,
+                                                       execute=execute, interactive=interactive)
+
+        case ['if', '(', *conditions, ')', '=', '>']:  # if statement
+            local_namespace, line_num, retval = handle_if(line_num, lines, conditions, local_namespace,
+                                                          execute=execute,
+                                                          interactive=interactive,
+                                                          skip_input=skip_input)
+
+        case ['while', '(', *conditions, ')', '=', '>']:  # while loop
+            local_namespace, line_num, retval = handle_while(line_num, lines, conditions, local_namespace,
+                                                             execute=execute,
+                                                             interactive=interactive,
+                                                             skip_input=skip_input)
+
+        case ['for', '(', 'int', name, '=', *bounds, ')', '=', '>']:  # counted loop
+            local_namespace, line_num, retval = handle_for(line_num, lines, name, bounds, local_namespace,
+                                                           execute=execute,
+                                                           interactive=interactive,
+                                                           skip_input=skip_input)
+
+        case ['import', *vals]:  # adding the functions of another file
+            if execute:
+                from binp.modules import import_module  # only loaded when it is used
+                local_namespace = import_module(line_num, lines[line_num], vals, local_namespace)
+
+        case [func_name, '(', *params, ')']:  # function call
+            if execute:
+                vals = replace_variables([func_name, '(', *params, ')'], local_namespace)
+                parse_function_call(line_num, lines[line_num], vals, local_namespace)
+
+        case ['return', *vals]:  # returning a value
+            if execute:
+                return None, line_num, vals  # WARNING: might need to make this return local_namespace
+
+        case _:
+            raise BinPSyntaxError(line_num, lines[line_num])
+
+    line_num += 1
+    return local_namespace, line_num, retval  # return none when there are no return values to pass up
+
+
+def var_assign(statements: list[str], line_num: int, lines: list[str], local_namespace: dict,
+               execute=True, interactive=False) -> (dict, int):
+    """
+    This handles a variable assignment statement
+    it has the form
+    var type name = value(s)
+
+    example:
+    var int age = 42
+    var str name = bennett
+    var str description = name is age year(s) old
+    :param statements: the list of statements comprising the variable assignment
+            (without var because that has been removed)
+    :param line_num: the line number for error messages
+    :param lines: all the lines of this section of code
+    :param local_namespace: the namespace which will be updates with the new variable
+    :param execute: if this is false, we do not actually create the variable,
+            but rather we act like we created it for keeping track of the line number
+    :param interactive: if this is true, we are taking input from the user one line at a time
+    :return: the new namespace with this variable added
+    """
+    line = lines[line_num]
+    new_variable = None
+
+    match statements:
+        case [return_type, 'func', name, '=', '(', *params, ')', '=', '>']:  # function declaration
+            # create function
+            new_variable, line_num = \
+                create_function(line_num, lines, return_type, name, params, interactive=interactive)
+
+        case [var_type, name, '=', 'input']:
+            if execute:
+                context = current_context()
+                start = time.perf_counter() if context.stats is not None else None
+                new_variable = context.stdin.read_value(line_num, line, var_type)  # user input is the value
+                if start is not None:
+                    context.stats.io_time += time.perf_counter() - start
+                if type(new_variable) is not TYPE_TAGS.get(var_type) or var_type == 'str':
+                    typed = format_line(new_variable)
+                    if var_type == 'str':
+                        new_variable = interpolate(typed, 0, local_namespace)
+                    else:
+                        eval_func = determine_evaluator(var_type)
+                        new_variable = eval_func(line_num, line[:-5] + typed, typed.split(), local_namespace)
+
+        case [var_type, name, '=', *vals]:  # create type variable
+            new_variable = single_value(vals, local_namespace, var_type)
+            if new_variable is NO_VALUE:
+                eval_func = determine_evaluator(var_type)
+                new_variable = eval_func(line_num, line, vals, local_namespace)
+
+        case _:
+            raise BinPSyntaxError(line_num, line, message="Invalid variable assignment")
+
+    if execute and new_variable is not None:
+        context = current_context()
+        if not context.checked:
+            name = valid_name(line_num, line, name)
+        local_namespace[name] = new_variable
+        if context.stats is not None and type(local_namespace) is dict:  # frames are counted when they are made
+            context.stats.namespace(len(local_namespace))
+    return local_namespace, line_num
+
+
+def valid_name(line_num, line, name: str) -> str:
+    """
+    This function checks that a variable name is valid
+    :param line_num: the line number for error printing
+    :param line: the line for error printing
+    :param name: the name of the variable to check
+    :return: the variable name if it is valid
+    :throws: BinPSyntaxError if the name is invalid
+    """
+    if set(name).issubset(VALID_VARIABLE_CHARS) and \
+            name not in INVALID_VARIABLE_NAMES and \
+            not name[0].isdecimal():
+        return name
+
+    raise BinPSyntaxError(line_num, line, message="Invalid variable name. "
+                                                  "Variables must start with alpha and cannot be a restricted term")
+
+
+def output(line: SourceLine, local_namespace: dict) -> None:
+    """
+    This searches through the output message and replaces any instances of a
+    variable with its value. it does not replace variables surrounded with '' or "".
+    Everything else is output exactly as it was written
+    :param line: the output line
+    :param local_namespace: the namespace with every variable and its value
+    :return: prints out the line to the console
+    """
+    if not isinstance(line, SourceLine):
+        line = format_line(line)
+    context = current_context()
+    if context.output_format == 'jsonl':
+        from binp.jsonl import output_record  # only loaded when it is used
+        start = len('output ')
+        context.write(output_record(line, start, interpolate(line, start, local_namespace), local_namespace))
+        return
+    context.output(namespace_replacement(line, len('output '), local_namespace))
+
+
+def run_program(lines: list[str], local_namespace: dict, context: Context = None,
+                start: int = 0) -> (str, None | list[str]):
+    """
+    This loops through the file and runs each line 1 by 1
+    :param lines: the lines of this current program which need to be run
+    :param local_namespace: the namespace for this current program run
+            this could be global for the entire program or a copy for functions
+    :param context: the context to run a program in. this is only given when starting a program,
+            function bodies run in the context of the program which called them
+    :param start: the line to start running from (a program resumed from a checkpoint does not start at 0)
+    """
+    if context is not None:
+        token = CURRENT_CONTEXT.set(context)
+        try:
+            return run_program(lines, local_namespace, start=start)
+        finally:
+            CURRENT_CONTEXT.reset(token)
+
+    # only the main program is checkpointed, the lines of a function (or a module) are never the same list
+    checkpoint = current_context().checkpoint
+    if checkpoint is not None and checkpoint.lines is not lines:
+        checkpoint = None
+
+    line_num: int = start
+    while line_num < len(lines):
+        if checkpoint is not None and checkpoint.due():
+            try:
+                context = current_context()
+                checkpoint.save(line_num, local_namespace, context.stdin.lines_read, context.files)
+            except BinPCheckpointError as err:
+                stop(err)
+        try:
+            local_namespace, line_num, retval = parse_line(line_num, lines, local_namespace)
+        except (BinPSyntaxError, BinPValueError, BinPArgumentError, BinPRuntimeError) as err:
+            stop(err)  # change this to 'raise err' if you want the stacktrace of the exception
+        except (TypeError, AttributeError):
+            stop(BinPValueError(line_num, lines[line_num],
+                                message='Improper Type, most likely due to null type or improper variable assignment'))
+        except RecursionError:
+            stop(BinPRuntimeError(line_num, lines[line_num], message='Function calls went too deep'))
+        except KeyboardInterrupt:
+            current_context().exit(3)
+        except BinPExit:
+            raise  # the error was already printed by the function which stopped
+        except:  # we want to catch all other errors and apologize to the user
+            stop(BinPSyntaxError(line_num, lines[line_num],
+                                 message='Oops, we appear to have an uncaught error. Sorry!'))
+
+        if retval is not None and retval != 'null':  # we got a return value from this function, so we need to pass on the return
+            return lines[line_num], retval
+
+    if not lines:
+        return None, None
+    return lines[line_num - 1], None  # return none since there was no return in this section
+
+
+def stop(err: Exception):
+    """
+    This prints an error and stops the running program
+    :param err: the error to print
+    """
+    context = current_context()
+    context.error(err)
+    context.exit(3)
+
+
+def get_cli_args(args) -> dict:
+    """
+    This takes the command line arguments passed to python and
+    converts them to command line arguments in binp.
+    Arguments which are exactly an int or a bool (like 42 or True) are stored as those types
+    :param args: the arguments passed to this program
+    :return: the global namespace with command line arguments
+    """
+    retval = {
+        "ARG_COUNT": len(args)
+    }
+    for i in range(len(args)):
+        value = parse_value(args[i])  # typed once here, instead of every time it is used
+        retval[f"ARG_{i}"] = value if str(value) == args[i] else args[i]
+
+    return retval
+
+
+def get_unaries(global_namespace: dict) -> dict:
+    """
+    This defines two unary functions, int_negate and bool_negate,
+    which are used to perform unary operations,
+    since we do not have support for those in normal expressions
+    :param global_namespace: the global namespace with command line arguments
+    :return: the global namespace with two built-in functions added
+    """
+    int_negate_params = [('int', 'x')]
+    int_negate_lines = [format_line('return 0 - x')]
+    int_negate = BinPFunction('int_negate', 'int', int_negate_params, int_negate_lines)
+    global_namespace['int_negate'] = int_negate
+
+    bool_negate_params = [('bool', 'x')]
+    bool_negate_lines = [format_line(line) for line in ['if (x) =>', 'return false', 'end', 'return true']]
+    bool_negate = BinPFunction('bool_negate', 'bool', bool_negate_params, bool_negate_lines)
+    global_namespace['bool_negate'] = bool_negate
+
+    return global_namespace
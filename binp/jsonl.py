@@ -0,0 +1,70 @@
+import json
+
+from binp.errors import BinPRuntimeError, BinPSyntaxError, BinPValueError, BinPArgumentError, BinPSessionError
+from binp.functions import BinPFunction
+from binp.lexer import SourceLine, IDENTIFIER
+from binp.sessions import encode_value
+
+# the kind of each error which has a line, for its record
+ERROR_KINDS = {
+    BinPRuntimeError: 'runtime',
+    BinPSyntaxError: 'syntax',
+    BinPValueError: 'value',
+    BinPArgumentError: 'argument',
+}
+
+
+def output_record(line: SourceLine, start: int, text: str, local_namespace: dict) -> str:
+    """
+    This makes the record for an output statement, for --output-format=jsonl
+
+    The record has the line number in the file (even inside a function) and the source of the line,
+    the text exactly as it would be output (without the ' >> ' in front or the space after it),
+    and the value of every variable in the text, typed the same way a session saves it ({"type": "int", "value": 5})
+    :param line: the output line
+    :param start: the position in the raw line where the text to output starts
+    :param text: the output text, with its variables substituted
+    :param local_namespace: the namespace the output ran in
+    :return: the record, as a line of JSON
+    """
+    values = {}
+    for token in line.tokens:
+        if token.col < start or token.kind != IDENTIFIER or token.text in values:
+            continue
+        value = local_namespace.get(token.text)
+        if value is None or isinstance(value, BinPFunction):
+            continue
+        try:
+            values[token.text] = encode_value('', token.text, value)
+        except BinPSessionError:
+            continue  # not a value a program can have, so it is left out
+
+    return json.dumps({
+        'type': 'output',
+        'line': line.line_num + 1,
+        'source': line.raw,
+        'text': str(text),
+        'values': values,
+    })
+
+
+def error_record(err: Exception) -> str:
+    """
+    This makes the record for an error which stopped a program, for --output-format=jsonl
+    :param err: the error
+    :return: the record, as a line of JSON
+    """
+    kind = ERROR_KINDS.get(type(err))
+    if kind is None:  # an error without a line, like a checkpoint which could not be written
+        return json.dumps({'type': 'error', 'kind': 'other', 'message': str(err)})
+
+    # an error only knows its line number in the lines of its function, but its line knows where it is in the file
+    line = err._line
+    line_num = line.line_num if isinstance(line, SourceLine) else err._num
+    return json.dumps({
+        'type': 'error',
+        'kind': kind,
+        'line': line_num + 1,
+        'source': line.raw if isinstance(line, SourceLine) else str(line),
+        'message': err._reason,
+    })
@@ -0,0 +1,199 @@
+# the operators which split tokens. longer operators are checked first
+# (we do not use the re module here, since importing it is a large part of starting the interpreter)
+DOUBLE_OPERANDS = ('!=', '<=', '>=', '==', '&&', '||')
+SINGLE_OPERANDS = set('<>=+,-./*$()%')
+QUOTES = {"'", '"'}
+KEYWORDS = {'if', 'else', 'while', 'for', 'end', 'then', 'return', 'func', 'int', 'str', 'bool', 'seq', 'map', 'file',
+            'fn', 'null', 'tup', 'var', 'output', 'input', 'true', 'false', 'import'}
+IDENTIFIER_CHARS = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_')
+
+# the kinds of token
+IDENTIFIER = 'identifier'
+INT = 'int'
+OPERATOR = 'operator'
+KEYWORD = 'keyword'
+STRING = 'string'  # text in quotes, which is kept exactly as it is written
+WORD = 'word'  # any other text, like the words of an output
+
+
+class Token:
+    """
+    This class is a single token of a line
+
+    :param text: the text of the token, exactly as it is written
+    :param kind: what kind of token it is (IDENTIFIER, INT, OPERATOR, KEYWORD, STRING or WORD)
+    :param line: the line number of the token
+    :param col: where the token starts in the line (after the line is stripped)
+    """
+    __slots__ = ('text', 'kind', 'line', 'col')
+
+    def __init__(self, text: str, kind: str, line: int, col: int):
+        self.text = text
+        self.kind = kind
+        self.line = line
+        self.col = col
+
+    def __repr__(self):
+        return f'Token({self.text!r}, {self.kind}, {self.line}:{self.col})'
+
+
+class SourceLine(str):
+    """
+    This class is a line of a program which has been lexed
+
+    It is the formatted line (every operator has spaces around it, so the old split() based
+    parsing still works on it and errors can print it) but it is lexed only once, when it is made.
+    split() returns the text of its tokens without splitting it again, and the tokens and the
+    line as it was written are kept, so strings and output can use the exact text that was written
+
+    Text in quotes is a single token, so it is never split around operators or searched for variables
+
+    :param raw: the line, as it was written
+    :param line_num: the line number in the file it was read from (a line in a function keeps its number),
+            for the tokens and for reports which point at the line
+    """
+    def __new__(cls, raw: str, line_num: int = 0):
+        raw = raw.strip()
+        tokens, formatted = lex(raw, line_num)
+        self = super().__new__(cls, formatted)
+        self.raw = raw
+        self.line_num = line_num
+        self.tokens = tokens
+        self._words = [token.text for token in tokens]
+        self.sites = {}  # the tokens of each expression in this line -> its inline cache (see caches.py)
+        return self
+
+    def split(self, sep=None, maxsplit=-1) -> list[str]:
+        if sep is None and maxsplit == -1:
+            return list(self._words)  # a copy, since callers are free to change the list they get
+        return super().split(sep, maxsplit)
+
+    def start_of(self, vals: list) -> int | None:
+        """
+        This finds where a list of values, which are the last tokens of this line, starts
+        :param vals: the values which might be the end of the line
+        :return: the position of the first value in the raw line, or None if vals are not the end of this line
+        """
+        count = len(vals)
+        if count == 0:
+            return len(self.raw)
+        if count > len(self._words) or self._words[-count:] != vals:
+            return None
+        return self.tokens[-count].col
+
+
+def token_kind(text: str) -> str:
+    """
+    :param text: the text of a token which is not an operator or a string
+    :return: the kind of the token
+    """
+    if text.isdecimal():
+        return INT
+    if text in KEYWORDS:
+        return KEYWORD
+    if text[0].isalpha() and set(text) <= IDENTIFIER_CHARS:
+        return IDENTIFIER
+    return WORD
+
+
+def split_operands(line: str) -> list[str]:
+    """
+    This splits a line around every operator, keeping the operators.
+    The text between two operators is kept exactly (even when it is empty), so
+    joining the result gives back the original line
+    :param line: the line to split
+    :return: the pieces of the line, alternating between text and operators
+    """
+    pieces = []
+    start = 0
+    i = 0
+    length = len(line)
+    while i < length:
+        if line[i:i+2] in DOUBLE_OPERANDS:
+            size = 2
+        elif line[i] in SINGLE_OPERANDS:
+            size = 1
+        else:
+            i += 1
+            continue
+
+        pieces.append(line[start:i])
+        pieces.append(line[i:i+size])
+        i += size
+        start = i
+
+    pieces.append(line[start:])
+    return pieces
+
+
+def string_end(line: str, start: int) -> int | None:
+    """
+    This checks for a string in quotes starting at a position of a line.
+    A quote only starts a string at the start of a word (so the ' in don't does not),
+    and only when the same quote closes it later in the line
+    :param line: the line
+    :param start: the position of the quote
+    :return: the position after the closing quote, or None if there is no string here
+    """
+    if start > 0 and not line[start-1].isspace() and line[start-1] not in SINGLE_OPERANDS \
+            and line[start-2:start] not in DOUBLE_OPERANDS:
+        return None
+    end = line.find(line[start], start + 1)
+    if end == -1:
+        return None
+    return end + 1
+
+
+def lex(line: str, line_num: int = 0) -> (list[Token], str):
+    """
+    This splits a line into tokens, in a single pass over the line
+    :param line: the line (already stripped)
+    :param line_num: the line number, for the tokens
+    :return: the tokens, and the formatted line (the line with spaces around every operator outside of strings)
+    """
+    tokens = []
+    formatted = []
+
+    # the line is cut into strings and the text between them, which is split around operators
+    segment_start = 0
+    i = 0
+    length = len(line)
+    while i <= length:
+        end = string_end(line, i) if i < length and line[i] in QUOTES else None
+        if end is None and i < length:
+            i += 1
+            continue
+
+        position = segment_start
+        pieces = split_operands(line[segment_start:i])
+        formatted.append(" ".join(pieces))
+        for n, piece in enumerate(pieces):
+            if n % 2:  # odd pieces are operators
+                tokens.append(Token(piece, OPERATOR, line_num, position))
+            else:
+                offset = 0
+                for word in piece.split():
+                    offset = piece.index(word, offset)
+                    tokens.append(Token(word, token_kind(word), line_num, position + offset))
+                    offset += len(word)
+            position += len(piece)
+
+        if end is None:
+            break
+        tokens.append(Token(line[i:end], STRING, line_num, i))
+        formatted.append(line[i:end])
+        segment_start = i = end
+
+    return tokens, "".join(formatted)
+
+
+def unquote(text: str) -> str:
+    """
+    This takes the quotes off of a string in single quotes, which is how a quoted
+    word (like a variable name that should not be replaced) is written
+    :param text: the text of a token
+    :return: the text inside the quotes, or the text itself if it is not in single quotes
+    """
+    if len(text) >= 2 and text[0] == "'" and text[-1] == "'":
+        return text[1:-1]
+    return text
@@ -0,0 +1,100 @@
+from binp.errors import BinPValueError
+
+
+class BinPMap:
+    """
+    This class is a map from int or str keys to values, the value of a 'map' variable
+
+    Unlike every other value, a map is changed in place by map_set and map_remove. Assigning a map to
+    another variable, or passing it into a function, does not copy it: both names refer to the same map,
+    so a function can fill in a map for its caller
+
+    Keys are kept in the order they were first set. map_key(m, i) gets the key at a position,
+    so a program can loop over a map with a for loop. The keys are only put in a list again after
+    a key is added or removed, so looping over a map which does not change is O(1) per key
+    """
+    __slots__ = ('_items', '_keys')
+
+    def __init__(self, items: dict = None):
+        self._items = {} if items is None else items
+        self._keys = None  # the keys in order, made when map_key is first used after a change
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __str__(self):
+        return '{' + ', '.join(f'{key}: {value}' for key, value in self._items.items()) + '}'
+
+    def items(self):
+        """
+        :return: the (key, value) pairs, in the order the keys were first set
+        """
+        return self._items.items()
+
+    def get(self, line_num: int, line: str, key: int | str):
+        """
+        :param line_num: the line number for error printing
+        :param line: the line for error printing
+        :param key: the key
+        :return: the value of the key
+        """
+        check_key(line_num, line, key)
+        try:
+            return self._items[key]
+        except KeyError:
+            raise BinPValueError(line_num, line, message=f"Key '{key}' is not in the map")
+
+    def set(self, line_num: int, line: str, key: int | str, value) -> None:
+        """
+        :param line_num: the line number for error printing
+        :param line: the line for error printing
+        :param key: the key, which is added if it is not already in the map
+        :param value: the new value of the key
+        """
+        check_key(line_num, line, key)
+        if key not in self._items:
+            self._keys = None
+        self._items[key] = value
+
+    def remove(self, line_num: int, line: str, key: int | str) -> None:
+        """
+        :param line_num: the line number for error printing
+        :param line: the line for error printing
+        :param key: the key to remove
+        """
+        check_key(line_num, line, key)
+        if key not in self._items:
+            raise BinPValueError(line_num, line, message=f"Key '{key}' is not in the map")
+        del self._items[key]
+        self._keys = None
+
+    def contains(self, key: int | str) -> bool:
+        """
+        :param key: the key
+        :return: true if the key is in the map
+        """
+        return type(key) is not bool and key in self._items
+
+    def key(self, line_num: int, line: str, index: int) -> int | str:
+        """
+        :param line_num: the line number for error printing
+        :param line: the line for error printing
+        :param index: the position of the key, from 0
+        :return: the key at that position
+        """
+        if not 0 <= index < len(self._items):
+            raise BinPValueError(line_num, line, message=f"Index {index} is outside of a map of size {len(self)}")
+        if self._keys is None:
+            self._keys = list(self._items)
+        return self._keys[index]
+
+
+def check_key(line_num: int, line: str, key) -> None:
+    """
+    This makes sure a value can be a key. A bool can not, since true and 1 would be the same key
+    :param line_num: the line number for error printing
+    :param line: the line for error printing
+    :param key: the key
+    """
+    if type(key) is not int and type(key) is not str:
+        raise BinPValueError(line_num, line, message=f"Invalid key '{key}', keys must be an int or a str")
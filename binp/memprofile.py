@@ -0,0 +1,159 @@
+import sys
+import tracemalloc
+
+from binp.lexer import SourceLine
+
+TOP_LINES = 15  # how many lines are shown in the report
+
+
+class MemoryProfiler:
+    """
+    This class finds which lines and functions of a binp program use memory, for --memprofile
+
+    tracemalloc only knows which lines of the interpreter allocated memory, which all look the same
+    for every binp program. So instead, the memory in use is read before every statement runs, and
+    whatever it grew by since the statement before is charged to that statement (and the function it is in).
+    Everything a statement allocates is counted, including what the interpreter allocates to run it
+
+    The peak is blamed on the statement which grew memory the most on the way up to it, instead of
+    whichever statement was running when it was reached (often a later one adding a few bytes on top).
+    When memory reaches a new peak, the functions which are running and the size of
+    each of their namespaces are saved, so the report can show what was alive at the peak
+    """
+    def __init__(self):
+        self.lines = {}  # (function, line number, line) -> [times run, bytes allocated]
+        self.functions = {}  # function -> [calls, bytes allocated]
+        self._stack = []  # (name, namespace, location of the call) of every function which is running
+        self._globals = {}
+        self._location = None
+        self._last = 0  # the memory in use when the statement at _location started
+        self._climb = None  # (location, bytes) of the biggest growth since memory last went down
+
+        self.peak = 0
+        self.peak_location = None
+        self.peak_frames = []  # (name, namespace size) of every function running at the peak
+        self.peak_global_size = 0
+
+    def start(self, global_namespace: dict) -> None:
+        """
+        This starts tracing memory
+        :param global_namespace: the namespace the program runs in
+        """
+        self._globals = global_namespace
+        tracemalloc.start()
+        self._last = tracemalloc.get_traced_memory()[0]
+
+    def stop(self) -> None:
+        """
+        This charges the last statement and stops tracing memory.
+        It should be called as soon as the program stops running, so nothing allocated after it is charged
+        """
+        if tracemalloc.is_tracing():
+            self._charge()
+            tracemalloc.stop()
+
+    def statement(self, line: SourceLine) -> None:
+        """
+        This is called right before a statement runs
+        :param line: the line of the statement, which knows its line number in the file
+        """
+        self._charge()
+        self._location = (self._stack[-1][0] if self._stack else '<main>', line.line_num, line)
+        entry = self.lines.get(self._location)
+        if entry is None:
+            self.lines[self._location] = entry = [0, 0]
+        entry[0] += 1
+        self._last = tracemalloc.get_traced_memory()[0]  # the entry above is not charged to the program
+        tracemalloc.reset_peak()
+
+    def enter(self, name: str, namespace) -> None:
+        """
+        This is called when a function starts running
+        :param name: the name of the function
+        :param namespace: the namespace of the call
+        """
+        self._stack.append((name, namespace, self._location))
+        entry = self.functions.get(name)
+        if entry is None:
+            self.functions[name] = entry = [0, 0]
+        entry[0] += 1
+
+    def leave(self) -> None:
+        """
+        This is called when a function stops running. Its last statement is charged while it is still
+        running, and whatever the call allocates after it returns is charged to the statement which called it
+        """
+        self._charge()
+        self._location = self._stack.pop()[2]
+        self._last = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def _charge(self) -> None:
+        """
+        This charges the memory allocated since the last statement started to that statement,
+        and checks if memory reached a new peak while it ran
+        """
+        if self._location is None:
+            return  # no statement has run yet
+        current, highest = tracemalloc.get_traced_memory()
+        grown = current - self._last
+        if grown > 0:
+            self.lines[self._location][1] += grown
+            function = self._location[0]
+            if function in self.functions:
+                self.functions[function][1] += grown
+
+        step = highest - self._last  # including anything the statement freed again before it finished
+        if self._climb is None or step > self._climb[1]:
+            self._climb = (self._location, step)
+        if highest > self.peak:
+            self.peak = highest
+            self.peak_location = self._climb[0]
+            self.peak_frames = [(name, len(namespace.locals())) for name, namespace, _ in self._stack]
+            self.peak_global_size = len(self._globals)
+        if grown < 0:
+            self._climb = None  # memory went down, so the next peak is blamed on what grows it from here
+
+    def report(self) -> str:
+        """
+        :return: the report, as text
+        """
+        lines = [f'peak memory: {self.peak / 1024:.1f} KiB']
+        if self.peak_location is not None:
+            function, line_num, line = self.peak_location
+            lines.append(f'  grown the most by {function} on line {line_num + 1}: {" ".join(line.split())}')
+        lines.append(f'  functions running at the peak: {len(self.peak_frames)}, '
+                     f'global namespace size: {self.peak_global_size}')
+        groups = []  # recursion shows up as one line per function instead of one per call
+        for frame in self.peak_frames:
+            if groups and groups[-1][0] == frame:
+                groups[-1][1] += 1
+            else:
+                groups.append([frame, 1])
+        for (name, size), count in groups[-TOP_LINES:]:
+            lines.append(f'    {name} ({size} names){f" x{count}" if count > 1 else ""}')
+
+        lines.append('')
+        lines.append(f'{"allocated (KiB)":>16}{"runs":>10}  line')
+        top = sorted(self.lines.items(), key=lambda item: item[1][1], reverse=True)[:TOP_LINES]
+        for (function, line_num, line), (runs, allocated) in top:
+            lines.append(f'{allocated / 1024:>16.1f}{runs:>10}  {function}:{line_num + 1}  {" ".join(line.split())}')
+
+        if self.functions:
+            lines.append('')
+            lines.append(f'{"allocated (KiB)":>16}{"calls":>10}  function')
+            top = sorted(self.functions.items(), key=lambda item: item[1][1], reverse=True)[:TOP_LINES]
+            for name, (calls, allocated) in top:
+                lines.append(f'{allocated / 1024:>16.1f}{calls:>10}  {name}')
+        return '\n'.join(lines)
+
+    def write(self, path: str = None) -> None:
+        """
+        This writes the report
+        :param path: the file to write it to, or None for stderr
+        """
+        if path is None:
+            print(self.report(), file=sys.stderr)
+            return
+        with open(path, 'w') as file:
+            file.write(self.report() + '\n')
@@ -0,0 +1,155 @@
+import os
+import threading
+
+from binp import interpreter
+from binp.context import Context, CURRENT_CONTEXT, current_context
+from binp.errors import BinPSyntaxError, BinPValueError, BinPArgumentError, BinPRuntimeError
+from binp.formatting import format_file
+from binp.functions import BinPFunction
+from binp.lexer import QUOTES
+
+PATH_VARIABLE = 'BINP_PATH'  # directories to search for modules, separated like PATH
+
+
+class Module:
+    """
+    This class is a compiled module: the functions declared at the top level of a file
+
+    :param path: the absolute path of the file
+    :param modified: when the file was last changed (so a cached module can tell it is out of date)
+    :param functions: the name of each function -> the function
+    """
+    def __init__(self, path: str, modified: int, functions: dict[str, BinPFunction]):
+        self.path = path
+        self.modified = modified
+        self.functions = functions
+
+
+# every module is compiled once per process and shared by every program (and thread) which imports it.
+# functions never change once they are made, so sharing them is safe
+_MODULES: dict[str, Module] = {}
+_LOCK = threading.RLock()  # held while compiling, so a module is never compiled twice at once
+_LOADING: list[str] = []  # the modules being compiled by the thread holding the lock, to find circular imports
+# (only read while holding the lock, another thread's modules are found through the search path of their context)
+
+
+def module_name(vals: list[str]) -> str:
+    """
+    This gets the file name of an import. It is usually in quotes (import "lib.binp"),
+    but it can also be written without them (import lib.binp)
+    :param vals: the tokens after 'import'
+    :return: the file name
+    """
+    if len(vals) == 1 and vals[0][:1] in QUOTES and vals[0][-1:] == vals[0][:1]:
+        return vals[0][1:-1]
+    return "".join(vals)
+
+
+def find_module(line_num: int, line: str, name: str, search_path: list[str]) -> str:
+    """
+    This finds the file of a module. A relative name is searched for in each directory of the search path
+    (a module is compiled with its own directory first in the search path, so the modules it imports
+    are found next to it), then each directory of BINP_PATH, then the current directory
+    :param line_num: the line number for error printing
+    :param line: the line for error printing
+    :param name: the file name from the import
+    :param search_path: the directories of the context's search path
+    :return: the absolute path of the module
+    """
+    if os.path.isabs(name):
+        directories = ['']
+    else:
+        directories = list(search_path)
+        directories += [directory for directory in os.environ.get(PATH_VARIABLE, '').split(os.pathsep) if directory]
+        directories.append(os.getcwd())
+
+    for directory in directories:
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            return os.path.abspath(path)
+    raise BinPValueError(line_num, line, message=f"Unable to find module '{name}'")
+
+
+def load_module(line_num: int, line: str, name: str, search_path: list[str]) -> Module:
+    """
+    This gets a module, compiling it only if it is not cached (or its file changed since it was)
+    :param line_num: the line number for error printing
+    :param line: the line for error printing
+    :param name: the file name from the import
+    :param search_path: the directories of the context's search path
+    :return: the module
+    """
+    path = find_module(line_num, line, name, search_path)
+    try:
+        modified = os.stat(path).st_mtime_ns
+    except OSError:
+        raise BinPValueError(line_num, line, message=f"Unable to read module '{name}'")
+
+    module = _MODULES.get(path)
+    if module is not None and module.modified == modified:
+        return module
+
+    with _LOCK:
+        if path in _LOADING:
+            raise BinPRuntimeError(line_num, line, message=f"Circular import of module '{name}'")
+        module = _MODULES.get(path)  # another thread might have compiled it while we waited
+        if module is None or module.modified != modified:
+            # the module is shared by every program, so it is compiled in a context of its own
+            # instead of the one of the program which happened to import it first
+            _LOADING.append(path)
+            token = CURRENT_CONTEXT.set(Context(search_path=[os.path.dirname(path), *search_path]))
+            try:
+                module = Module(path, modified, compile_module(line_num, line, path))
+            finally:
+                CURRENT_CONTEXT.reset(token)
+                _LOADING.pop()
+            _MODULES[path] = module
+    return module
+
+
+def compile_module(line_num: int, line: str, path: str) -> dict[str, BinPFunction]:
+    """
+    This creates every function declared at the top level of a file (and every function it imports).
+    Nothing else in the file runs
+    :param line_num: the line number of the import, for error printing
+    :param line: the line of the import, for error printing
+    :param path: the absolute path of the module
+    :return: the name of each function -> the function
+    """
+    try:
+        with open(path) as file:
+            lines = format_file(file)
+    except OSError:
+        raise BinPValueError(line_num, line, message=f"Unable to read module '{path}'")
+
+    namespace = {}
+    i = 0
+    try:
+        while i < len(lines):
+            match lines[i].split():
+                case ['var', _, 'func', *_] | ['import', *_]:
+                    namespace, i, _ = interpreter.parse_line(i, lines, namespace)
+                case _:
+                    _, i, _ = interpreter.parse_line(i, lines, namespace, execute=False)
+    except (BinPSyntaxError, BinPValueError, BinPArgumentError, BinPRuntimeError) as err:
+        raise BinPRuntimeError(line_num, line, message=f"Error in module '{path}'\n{err}")
+
+    return {name: value for name, value in namespace.items() if isinstance(value, BinPFunction)}
+
+
+def import_module(line_num: int, line: str, vals: list[str], namespace: dict) -> dict:
+    """
+    This handles an import statement, adding every function of the module to the namespace
+    :param line_num: the line number of the import
+    :param line: the line of the import
+    :param vals: the tokens after 'import'
+    :param namespace: the namespace importing the module
+    :return: the namespace with the functions added
+    """
+    if not vals:
+        raise BinPSyntaxError(line_num, line, message="Missing the module to import")
+    search_path = current_context().search_path
+    module = load_module(line_num, line, module_name(vals), search_path)
+    for name, function in module.functions.items():
+        namespace[name] = function
+    return namespace
@@ -0,0 +1,134 @@
+from binp.context import Context, CURRENT_CONTEXT
+from binp.errors import BinPSyntaxError
+from binp.evaluators import parse_value
+from binp.formatting import format_line
+from binp.interpreter import run_program
+
+BLOCKS = ('BEGIN', 'END')  # the blocks which run before the first record and after the last one
+
+
+class RecordProgram:
+    """
+    This class is a program split up for --each-line, where it runs once for every line of input (a record)
+
+    The BEGIN => ... end block runs once before the first record, the END => ... end block
+    runs once after the last record, and everything else (the body) runs for every record.
+    Each part keeps every line of the program, with the lines of the other parts blanked out,
+    so errors still have the line numbers of the file
+
+    :param program: the whole program, with only the lines opening and closing the blocks blanked out
+            (this is what the static checker checks)
+    :param begin: the lines of the BEGIN blocks
+    :param body: the lines which run for every record
+    :param end: the lines of the END blocks
+    """
+    def __init__(self, program: list[str], begin: list[str], body: list[str], end: list[str]):
+        self.program = program
+        self.begin = begin
+        self.body = body
+        self.end = end
+
+
+def block_end(lines: list[str], start: int) -> int:
+    """
+    This finds the 'end' which closes a block, skipping over the blocks inside of it
+    :param lines: the lines of the program
+    :param start: the line opening the block
+    :return: the line number of its end
+    """
+    depth = 0
+    for line_num in range(start, len(lines)):
+        words = lines[line_num].split()
+        if words[:1] == ['end']:
+            depth -= 1
+            if depth == 0:
+                return line_num
+        elif words[-2:] == ['=', '>'] and words[0] != 'else':
+            depth += 1
+    raise BinPSyntaxError(start, lines[start], message=f"Missing 'end' of {lines[start].split()[0]} block")
+
+
+def split_blocks(lines: list[str]) -> RecordProgram:
+    """
+    This splits a program into its BEGIN blocks, its END blocks and its body
+    :param lines: the formatted lines of the program
+    :return: the split program
+    """
+    blank = format_line('')
+    program = list(lines)
+    begin = [blank] * len(lines)
+    body = list(lines)
+    end = [blank] * len(lines)
+
+    line_num = 0
+    while line_num < len(lines):
+        words = lines[line_num].split()
+        if len(words) == 3 and words[0] in BLOCKS and words[1:] == ['=', '>']:
+            close = block_end(lines, line_num)
+            block = begin if words[0] == 'BEGIN' else end
+            block[line_num+1:close] = lines[line_num+1:close]
+            body[line_num:close+1] = [blank] * (close + 1 - line_num)
+            program[line_num] = program[close] = blank
+            line_num = close
+        line_num += 1
+
+    return RecordProgram(program, begin, body, end)
+
+
+def get_fields(record: str, separator: str = None) -> dict:
+    """
+    This splits a record into the variables F_0 to F_n, the same way command line arguments are
+    stored in ARG_0 to ARG_n: fields which are exactly an int or a bool are stored as those types
+    :param record: the line of input
+    :param separator: the text between two fields, or None to split on any whitespace
+    :return: F_COUNT and every field
+    """
+    fields = record.split(separator)
+    retval = {
+        'F_COUNT': len(fields)
+    }
+    for i, field in enumerate(fields):
+        value = parse_value(field)
+        retval[f'F_{i}'] = value if str(value) == field else field
+    return retval
+
+
+def run_records(program: RecordProgram, global_namespace: dict, context: Context,
+                fields=False, separator: str = None) -> None:
+    """
+    This runs the BEGIN blocks, then the body once for every line of input, then the END blocks
+
+    The body of each record runs in a new copy of the global namespace with the record in LINE
+    (and its number, from 1, in LINE_NUM), so nothing it declares is left over for the next record.
+    Only the variables declared in BEGIN (the accumulators) keep their value from one record to the next.
+    A return in the body skips the rest of the record
+    :param program: the split program
+    :param global_namespace: the namespace the program runs in
+    :param context: the context to run the program in
+    :param fields: if this is true, each record is also split into fields (see get_fields)
+    :param separator: the text between two fields, or None to split on any whitespace
+    """
+    token = CURRENT_CONTEXT.set(context)
+    try:
+        before = set(global_namespace)
+        run_program(program.begin, global_namespace)
+        accumulators = [name for name in global_namespace if name not in before]
+
+        record_num = 0
+        while True:
+            record = context.stdin.read_line()
+            if record is None:
+                break
+            record_num += 1
+            namespace = dict(global_namespace)
+            namespace['LINE'] = record
+            namespace['LINE_NUM'] = record_num
+            if fields:
+                namespace.update(get_fields(record, separator))
+            run_program(program.body, namespace)
+            for name in accumulators:
+                global_namespace[name] = namespace[name]
+
+        run_program(program.end, global_namespace)
+    finally:
+        CURRENT_CONTEXT.reset(token)
@@ -0,0 +1,114 @@
+import os
+
+from binp.context import Context, CURRENT_CONTEXT, current_context
+from binp.errors import BinPSyntaxError, BinPValueError, BinPArgumentError, BinPSessionError
+from binp.formatting import format_line, INTERACTIVE_PRINT
+from binp.interpreter import parse_line
+from binp.sessions import save_session, load_session
+
+
+def run_interactive(local_namespace: dict, session_file=None, context: Context = None) -> (str, None | list[str]):
+    """
+    We call this function when we want to run the interactive version of binary plus
+    It takes singles lines from the user at a time and parses it.
+    This allows the user to essentially type a program one line at a time and have it run as they type
+
+    Lines starting with ':' are commands for the prompt itself:
+        :save file  saves the variables, functions and lines of this session
+        :load file  replaces this session with one that was saved
+    :param local_namespace: the namespace which holds all the variable definitions
+    :param session_file: if this is given, the session is loaded from this file (when it exists)
+            and saved back to it when the prompt exits
+    :param context: the context for everything typed into the prompt
+    :return: returns
+    """
+    context = context if context is not None else Context()
+    token = CURRENT_CONTEXT.set(context)
+    try:
+        return interactive_loop(local_namespace, session_file, context)
+    finally:
+        CURRENT_CONTEXT.reset(token)
+
+
+def interactive_loop(local_namespace: dict, session_file, context: Context) -> (str, None | list[str]):
+    """
+    This is the prompt itself, run in the context run_interactive made current (see run_interactive).
+    Errors and the banner go through the context, and leaving the prompt stops it with context.exit
+    :param local_namespace: the namespace which holds all the variable definitions
+    :param session_file: the file the session is loaded from and saved to, or None
+    :param context: the context for everything typed into the prompt
+    :return: the line and value of a return typed into the prompt
+    """
+    lines = []
+    line_num = 0
+    previous_line_num = -1
+    if session_file is not None and os.path.exists(session_file):
+        try:
+            lines, local_namespace = load_session(session_file)
+            line_num = len(lines)
+        except BinPSessionError as err:
+            context.error(err)
+            context.exit(1)
+
+    context.write("Press Ctrl-C to exit the interactive prompt")
+    while True:
+
+        # get input (if we want to in this situation)
+        new_line = None
+        inputting = False
+        try:
+            if line_num != previous_line_num:
+                raw_line = context.prompt(INTERACTIVE_PRINT)
+                if raw_line.strip().startswith(':'):
+                    lines, local_namespace = run_command(raw_line.split(), lines, local_namespace)
+                    line_num = len(lines)
+                    previous_line_num = -1  # a loaded session can end on the line the last one was on
+                    continue
+
+                new_line = format_line(raw_line)
+                lines.append(new_line)
+                inputting = True
+                line_num = len(lines) - 1
+        except (KeyboardInterrupt, EOFError):
+            if session_file is not None:
+                try:
+                    save_session(session_file, lines, local_namespace)
+                except BinPSessionError as err:
+                    context.error(err)
+            context.exit(3)
+
+        try:
+            previous_line_num = line_num
+            local_namespace, line_num, retval = parse_line(line_num, lines, local_namespace, interactive=True,
+                                                           skip_input=not inputting)
+
+            if retval is not None:  # we got a return value from this function, so we need to pass on the return
+                return lines[line_num], retval
+        except (BinPSyntaxError, BinPValueError, BinPArgumentError) as err:
+            context.error(err)
+            line_num += 1
+
+
+def run_command(command: list[str], lines: list[str], local_namespace: dict) -> (list[str], dict):
+    """
+    This runs a command typed into the interactive prompt (a line starting with ':')
+    :param command: the command split by whitespace
+    :param lines: the lines of the current session
+    :param local_namespace: the namespace of the current session
+    :return: the lines and namespace of the session after the command
+    """
+    match command:
+        case [':save', filename]:
+            try:
+                save_session(filename, lines, local_namespace)
+            except BinPSessionError as err:
+                current_context().error(err)
+        case [':load', filename]:
+            try:
+                lines, local_namespace = load_session(filename)
+            except BinPSessionError as err:
+                current_context().error(err)
+        case _:
+            current_context().error("Unknown command. Valid commands are ':save <file>' and ':load <file>'")
+
+    return lines, local_namespace
@@ -0,0 +1,229 @@
+import sys
+from itertools import chain
+
+from binp import builtins
+from binp.context import Context, CURRENT_CONTEXT, current_context
+from binp.errors import BinPSyntaxError, BinPValueError, BinPArgumentError, BinPRuntimeError, BinPExit
+from binp.evaluators import determine_evaluator, interpolate, replace_variables, single_value, NO_VALUE, TYPE_TAGS
+from binp.formatting import format_line
+from binp.functions import BinPFunction, Frame, UNSET, parse_function_call
+from binp.inputs import stdin_reader
+from binp.interpreter import get_cli_args, get_unaries
+from binp.strings import Rope
+
+# the python function of each builtin, which compiled programs call directly
+BUILTINS = {name: function._body for name, function in builtins.BUILTINS.items()}
+IMPROPER_TYPE = 'Improper Type, most likely due to null type or improper variable assignment'
+
+
+class CompiledFunction(BinPFunction):
+    """
+    This class is a function of a program compiled by --emit-python (see transpiler.py)
+
+    The compiled program calls the python function directly, but the function is still in the namespace
+    like any other, so the parts of the program which are still evaluated by the interpreter can call it too
+
+    :param body: the compiled function, which is passed the namespace of the call and then the value of each argument
+    """
+    def __init__(self, name: str, return_type: str, params: list[(str, str)], body):
+        super().__init__(name, return_type, params, [])
+        self._body = body
+
+    def run_lines(self, line_num: int, line: str, function_namespace: Frame):
+        """
+        This runs the compiled function with the arguments bound in its frame
+        :param line_num: line number for errors
+        :param line: line for errors
+        :param function_namespace: the frame with the arguments bound
+        :return: the value the function returns
+        """
+        return self._body(function_namespace, *(function_namespace[name] for _, name in self._params))
+
+
+def source_lines(source: list[str]) -> list:
+    """
+    :param source: the lines of the program, as they were written
+    :return: the lexed lines, which errors print and the interpreter evaluates
+    """
+    return [format_line(line, line_num) for line_num, line in enumerate(source)]
+
+
+def frame(scope, names: tuple, values: tuple) -> Frame:
+    """
+    This makes the namespace the interpreter sees from inside a compiled function
+    :param scope: the namespace the compiled function was called with
+    :param names: the local variables of the compiled function
+    :param values: the value of each one (UNSET when it has not been assigned yet)
+    :return: a frame with the variables which have been assigned, on top of scope
+    """
+    namespace = Frame({name: i for i, name in enumerate(names)}, scope)
+    for name, value in zip(names, values):
+        if value is not UNSET:
+            namespace[name] = value
+    return namespace
+
+
+def text(value, name: str) -> str:
+    """
+    :param value: the value of a variable in a line of output, or UNSET if there is no variable with that name
+    :param name: the name of the variable
+    :return: the text the variable is replaced with (a name which is not a variable is output as it is)
+    """
+    return name if value is UNSET else str(value)
+
+
+def output(text: str) -> None:
+    """
+    This writes a line of output
+    :param text: the text of the output statement, with its variables substituted
+    """
+    current_context().output(f'{text} ')
+
+
+def call(function, scope, *args):
+    """
+    This calls a compiled function which can open files, closing the files it opened unless they are still used,
+    the same way BinPFunction.run does
+    :param function: the compiled function
+    :param scope: the namespace of the call
+    :param args: the value of each argument
+    :return: the value the function returns
+    """
+    files = current_context().files
+    first_handle = files.next_handle
+    value = function(scope, *args)
+    if files.next_handle != first_handle:
+        files.close_since(first_handle, keep=chain([value], args, scope.values()))
+    return value
+
+
+def evaluate(lines: list, line_num: int, var_type: str, start: int, stop: int | None, namespace):
+    """
+    This evaluates an expression which could not be compiled with the interpreter,
+    the same way an assignment to a variable of its type would
+    :param lines: the lines of the program
+    :param line_num: the line of the expression
+    :param var_type: the type of the expression
+    :param start: the position of the first token of the expression in the line
+    :param stop: the position after its last token, or None for the end of the line
+    :param namespace: the namespace the expression is evaluated in
+    :return: the value
+    """
+    line = lines[line_num]
+    vals = line.split()[start:stop]
+    value = single_value(vals, namespace, var_type)
+    if value is NO_VALUE:
+        evaluator = determine_evaluator(var_type)
+        if evaluator is None:
+            raise BinPValueError(line_num, line, message=IMPROPER_TYPE)
+        value = evaluator(line_num, line, vals, namespace)
+    return str(value) if type(value) is Rope else value
+
+
+def read_input(lines: list, line_num: int, var_type: str, namespace):
+    """
+    This reads a line of input for 'var [type] [name] = input', the same way var_assign does
+    :param lines: the lines of the program
+    :param line_num: the line of the input statement
+    :param var_type: the type of the variable
+    :param namespace: the namespace input which is not a value of the type is evaluated in
+    :return: the value
+    """
+    line = lines[line_num]
+    value = current_context().stdin.read_value(line_num, line, var_type)
+    if type(value) is not TYPE_TAGS.get(var_type) or var_type == 'str':
+        typed = format_line(value)
+        if var_type == 'str':
+            value = interpolate(typed, 0, namespace)
+        else:
+            evaluator = determine_evaluator(var_type)
+            if evaluator is None:
+                raise BinPValueError(line_num, line, message=IMPROPER_TYPE)
+            value = evaluator(line_num, line[:-5] + typed, typed.split(), namespace)
+    return str(value) if type(value) is Rope else value
+
+
+def call_statement(lines: list, line_num: int, namespace) -> None:
+    """
+    This runs a line which is a function call, which could not be compiled
+    :param lines: the lines of the program
+    :param line_num: the line of the call
+    :param namespace: the namespace the call is run in
+    """
+    line = lines[line_num]
+    parse_function_call(line_num, line, replace_variables(line.split(), namespace), namespace)
+
+
+def loop_range(lines: list, line_num: int, start: int, stop: int, step: int) -> range:
+    """
+    :return: the values of the variable of a for loop whose step is not known until it runs
+    """
+    if step == 0:
+        raise BinPValueError(line_num, lines[line_num], message="The step of a for loop can not be 0")
+    return range(start, stop, step)
+
+
+def run(program, lines: list, line_map: dict[int, int], args: list[str]) -> None:
+    """
+    This runs a compiled program the same way the command line runs a program
+    **This exits the program via sys.exit()**
+
+    Errors which are not a binp error (like dividing by zero) are turned into the error the interpreter
+    would have printed, on the line of the program the innermost compiled line came from
+    :param program: the compiled main program, which is passed the global namespace
+    :param lines: the lines of the program
+    :param line_map: each line of the compiled module -> the line of the program it came from
+    :param args: the command line arguments of the program
+    """
+    context = Context(stdin=stdin_reader())
+    token = CURRENT_CONTEXT.set(context)
+    code = 0
+    try:
+        program(builtins.get_builtins(get_unaries(get_cli_args(args))))
+    except BinPExit as stopped:
+        code = stopped.code
+    except KeyboardInterrupt:
+        code = 3
+    except (BinPSyntaxError, BinPValueError, BinPArgumentError, BinPRuntimeError) as err:
+        context.error(err)
+        code = 3
+    except Exception as err:
+        line_num = program_line(err, program.__code__.co_filename, line_map)
+        context.error(translate_error(err, line_num, lines[line_num]))
+        code = 3
+    finally:
+        context.files.close_all()
+        CURRENT_CONTEXT.reset(token)
+    sys.exit(code)
+
+
+def program_line(err: Exception, filename: str, line_map: dict[int, int]) -> int:
+    """
+    :param err: an error raised while running a compiled program
+    :param filename: the file of the compiled module
+    :param line_map: each line of the compiled module -> the line of the program it came from
+    :return: the line of the program the innermost compiled line which raised the error came from
+    """
+    line_num = 0
+    trace = err.__traceback__
+    while trace is not None:
+        if trace.tb_frame.f_code.co_filename == filename and trace.tb_lineno in line_map:
+            line_num = line_map[trace.tb_lineno]
+        trace = trace.tb_next
+    return line_num
+
+
+def translate_error(err: Exception, line_num: int, line: str) -> Exception:
+    """
+    :param err: an error which is not a binp error
+    :param line_num: the line of the program it was raised on
+    :param line: that line
+    :return: the binp error run_program prints for it
+    """
+    if isinstance(err, ZeroDivisionError):  # the only error arithmetic can raise, which int_eval reports like this
+        return BinPRuntimeError(line_num, line, message=str(err))
+    if isinstance(err, RecursionError):
+        return BinPRuntimeError(line_num, line, message='Function calls went too deep')
+    if isinstance(err, (TypeError, AttributeError)):
+        return BinPValueError(line_num, line, message=IMPROPER_TYPE)
+    return BinPSyntaxError(line_num, line, message='Oops, we appear to have an uncaught error. Sorry!')
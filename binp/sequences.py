@@ -0,0 +1,255 @@
+import os
+from itertools import accumulate
+
+from binp.errors import BinPRuntimeError, BinPValueError
+from binp.expressions import BINARY_OPERATOR_MAP, BOOL_OPERATORS, RELATIONAL_OPERATORS, Operator
+
+NUMPY_THRESHOLD = 256  # shorter sequences are faster as python lists than as numpy arrays
+INT64_LIMIT = 2 ** 63 - 1  # numpy is only used when every value (and result) fits in an int64
+NUMPY_VARIABLE = 'BINP_NUMPY'  # set to 0 to never use numpy
+
+_numpy = None  # the numpy module, False when it can not be imported, None until it is first needed
+
+
+def get_numpy():
+    """
+    This imports numpy the first time a sequence is big enough to use it.
+    numpy is optional (and slow to import), so it is never imported when the interpreter starts
+    :return: the numpy module, or None if it is not installed (or turned off with BINP_NUMPY=0)
+    """
+    global _numpy
+    if _numpy is None:
+        _numpy = False
+        if os.environ.get(NUMPY_VARIABLE) != '0':
+            try:
+                import numpy
+                _numpy = numpy
+            except ImportError:
+                pass
+    return _numpy or None
+
+
+# the numpy function for each operator. numpy's floor_divide and remainder round the same way as // and %
+NUMPY_FUNCTIONS = {
+    Operator.ADD: 'add',
+    Operator.SUB: 'subtract',
+    Operator.MUL: 'multiply',
+    Operator.DIV: 'floor_divide',
+    Operator.MODULUS: 'remainder',
+    Operator.GREATER_THAN: 'greater',
+    Operator.LESS_THAN: 'less',
+    Operator.GREATER_EQUAL: 'greater_equal',
+    Operator.LESS_EQUAL: 'less_equal',
+    Operator.EQUAL: 'equal',
+    Operator.NOT_EQUAL: 'not_equal',
+}
+
+
+class BinPSeq:
+    """
+    This class is a sequence of ints, the value of a 'seq' variable
+
+    Large sequences are stored as numpy int64 arrays (when numpy is installed), and everything else
+    as a list of python ints. Both give exactly the same results: numpy is only used for an operation when
+    no value can overflow an int64, otherwise the operation is done with python ints like any other expression.
+    A sequence never changes once it is made, so it can be shared by every variable it is assigned to
+
+    :param values: a list of ints, or a numpy array
+    """
+    __slots__ = ('_values', '_bound')
+
+    def __init__(self, values):
+        self._values = values
+        self._bound = None  # the largest absolute value, found when it is first needed
+
+    @classmethod
+    def from_list(cls, values: list[int]) -> 'BinPSeq':
+        """
+        This makes a sequence, as a numpy array when it is big enough and numpy is installed
+        :param values: the ints of the sequence
+        :return: the sequence
+        """
+        seq = cls(values)
+        numpy = get_numpy() if len(values) >= NUMPY_THRESHOLD else None
+        if numpy is not None and seq.bound() <= INT64_LIMIT:
+            seq._values = numpy.array(values, dtype=numpy.int64)
+        return seq
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, value: int) -> bool:
+        return value in self._values
+
+    def __str__(self):
+        return f'[{", ".join(map(str, self.to_list()))}]'
+
+    def is_array(self) -> bool:
+        """
+        :return: true if the values are a numpy array
+        """
+        return type(self._values) is not list
+
+    def to_list(self) -> list[int]:
+        """
+        :return: the values as a list of python ints
+        """
+        if self.is_array():
+            return self._values.tolist()
+        return self._values
+
+    def to_array(self, numpy):
+        """
+        :param numpy: the numpy module
+        :return: the values as a numpy array
+        """
+        if self.is_array():
+            return self._values
+        return numpy.array(self._values, dtype=numpy.int64)
+
+    def bound(self) -> int:
+        """
+        :return: the largest absolute value of the sequence (0 when it is empty)
+        """
+        if self._bound is None:
+            if not len(self._values):
+                self._bound = 0
+            elif self.is_array():
+                self._bound = max(int(self._values.max()), -int(self._values.min()))
+            else:
+                self._bound = max(max(self._values), -min(self._values))
+        return self._bound
+
+    def get(self, line_num: int, line: str, index: int) -> int:
+        """
+        :param line_num: the line number for error printing
+        :param line: the line for error printing
+        :param index: the position of the value, from 0
+        :return: the value at that position
+        """
+        if not 0 <= index < len(self._values):
+            raise BinPValueError(line_num, line, message=f"Index {index} is outside of a seq of length {len(self)}")
+        return int(self._values[index])
+
+
+def use_numpy(length: int, bound: int):
+    """
+    :param length: the length of the sequences an operation is on
+    :param bound: the largest absolute value any part of the operation can have
+    :return: the numpy module if the operation should use it, otherwise None
+    """
+    if length < NUMPY_THRESHOLD or bound > INT64_LIMIT:
+        return None
+    return get_numpy()
+
+
+def seq_range(line_num: int, line: str, start: int, stop: int, step: int) -> BinPSeq:
+    """
+    :param line_num: the line number for error printing
+    :param line: the line for error printing
+    :param start: the first value
+    :param stop: the value to stop before
+    :param step: the difference between two values next to each other
+    :return: the sequence start, start + step, ... up to (but not including) stop
+    """
+    if step == 0:
+        raise BinPValueError(line_num, line, message="The step of a range can not be 0")
+    values = range(start, stop, step)
+    numpy = use_numpy(len(values), max(abs(start), abs(stop)))
+    if numpy is not None:
+        return BinPSeq(numpy.arange(start, stop, step, dtype=numpy.int64))
+    return BinPSeq(list(values))
+
+
+def elementwise(line_num: int, line: str, op: Operator, left: BinPSeq, right: BinPSeq | int) -> BinPSeq:
+    """
+    This applies an operator to every value of a sequence, with the value at the same position
+    of another sequence or with a single int. The results are the same as the operator in an expression
+    :param line_num: the line number for error printing
+    :param line: the line for error printing
+    :param op: the operator (from BINARY_OPERATOR_MAP)
+    :param left: the sequence on the left of the operator
+    :param right: the sequence or int on the right of the operator
+    :return: the sequence of results (1 and 0 for comparisons)
+    """
+    scalar = type(right) is int
+    if not scalar and len(left) != len(right):
+        raise BinPValueError(line_num, line, message=f"The seqs have different lengths ({len(left)} and {len(right)})")
+    right_bound = abs(right) if scalar else right.bound()
+    if op in {Operator.DIV, Operator.MODULUS} and (right == 0 if scalar else 0 in right):
+        raise BinPRuntimeError(line_num, line, message="integer division or modulo by zero")
+
+    match op:
+        case Operator.ADD | Operator.SUB:
+            bound = left.bound() + right_bound
+        case Operator.MUL:  # (the operands themselves have to fit too, even when one of them is all 0)
+            bound = max(left.bound() * right_bound, left.bound(), right_bound)
+        case _:  # a quotient, a remainder or a comparison is never larger than what it is made from
+            bound = max(left.bound(), right_bound)
+
+    numpy = use_numpy(len(left), bound)
+    if numpy is not None:
+        result = getattr(numpy, NUMPY_FUNCTIONS[op])(left.to_array(numpy), right if scalar else right.to_array(numpy))
+        return BinPSeq(result.astype(numpy.int64) if result.dtype == bool else result)
+
+    function = BINARY_OPERATOR_MAP[op]
+    if scalar:
+        values = [function(value, right) for value in left.to_list()]
+    else:
+        values = list(map(function, left.to_list(), right.to_list()))
+    if op not in {Operator.ADD, Operator.SUB, Operator.MUL, Operator.DIV, Operator.MODULUS}:
+        values = [int(value) for value in values]  # comparisons give 1 or 0
+    return BinPSeq(values)
+
+
+def mask(line_num: int, line: str, seq: BinPSeq, op: str, value: int) -> BinPSeq:
+    """
+    :param line_num: the line number for error printing
+    :param line: the line for error printing
+    :param seq: the sequence to compare
+    :param op: the comparison (==, !=, <, <=, > or >=)
+    :param value: the int to compare every value with
+    :return: a sequence with 1 where the comparison is true and 0 where it is false
+    """
+    op = op.replace(' ', '')
+    if op not in RELATIONAL_OPERATORS:
+        raise BinPValueError(line_num, line, message=f"Unknown comparison '{op}'")
+    return elementwise(line_num, line, BOOL_OPERATORS[op], seq, value)
+
+
+def total(seq: BinPSeq) -> int:
+    """
+    :param seq: the sequence
+    :return: the sum of every value
+    """
+    numpy = use_numpy(len(seq), len(seq) * seq.bound())
+    if numpy is not None:
+        return int(seq.to_array(numpy).sum())
+    return sum(seq.to_list())
+
+
+def prefix_sums(seq: BinPSeq) -> BinPSeq:
+    """
+    :param seq: the sequence
+    :return: a sequence where each value is the sum of every value up to that position
+    """
+    numpy = use_numpy(len(seq), len(seq) * seq.bound())
+    if numpy is not None:
+        return BinPSeq(numpy.cumsum(seq.to_array(numpy)))
+    return BinPSeq(list(accumulate(seq.to_list())))
+
+
+def extreme(line_num: int, line: str, seq: BinPSeq, largest: bool) -> int:
+    """
+    :param line_num: the line number for error printing
+    :param line: the line for error printing
+    :param seq: the sequence
+    :param largest: true for the largest value, false for the smallest
+    :return: the largest or smallest value
+    """
+    if not len(seq):
+        raise BinPValueError(line_num, line, message=f"The {'max' if largest else 'min'} of an empty seq")
+    if seq.is_array():
+        array = seq.to_array(get_numpy())
+        return int(array.max() if largest else array.min())
+    return max(seq.to_list()) if largest else min(seq.to_list())
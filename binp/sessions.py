@@ -0,0 +1,158 @@
+import json
+
+from binp.builtins import BinPBuiltin, BUILTINS
+from binp.errors import BinPSessionError
+from binp.formatting import format_line
+from binp.functions import BinPFunction
+from binp.handles import BinPHandle
+from binp.lexer import SourceLine
+from binp.maps import BinPMap
+from binp.sequences import BinPSeq
+from binp.strings import Rope
+
+SESSION_FORMAT = 'binp-session'
+SESSION_VERSION = 1
+
+
+def save_session(filename: str, lines: list[str], global_namespace: dict) -> None:
+    """
+    This writes the global namespace of an interactive session (variables and functions)
+    along with the lines typed so far into a small versioned json file
+    :param filename: the file to write the session to
+    :param lines: the lines of the interactive session
+    :param global_namespace: the namespace with every variable and function
+    """
+    namespace = {}
+    for name, value in global_namespace.items():
+        namespace[name] = encode_value(filename, name, value)
+
+    session = {
+        'format': SESSION_FORMAT,
+        'version': SESSION_VERSION,
+        'lines': encode_lines(lines),
+        'namespace': namespace,
+    }
+    try:
+        with open(filename, 'w') as file:
+            json.dump(session, file, separators=(',', ':'))
+    except OSError as err:
+        raise BinPSessionError(filename, message=f"Unable to write session ({err.strerror})")
+
+
+def load_session(filename: str) -> (list[str], dict):
+    """
+    This reads a session written by save_session
+    :param filename: the file to read the session from
+    :return: the lines of the session and the global namespace
+    """
+    try:
+        with open(filename) as file:
+            session = json.load(file)
+    except OSError as err:
+        raise BinPSessionError(filename, message=f"Unable to read session ({err.strerror})")
+    except json.JSONDecodeError:
+        raise BinPSessionError(filename, message="File is not a session")
+
+    if not isinstance(session, dict) or session.get('format') != SESSION_FORMAT:
+        raise BinPSessionError(filename, message="File is not a session")
+    if session.get('version') != SESSION_VERSION:
+        raise BinPSessionError(filename, message=f"Unsupported session version {session.get('version')}")
+
+    if not isinstance(session.get('namespace'), dict) or not is_lines(session.get('lines')):
+        raise BinPSessionError(filename, message="File is not a session")
+
+    global_namespace = {}
+    for name, value in session['namespace'].items():
+        global_namespace[name] = decode_value(filename, name, value)
+    return decode_lines(session['lines']), global_namespace
+
+
+def is_lines(lines) -> bool:
+    """
+    :param lines: something read from a session file
+    :return: true if it is a list of lines, as stored by encode_lines
+    """
+    return type(lines) is list and all(type(line) is str for line in lines)
+
+
+def encode_lines(lines: list[str]) -> list[str]:
+    """
+    :param lines: lexed lines
+    :return: each line as it was written, so it can be lexed again when it is loaded
+    """
+    return [line.raw if isinstance(line, SourceLine) else line for line in lines]
+
+
+def decode_lines(lines: list[str]) -> list[SourceLine]:
+    """
+    :param lines: lines stored by encode_lines
+    :return: the lexed lines
+    """
+    return [format_line(line, line_num) for line_num, line in enumerate(lines)]
+
+
+def encode_value(filename: str, name: str, value) -> dict:
+    """
+    This converts a single value from the namespace into something json can store
+    :param filename: the session file for error printing
+    :param name: the name of the variable for error printing
+    :param value: the value to convert
+    :return: a dictionary with the type and value
+    """
+    if isinstance(value, BinPBuiltin):
+        return {'type': 'builtin', 'name': value._name}
+    if isinstance(value, BinPFunction):
+        return {
+            'type': 'func',
+            'name': value._name,
+            'return_type': value._return_type,
+            'params': value._params,
+            'lines': encode_lines(value._lines),
+        }
+    if type(value) is Rope:
+        value = str(value)
+    if type(value) is BinPSeq:
+        return {'type': 'seq', 'value': value.to_list()}
+    if type(value) is BinPMap:  # the keys are kept as pairs, since json objects only have str keys
+        return {'type': 'map', 'value': [[key, encode_value(filename, name, item)] for key, item in value.items()]}
+    if type(value) is BinPHandle:
+        return {'type': 'file', 'value': value.number}
+    for type_name, type_tag in (('bool', bool), ('int', int), ('str', str)):
+        if type(value) is type_tag:
+            return {'type': type_name, 'value': value}
+
+    raise BinPSessionError(filename, message=f"Unable to save '{name}' of type '{type(value).__name__}'")
+
+
+def decode_value(filename: str, name: str, value: dict, handles: dict[int, BinPHandle] = None):
+    """
+    This converts a value stored by encode_value back into a namespace value
+    :param filename: the session file for error printing
+    :param name: the name of the variable for error printing
+    :param value: the stored value
+    :param handles: the files a checkpoint reopened, by the number of their handle.
+            a session does not save its files, so its handles are loaded closed
+    :return: the namespace value
+    """
+    match value:
+        case {'type': 'func', 'name': str() as func_name, 'return_type': str() as return_type,
+              'params': list() as params, 'lines': lines} if is_lines(lines) and all(
+                type(param) is list and len(param) == 2 and is_lines(param) for param in params):
+            return BinPFunction(func_name, return_type, [tuple(param) for param in params], decode_lines(lines))
+        case {'type': 'builtin', 'name': str() as builtin_name} if builtin_name in BUILTINS:
+            return BUILTINS[builtin_name]
+        case {'type': 'int', 'value': int() as val} if type(val) is int:
+            return val
+        case {'type': 'bool', 'value': bool() as val}:
+            return val
+        case {'type': 'str', 'value': str() as val}:
+            return val
+        case {'type': 'seq', 'value': list() as val} if all(type(item) is int for item in val):
+            return BinPSeq.from_list(val)
+        case {'type': 'map', 'value': list() as val} if all(type(pair) is list and len(pair) == 2 and
+                                                             type(pair[0]) in (int, str) for pair in val):
+            return BinPMap({key: decode_value(filename, name, item, handles) for key, item in val})
+        case {'type': 'file', 'value': int() as val} if type(val) is int:
+            return (handles or {}).get(val) or BinPHandle(val)  # a new handle is never the handle of an open file
+
+    raise BinPSessionError(filename, message=f"Invalid value for '{name}'")
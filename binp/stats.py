@@ -0,0 +1,141 @@
+import json
+import sys
+import time
+
+
+class Stats:
+    """
+    This class counts what a program does while it runs, for the --stats report
+
+    A context only has one when --stats is given. Everything which counts checks for it first
+    (context.stats is not None), so a program run without --stats does no extra work besides that check
+
+    Time is split into parsing (formatting and checking the source), I/O (output, input, and the file builtins)
+    and evaluation, which is everything else the program spent running
+    """
+    def __init__(self):
+        self.statements = {}  # kind of statement -> how many times one ran
+        self.calls = 0
+        self.builtin_calls = 0
+        self.max_call_depth = 0
+        self.frames = 0  # namespaces made for function calls
+        self.frame_slots = 0
+        self.max_frame_slots = 0
+        self.copies = 0  # times a whole namespace was copied into a dictionary
+        self.copied_names = 0
+        self.expression_trees = 0
+        self.cache_hits = 0  # expressions evaluated by their inline cache, without building a tree
+        self.cache_misses = 0
+        self.peak_namespace_size = 0
+        self.output_bytes = 0
+        self.output_lines = 0
+
+        self.parse_time = 0.0
+        self.io_time = 0.0
+        self._run_start = None
+        self.run_time = 0.0
+
+    def statement(self, line: str) -> None:
+        """
+        This counts a statement which is about to run
+        :param line: the formatted line of the statement
+        """
+        words = line.split()
+        match words:
+            case []:
+                kind = 'blank'
+            case ['$', *_]:
+                kind = 'comment'
+            case ['var', _, 'func', *_]:
+                kind = 'function declaration'
+            case ['var', *_, 'input']:
+                kind = 'input'
+            case ['var', *_]:
+                kind = 'assignment'
+            case ['output' | 'if' | 'else' | 'while' | 'for' | 'return' | 'end' | 'import' as kind, *_]:
+                pass
+            case _:
+                kind = 'call'
+        self.statements[kind] = self.statements.get(kind, 0) + 1
+
+    def call(self, depth: int, slots: int) -> None:
+        """
+        This counts a call of a function written in binp
+        :param depth: how deep the call is (1 for a call from the main program)
+        :param slots: the size of the namespace made for the call
+        """
+        self.calls += 1
+        self.frames += 1
+        self.frame_slots += slots
+        if slots > self.max_frame_slots:
+            self.max_frame_slots = slots
+        if depth > self.max_call_depth:
+            self.max_call_depth = depth
+
+    def copy(self, size: int) -> None:
+        """
+        This counts a namespace which was copied
+        :param size: how many names were copied
+        """
+        self.copies += 1
+        self.copied_names += size
+
+    def namespace(self, size: int) -> None:
+        """
+        :param size: the number of names in a namespace which was just assigned to
+        """
+        if size > self.peak_namespace_size:
+            self.peak_namespace_size = size
+
+    def output(self, text: str) -> None:
+        """
+        :param text: a line which was written as output (including the newline)
+        """
+        self.output_lines += 1
+        self.output_bytes += len(text.encode())
+
+    def start(self) -> None:
+        """
+        This starts the clock for the time spent running the program
+        """
+        self._run_start = time.perf_counter()
+
+    def stop(self) -> None:
+        """
+        This stops the clock for the time spent running the program
+        """
+        if self._run_start is not None:
+            self.run_time += time.perf_counter() - self._run_start
+            self._run_start = None
+
+    def report(self) -> dict:
+        """
+        :return: every counter, as a dictionary which can be written as JSON
+        """
+        return {
+            'statements': {'total': sum(self.statements.values()), **self.statements},
+            'calls': {'functions': self.calls, 'builtins': self.builtin_calls, 'max_depth': self.max_call_depth},
+            'frames': {'count': self.frames, 'total_slots': self.frame_slots, 'max_slots': self.max_frame_slots},
+            'namespace_copies': {'count': self.copies, 'total_names': self.copied_names},
+            'peak_namespace_size': self.peak_namespace_size,
+            'expression_trees': self.expression_trees,
+            'inline_caches': {'hits': self.cache_hits, 'misses': self.cache_misses},
+            'output': {'lines': self.output_lines, 'bytes': self.output_bytes},
+            'time': {
+                'parse': round(self.parse_time, 6),
+                'evaluate': round(max(self.run_time - self.io_time, 0.0), 6),
+                'io': round(self.io_time, 6),
+            },
+        }
+
+    def write(self, path: str = None) -> None:
+        """
+        This writes the report as JSON
+        :param path: the file to write it to, or None for stderr
+        """
+        text = json.dumps(self.report(), indent=2)
+        if path is None:
+            print(text, file=sys.stderr)
+            return
+        with open(path, 'w') as file:
+            file.write(text + '\n')
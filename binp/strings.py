@@ -0,0 +1,53 @@
+class Rope:
+    """
+    This class is a string value which is built up one piece at a time, like 'var str s = s x' in a loop.
+    Appending only adds the new piece instead of copying the whole string, and the pieces are only
+    joined into a real string when it is needed (outputting it, or using it in an expression)
+
+    A rope never changes once it is made. Appending to the newest rope of a list of pieces
+    adds to that same list, so a loop of appends shares a single list. Appending to an older rope
+    copies the pieces it has first, so the newer ropes are left alone
+
+    :param pieces: the list of pieces, which may be shared with other ropes
+    :param count: how many of the pieces belong to this rope
+    """
+    __slots__ = ('_pieces', '_count', '_text')
+
+    def __init__(self, pieces: list[str], count: int):
+        self._pieces = pieces
+        self._count = count
+        self._text = None
+
+    def append(self, text: str) -> 'Rope':
+        """
+        This makes a new rope with text added to the end of this one
+        :param text: the text to add
+        :return: the new rope
+        """
+        pieces = self._pieces
+        if len(pieces) != self._count:  # a newer rope already appended to this list
+            pieces = pieces[:self._count]
+        pieces.append(text)
+        return Rope(pieces, self._count + 1)
+
+    def __str__(self) -> str:
+        """
+        This joins the pieces into a string the first time it is needed
+        :return: the string value of this rope
+        """
+        if self._text is None:
+            pieces = self._pieces
+            self._text = "".join(pieces if len(pieces) == self._count else pieces[:self._count])
+        return self._text
+
+
+def append_str(value, text: str) -> Rope:
+    """
+    This adds text to the end of a string value
+    :param value: the string or rope to add to
+    :param text: the text to add
+    :return: a rope with both
+    """
+    if type(value) is Rope:
+        return value.append(text)
+    return Rope([value, text], 2)
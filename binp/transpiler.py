@@ -0,0 +1,1068 @@
+import keyword
+
+from binp.builtins import BUILTINS
+from binp.caches import call_end
+from binp.errors import BinPSyntaxError
+from binp.evaluators import SYMBOLS, determine_evaluator, parse_value, str_eval
+from binp.expressions import Operator, gen_bool_tree, gen_math_tree, tree_type
+from binp.functions import parse_parameter_declaration, split_arguments
+from binp.interpreter import valid_name
+from binp.lexer import IDENTIFIER, STRING, unquote
+from binp.runtime import IMPROPER_TYPE
+
+UNARIES = {'int_negate': 'int', 'bool_negate': 'bool'}  # the type of the parameter (and the return) of each unary
+VALUE_TYPES = {'int', 'bool', 'str', 'seq', 'map', 'file'}
+
+# the precedence of each python operator, so the compiled expressions only have the parenthesis they need
+ATOM = 7  # a name, a literal or a call
+NOT = 3
+COMPARISON = 4
+PYTHON_OPERATORS = {
+    Operator.OR: ('or', 1),
+    Operator.AND: ('and', 2),
+    Operator.EQUAL: ('==', COMPARISON),
+    Operator.NOT_EQUAL: ('!=', COMPARISON),
+    Operator.LESS_THAN: ('<', COMPARISON),
+    Operator.LESS_EQUAL: ('<=', COMPARISON),
+    Operator.GREATER_THAN: ('>', COMPARISON),
+    Operator.GREATER_EQUAL: ('>=', COMPARISON),
+    Operator.ADD: ('+', 5),
+    Operator.SUB: ('-', 5),
+    Operator.MUL: ('*', 6),
+    Operator.DIV: ('//', 6),
+    Operator.MODULUS: ('%', 6),
+}
+
+# names the compiled module uses, which a variable can not have in python
+RESERVED = set(keyword.kwlist) | {
+    'str', 'range', 'sys', 'scope', 'program', 'SOURCE', 'LINES', 'FUNCTIONS', 'LINE_MAP',
+    'BinPSyntaxError', 'BinPValueError', 'BUILTINS', 'UNSET', 'CompiledFunction', 'call', 'call_statement',
+    'evaluate', 'frame', 'loop_range', 'output', 'read_input', 'run', 'source_lines', 'text',
+}
+HEADER = '''"""
+{name}, compiled to python by binp --emit-python
+
+Run it the same way as the program: python {module} <ARGUMENTS>
+"""
+import sys
+
+from binp.errors import BinPSyntaxError, BinPValueError
+from binp.runtime import BUILTINS, UNSET, CompiledFunction, call, call_statement, evaluate, frame, loop_range, \\
+    output, read_input, run, source_lines, text
+'''
+
+
+class Statement:
+    """
+    This class is a single statement of a program, which is parsed once and then compiled
+    (more than once, since the body of a loop is analysed before it is compiled)
+
+    :param kind: 'output', 'assign', 'input', 'declare', 'if', 'while', 'for', 'call', 'return' or 'error'
+    :param line_num: the line of the statement
+    :param words: the tokens of the line
+    :param name: the variable which is assigned, or the function which is declared
+    :param var_type: the type of the variable which is assigned
+    :param body: the statements inside of an if or a loop
+    :param orelse: the statements after its else, or None if it does not have one
+    :param else_line: the line of its else
+    :param error: (the name of the error class, its message) for a line which stops the program when it runs
+    """
+    def __init__(self, kind: str, line_num: int, words: list[str], name: str = None, var_type: str = None,
+                 body: list = None, orelse: list = None, else_line: int = None, error: tuple[str, str] = None):
+        self.kind = kind
+        self.line_num = line_num
+        self.words = words
+        self.name = name
+        self.var_type = var_type
+        self.body = body
+        self.orelse = orelse
+        self.else_line = else_line
+        self.error = error
+
+
+class FunctionSource:
+    """
+    This class is a function of the program (or the program itself) while it is being compiled
+
+    :param name: the name of the function, or None for the program
+    :param return_type: the return type of the function
+    :param params: the (type, name) parameters of the function
+    :param decl_line: the line declaring the function
+    :param end_line: the line of its end
+    """
+    def __init__(self, name: str | None, return_type: str, params: list[(str, str)], decl_line: int, end_line: int):
+        self.name = name
+        self.return_type = return_type
+        self.params = params
+        self.decl_line = decl_line
+        self.end_line = end_line
+        self.body = []
+        self.locals = [param_name for _, param_name in params]  # the parameters, then every variable it assigns
+        self.calls = []  # (the function called, the line of the call) for every call which can be made from here
+
+        # found by compiling the function once, then extended with what the functions it calls do
+        self.reads = set()  # the names it (or a function it calls) looks up in the namespace of its caller
+        self.reads_all = False  # true if the interpreter evaluates part of it, which can look up any name
+        self.impure = False  # true if it can call a builtin (which can open a file) or the interpreter
+        self.entry = set()  # the functions which have been declared whenever it is called
+
+
+def transpile(lines: list[str], name: str, module: str) -> str:
+    """
+    This compiles a program to a python module, for --emit-python (see Transpiler)
+    :param lines: the formatted lines of the program
+    :param name: the file of the program, for the docstring of the module
+    :param module: the file of the module
+    :return: the source of the module
+    :throws: BinPSyntaxError if the program can not be compiled
+    """
+    return Transpiler(lines).module(name, module)
+
+
+class Transpiler:
+    """
+    This class compiles a whole program ahead of time, to a python module which runs without the interpreter loop
+
+    Each function becomes a python function and the program becomes program(). Variables are python locals
+    and int and bool expressions become python expressions, wherever the type of every value in them
+    is known when the program is compiled. Anything else (like an expression with a command line argument
+    in it, whose type is only known when it runs) is still evaluated by the interpreter, on just that expression,
+    in a namespace with the variables of the compiled function. So the program still does exactly what it does
+    when it is interpreted
+
+    Since functions see the variables of their caller, every function knows which names it reads from its caller
+    (through any function it calls), and a call only passes the variables of the caller with those names.
+    A function which reads nothing (like most recursive functions) is called with just the python call
+
+    Functions have to be declared at the top level of the program, and a name can not be both a function
+    and a variable. Imports can not be compiled
+
+    :param lines: the formatted lines of the program
+    """
+    def __init__(self, lines: list[str]):
+        self.lines = lines
+        self.functions = {}
+        self.main = FunctionSource(None, 'null', [], -1, len(lines))
+        self.main.body, _ = self.parse(self.main, 0, len(lines))
+
+        # every name which can be a variable, and every name which can be in a namespace at all
+        self.names = {name for function in (self.main, *self.functions.values()) for name in function.locals}
+        self.possible = self.names | set(self.functions) | set(BUILTINS) | set(UNARIES)
+        for name, function in self.functions.items():
+            if name in self.names:
+                raise cannot_compile(function.decl_line, lines[function.decl_line],
+                                     f"'{name}' as both a function and a variable")
+        self.python_names = python_names([*self.names, *self.functions])
+
+        for function in (self.main, *self.functions.values()):
+            self.find_calls(function, function.body)
+        self.find_entries()
+        self.analyse()
+
+    def parse(self, function: FunctionSource, line_num: int, stop: int, block_line: int = None) -> (list, int):
+        """
+        This parses the statements of a function (or the program), or of a block inside of one
+        :param function: the function the statements are in
+        :param line_num: the line to start from
+        :param stop: the line after the last line of the function
+        :param block_line: the line opening the block (if, while or for), or None for the body of the function
+        :return: the statements, and the line of the 'end' or 'else' which ends the block (stop for a body)
+        """
+        lines = self.lines
+        statements = []
+        while line_num < stop:
+            line = lines[line_num]
+            words = line.split()
+            if block_line is not None and words[:1] in (['end'], ['else']):
+                return statements, line_num
+
+            match words:
+                case [] | ['$', *_]:
+                    pass
+
+                case ['output', *_]:
+                    statements.append(Statement('output', line_num, words))
+
+                case ['var', return_type, 'func', name, '=', '(', *params, ')', '=', '>']:
+                    if function is not self.main or block_line is not None:
+                        raise cannot_compile(line_num, line, 'a function declared inside of a block or a function')
+                    try:
+                        params = parse_parameter_declaration(line_num, line, params)
+                        end_line = self.function_end(line_num, name)
+                        valid_name(line_num, line, name)
+                    except BinPSyntaxError as err:
+                        statements.append(error_statement(err))
+                        return statements, stop  # the program stops here
+                    if name in self.functions:
+                        raise cannot_compile(line_num, line, f"the function '{name}' declared twice")
+                    if not all(param_name.isidentifier() for _, param_name in params) or \
+                            len({param_name for _, param_name in params}) != len(params):
+                        raise cannot_compile(line_num, line, 'the parameters of this function')
+
+                    declared = FunctionSource(name, return_type, params, line_num, end_line)
+                    declared.body, _ = self.parse(declared, line_num + 1, end_line)
+                    self.functions[name] = declared
+                    statements.append(Statement('declare', line_num, words, name=name))
+                    line_num = end_line
+
+                case ['var', var_type, name, '=', 'input']:
+                    statements.append(self.assignment('input', line_num, words, var_type, name, function))
+
+                case ['var', var_type, name, '=', *_]:
+                    statements.append(self.assignment('assign', line_num, words, var_type, name, function))
+
+                case ['var', *_]:
+                    statements.append(Statement('error', line_num, words,
+                                                error=('BinPSyntaxError', 'Invalid variable assignment')))
+
+                case ['if' | 'while' | 'for' as kind, '(', *_, ')', '=', '>']:
+                    body, end = self.parse(function, line_num + 1, stop, line_num)
+                    orelse = else_line = None
+                    if lines[end].split()[0] == 'else':
+                        else_line = end
+                        orelse, end = self.parse(function, end + 1, stop, line_num)
+                        if lines[end].split()[0] == 'else':
+                            raise cannot_compile(end, lines[end], 'a block with more than one else')
+
+                    statement = Statement(kind, line_num, words, body=body, orelse=orelse, else_line=else_line)
+                    if kind == 'for':
+                        match words:
+                            case ['for', '(', 'int', name, '=', *_]:
+                                statement = self.assignment('for', line_num, words, 'int', name, function)
+                                statement.body, statement.orelse, statement.else_line = body, orelse, else_line
+                            case _:  # not a for loop the interpreter knows
+                                statement = Statement('error', line_num, words, error=('BinPSyntaxError', ''))
+                    statements.append(statement)
+                    line_num = end
+
+                case ['import', *_]:
+                    raise cannot_compile(line_num, line, 'an import')
+
+                case [_, '(', *_, ')']:
+                    statements.append(Statement('call', line_num, words))
+
+                case ['return', *_]:
+                    statements.append(Statement('return', line_num, words))
+
+                case _:
+                    statements.append(Statement('error', line_num, words, error=('BinPSyntaxError', '')))
+
+            line_num += 1
+
+        if block_line is not None:
+            raise BinPSyntaxError(block_line, lines[block_line], message="Missing 'end' of if statement")
+        return statements, stop
+
+    def assignment(self, kind: str, line_num: int, words: list[str], var_type: str, name: str,
+                   function: FunctionSource) -> Statement:
+        """
+        :return: the statement assigning a variable (an error, if it is not a valid name)
+        """
+        try:
+            valid_name(line_num, self.lines[line_num], name)
+        except BinPSyntaxError as err:
+            return error_statement(err)
+        if name not in function.locals:
+            function.locals.append(name)
+        return Statement(kind, line_num, words, name=name, var_type=var_type)
+
+    def function_end(self, line_num: int, name: str) -> int:
+        """
+        :return: the line of the end of a function, which is found the same way parse_function_lines finds it
+        """
+        for end_line in range(line_num, len(self.lines)):
+            if self.lines[end_line].split() == ['end', name]:
+                return end_line
+        raise BinPSyntaxError(line_num, self.lines[line_num], message=f"Unable to find end of func '{name}'")
+
+    def find_calls(self, function: FunctionSource, statements: list[Statement]) -> None:
+        """
+        This finds every function which can be called from a function. A name followed by a parenthesis
+        which is not a function could be a variable holding the name of one, and input can be any expression,
+        so those can call any function
+        :param function: the function
+        :param statements: the statements to search
+        """
+        for statement in statements:
+            words = statement.words
+            match statement.kind:
+                case 'assign':
+                    vals = words[4:]
+                case 'return':
+                    vals = words[1:]
+                case 'if' | 'while' | 'for':
+                    vals = words[2:-3]
+                case 'call':
+                    vals = words
+                case 'input':
+                    function.calls.extend((name, statement.line_num) for name in self.functions)
+                    vals = []
+                case _:
+                    vals = []
+
+            for i, val in enumerate(vals[:-1]):
+                if vals[i+1] != '(' or val in SYMBOLS:
+                    continue
+                if val in self.functions:
+                    function.calls.append((val, statement.line_num))
+                elif val not in BUILTINS and val not in UNARIES:
+                    function.calls.extend((name, statement.line_num) for name in self.functions)
+
+            for block in (statement.body, statement.orelse):
+                if block:
+                    self.find_calls(function, block)
+
+    def find_entries(self) -> None:
+        """
+        This finds the functions which have been declared whenever each function is called.
+        Only those are called directly, since the interpreter would not find the others yet
+        """
+        for function in self.functions.values():
+            function.entry = set(self.functions)
+
+        changed = True
+        while changed:
+            changed = False
+            for caller in (self.main, *self.functions.values()):
+                for name, line_num in caller.calls:
+                    site = self.declared_before(line_num) if caller is self.main else caller.entry
+                    callee = self.functions[name]
+                    if not callee.entry <= site:
+                        callee.entry &= site
+                        changed = True
+
+    def declared_before(self, line_num: int) -> set[str]:
+        """
+        :return: the functions the program has declared when it gets to a line
+        """
+        return {name for name, function in self.functions.items() if function.decl_line < line_num}
+
+    def analyse(self) -> None:
+        """
+        This compiles every function once, to find what it reads from its caller and if it is pure,
+        then adds what the functions it calls do to each one
+        """
+        for function in self.functions.values():
+            compiler = FunctionCompiler(self, function)
+            compiler.compile()
+            function.reads, function.reads_all, function.impure = compiler.reads, compiler.reads_all, compiler.impure
+
+        changed = True
+        while changed:
+            changed = False
+            for function in self.functions.values():
+                for name, _ in function.calls:
+                    callee = self.functions[name]
+                    if not callee.reads <= function.reads or callee.reads_all > function.reads_all or \
+                            callee.impure > function.impure:
+                        function.reads |= callee.reads
+                        function.reads_all |= callee.reads_all
+                        function.impure |= callee.impure
+                        changed = True
+
+    def is_builtin(self, name: str) -> bool:
+        """
+        :return: true if a name is always the builtin (or unary) with that name
+        """
+        return (name in BUILTINS or name in UNARIES) and name not in self.names and name not in self.functions
+
+    def module(self, name: str, module: str) -> str:
+        """
+        :param name: the file of the program, for the docstring of the module
+        :param module: the file of the module
+        :return: the source of the compiled module
+        """
+        lines = [(line, None) for line in HEADER.format(name=name, module=module).splitlines()]
+        lines.append(('SOURCE = [', None))
+        lines.extend((f'    {line.raw!r},', None) for line in self.lines)
+        lines.append((']', None))
+        lines.append(('LINES = source_lines(SOURCE)', None))
+
+        for function in (*self.functions.values(), self.main):
+            lines.extend([('', None), ('', None)])
+            lines.extend(FunctionCompiler(self, function).compile())
+
+        lines.extend([('', None), ('', None), ('FUNCTIONS = {', None)])
+        for function_name, function in self.functions.items():
+            lines.append((f'    {function_name!r}: CompiledFunction({function_name!r}, {function.return_type!r}, '
+                          f'{function.params!r}, {self.python_names[function_name]}),', None))
+        lines.append(('}', None))
+
+        # only now is the line of everything in the module known
+        line_map = [f'{module_line}: {line_num}' for module_line, (_, line_num) in enumerate(lines, 1)
+                    if line_num is not None]
+        lines.append(('# each line of this module -> the line of the program it came from, for errors', None))
+        lines.append(('LINE_MAP = {', None))
+        for i in range(0, len(line_map), 10):
+            lines.append((f"    {', '.join(line_map[i:i+10])},", None))
+        lines.append(('}', None))
+        lines.extend([('', None), ("if __name__ == '__main__':", None),
+                      ('    run(program, LINES, LINE_MAP, sys.argv[1:])', None)])
+        return '\n'.join(line for line, _ in lines) + '\n'
+
+
+class FunctionCompiler:
+    """
+    This class compiles a single function (or the program) to python
+
+    While it compiles, it knows which variables have definitely been assigned (and their types) at each statement.
+    Only those are read as python variables, anything else is looked up in the namespace
+    the function was called with, just like the interpreter would
+
+    :param transpiler: the transpiler of the program
+    :param function: the function to compile
+    """
+    def __init__(self, transpiler: Transpiler, function: FunctionSource):
+        self.transpiler = transpiler
+        self.function = function
+        self.lines = transpiler.lines
+        self.main = function is transpiler.main
+        self.env = {}  # every variable which has definitely been assigned -> its type ('any' when it can change)
+        self.line_num = 0
+        self.out = []  # (the line of python, the line of the program it came from)
+        self.indent = 1
+
+        self.reads = set()
+        self.reads_all = False
+        self.impure = False
+        self.unset = False  # true if a variable can be used before it is assigned, so every one starts as UNSET
+
+    def compile(self) -> list[(str, int | None)]:
+        """
+        :return: each line of the python function, with the line of the program it came from (or None)
+        """
+        function = self.function
+        env = self.block(function.body, {param_name: result_type(param_type)
+                                         for param_type, param_name in function.params})
+        if env is not None and not self.main:  # the end of the function can be reached without a return
+            self.line_num = function.end_line
+            if function.return_type == 'null':
+                self.emit("return 'null'")
+            else:
+                self.emit_error('BinPValueError', f"Returned 'null' for type '{function.return_type}'")
+
+        if self.main:
+            header = [('def program(scope):', None)]
+        else:
+            params = ''.join(f', {self.python_name(param_name)}' for _, param_name in function.params)
+            header = [(f'# {self.lines[function.decl_line].raw}', None),
+                      (f'def {self.python_name(function.name)}(scope{params}):', function.decl_line)]
+        variables = [self.python_name(name) for name in function.locals[len(function.params):]]
+        if self.unset and variables:
+            header.append((f"    {' = '.join(variables)} = UNSET", None))
+        return header + (self.out or [('    pass', None)])
+
+    def emit(self, code: str, line_num: int = NotImplemented) -> None:
+        """
+        This adds a line of python
+        :param code: the line
+        :param line_num: the line of the program it came from (the current line, by default)
+        """
+        self.out.append((f"{'    ' * self.indent}{code}", self.line_num if line_num is NotImplemented else line_num))
+
+    def emit_error(self, error_class: str, message: str) -> None:
+        """
+        This adds a line which stops the program with an error on the current line
+        """
+        message = f', message={message!r}' if message else ''
+        self.emit(f'raise {error_class}({self.line_num}, LINES[{self.line_num}]{message})')
+
+    def python_name(self, name: str) -> str:
+        return self.transpiler.python_names[name]
+
+    def block(self, statements: list[Statement], env: dict | None) -> dict | None:
+        """
+        This compiles a list of statements
+        :param statements: the statements
+        :param env: the variables which have definitely been assigned before them (and their types)
+        :return: the variables which have definitely been assigned after them, or None if the end can not be reached
+        """
+        for statement in statements:
+            if env is None:
+                break  # after a return
+            env = self.statement(statement, env)
+        return env
+
+    def indented(self, statements: list[Statement], env: dict) -> dict | None:
+        """
+        This compiles the statements of a block, which are indented inside of it
+        """
+        start = len(self.out)
+        self.indent += 1
+        env = self.block(statements, env)
+        if len(self.out) == start:
+            self.emit('pass', None)
+        self.indent -= 1
+        return env
+
+    def loop_head(self, statements: list[Statement], env: dict, variable: str = None) -> dict:
+        """
+        This finds the variables which have definitely been assigned every time the body of a loop starts
+        (the ones assigned before the loop, which still have the same type at the end of the body)
+        :param statements: the body of the loop
+        :param env: the variables assigned before the loop
+        :param variable: the variable of a for loop, which is assigned before each run of the body
+        :return: the variables assigned at the start of the body (without the variable of a for loop)
+        """
+        head = env
+        while True:
+            out, indent, self.out = self.out, self.indent, []
+            end = self.block(statements, {**head, variable: 'int'} if variable is not None else dict(head))
+            self.out, self.indent = out, indent
+            new_head = meet(env, end)
+            if new_head == head:
+                return head
+            head = new_head
+
+    def statement(self, statement: Statement, env: dict) -> dict | None:
+        """
+        This compiles a statement
+        :param statement: the statement
+        :param env: the variables which have definitely been assigned before it
+        :return: the variables which have definitely been assigned after it, or None after a return
+        """
+        self.env = env
+        self.line_num = line_num = statement.line_num
+        words = statement.words
+        match statement.kind:
+            case 'output':
+                self.emit(f"output({self.text(len('output '))})")
+
+            case 'assign':
+                code, value_type = self.value(statement.var_type, words, 4)
+                self.emit(f'{self.python_name(statement.name)} = {code}')
+                env = {**env, statement.name: value_type}
+
+            case 'input':
+                self.reads_all = self.impure = True
+                self.emit(f'{self.python_name(statement.name)} = '
+                          f'read_input(LINES, {line_num}, {statement.var_type!r}, {self.namespace()})')
+                env = {**env, statement.name: result_type(statement.var_type)}
+
+            case 'declare':
+                self.emit(f'scope[{statement.name!r}] = FUNCTIONS[{statement.name!r}]')
+
+            case 'if':
+                self.emit(f'if {self.condition(words)}:')
+                then = self.indented(statement.body, dict(env))
+                otherwise = env
+                if statement.orelse is not None:
+                    self.emit('else:', None)
+                    otherwise = self.indented(statement.orelse, dict(env))
+                env = meet(then, otherwise)
+
+            case 'while':
+                head = self.loop_head(statement.body, env)
+                self.env, self.line_num = head, line_num
+                self.emit(f'while {self.condition(words)}:')
+                self.indented(statement.body, dict(head))
+                env = self.loop_else(statement, head)
+
+            case 'for':
+                values = self.loop_range(words)
+                if values is None:
+                    return None
+                head = self.loop_head(statement.body, env, statement.name)
+                self.env, self.line_num = head, line_num
+                self.emit(f'for {self.python_name(statement.name)} in {values}:')
+                self.indented(statement.body, {**head, statement.name: 'int'})
+                env = self.loop_else(statement, head)
+
+            case 'call':
+                code = None
+                if call_end(words, 1) == len(words) - 1:
+                    call = self.call(words[0], words[2:-1])
+                    code = call and call[0]
+                if code is None:
+                    self.reads_all = self.impure = True
+                    code = f'call_statement(LINES, {line_num}, {self.namespace()})'
+                self.emit(code)
+
+            case 'return':
+                self.compile_return(words)
+                env = None
+
+            case 'error':
+                self.emit_error(*statement.error)
+                env = None
+        return env
+
+    def loop_else(self, statement: Statement, head: dict) -> dict | None:
+        """
+        This compiles the else of a loop, which runs once when the loop is done (python's else does the same)
+        :return: the variables which have definitely been assigned after the loop
+        """
+        if statement.orelse is None:
+            return head
+        self.emit('else:', None)
+        return self.indented(statement.orelse, dict(head))
+
+    def loop_range(self, words: list[str]) -> str | None:
+        """
+        This compiles the values of the variable of a for loop
+        :param words: the tokens of the line of the for loop
+        :return: the range, or None if the loop always stops the program with an error
+        """
+        bounds = []
+        start = depth = 0
+        vals = words[5:-3]
+        for i, val in enumerate(vals):
+            if val == '(':
+                depth += 1
+            elif val == ')':
+                depth -= 1
+            elif val == ',' and depth == 0:
+                bounds.append((start, i))
+                start = i + 1
+        if vals:
+            bounds.append((start, len(vals)))
+        if len(bounds) not in (2, 3):
+            self.emit_error('BinPSyntaxError', 'A for loop needs a start, a stop and an optional step')
+            return None
+
+        codes = []
+        for start, stop in bounds:
+            expression = self.expression(vals[start:stop], 'int')
+            codes.append(expression[0] if expression is not None else self.fallback('int', start + 5, stop + 5))
+        if len(codes) == 2 or codes[2] == '1':
+            return f'range({codes[0]}, {codes[1]})'
+        if codes[2].lstrip('-').isdecimal() and int(codes[2].lstrip('-')) != 0:  # int_negate(0) is '-0'
+            return f"range({', '.join(codes)})"
+        return f"loop_range(LINES, {self.line_num}, {', '.join(codes)})"
+
+    def compile_return(self, words: list[str]) -> None:
+        """
+        This compiles a return, which evaluates its value the same way run_lines does
+        """
+        if self.main:
+            self.emit('return')  # returning from the program stops it
+            return
+
+        return_type = self.function.return_type
+        if words[1:] in ([], ['null']):
+            if return_type == 'null':
+                self.emit("return 'null'")
+            else:
+                self.emit_error('BinPValueError', f"Returned 'null' for type '{return_type}'")
+        elif determine_evaluator(return_type) is None:  # a null function can not return a value
+            self.emit_error('BinPValueError', IMPROPER_TYPE)
+        else:
+            code, _ = self.value(return_type, words, 1)
+            self.emit(f'return {code}')
+
+    def value(self, var_type: str, words: list[str], start: int) -> (str, str):
+        """
+        This compiles the value assigned to (or returned as) a type
+        :param var_type: the type
+        :param words: the tokens of the line
+        :param start: the position of the first token of the value
+        :return: the code of the value, and its type
+        """
+        vals = words[start:]
+        code = None
+        if var_type in ('int', 'bool'):
+            expression = self.expression(vals, var_type)
+            code = expression and expression[0]
+        elif var_type == 'str':
+            code = self.str_value(vals)
+        elif var_type in ('seq', 'map', 'file'):
+            code = self.reference(vals, var_type)
+        if code is None:
+            code = self.fallback(var_type, start, None)
+        return code, result_type(var_type)
+
+    def condition(self, words: list[str]) -> str:
+        """
+        :return: the code of the condition of an if or a while
+        """
+        expression = self.expression(words[2:-3], 'bool')
+        return expression[0] if expression is not None else self.fallback('bool', 2, -3)
+
+    def fallback(self, var_type: str, start: int, stop: int | None) -> str:
+        """
+        :return: the code which evaluates part of the current line with the interpreter
+        """
+        self.reads_all = self.impure = True
+        return f'evaluate(LINES, {self.line_num}, {var_type!r}, {start}, {stop}, {self.namespace()})'
+
+    def namespace(self) -> str:
+        """
+        :return: the code of the namespace the interpreter sees, which has every variable of the function
+        """
+        return self.frame(self.function.locals)
+
+    def frame(self, names: list[str]) -> str:
+        """
+        :return: the code of a namespace with some variables of the function, on top of the one it was called with
+        """
+        if not names:
+            return 'scope'
+        self.unset = True
+        return f'frame(scope, {tuple_code([repr(name) for name in names])}, ' \
+               f'{tuple_code([self.python_name(name) for name in names])})'
+
+    def known_function(self, name: str) -> FunctionSource | None:
+        """
+        :return: the function a name always is at the current line, or None if it is not always one
+        """
+        function = self.transpiler.functions.get(name)
+        if function is None:
+            return None
+        if self.main:
+            return function if function.decl_line < self.line_num else None
+        return function if name in self.function.entry else None
+
+    def call(self, name: str, vals: list[str]) -> tuple[str, str, int] | None:
+        """
+        This compiles a call of a function whose arguments can all be compiled
+        :param name: the name of the function
+        :param vals: the tokens between its parenthesis
+        :return: the code of the call, its type and its precedence, or None if it can not be compiled
+        """
+        if divides_before_call(vals):
+            return None
+        args = split_arguments(vals)
+
+        if name in UNARIES and self.transpiler.is_builtin(name):
+            expression = self.expression(args[0], UNARIES[name]) if len(args) == 1 else None
+            if expression is None:
+                return None
+            code, precedence = expression
+            if name == 'int_negate':
+                return (f'-{code}' if precedence == ATOM else f'-({code})'), 'int', ATOM
+            return (f'not {code}' if precedence > NOT else f'not ({code})'), 'bool', NOT
+
+        function = self.known_function(name)
+        if function is not None:
+            params, return_type = function.params, function.return_type
+        elif name in BUILTINS and self.transpiler.is_builtin(name):
+            params, return_type = BUILTINS[name]._params, BUILTINS[name]._return_type
+        else:
+            return None
+        if len(args) != len(params):
+            return None
+
+        codes = []
+        for arg, (param_type, _) in zip(args, params):
+            code = self.argument(arg, param_type)
+            if code is None:
+                return None
+            codes.append(code)
+
+        if function is None:
+            self.impure = True  # a builtin can open a file
+            code = f"BUILTINS[{name!r}]({', '.join([str(self.line_num), f'LINES[{self.line_num}]', *codes])})"
+        else:
+            python_name = self.python_name(name)
+            args = ', '.join([self.callee_scope(function), *codes])
+            code = f'call({python_name}, {args})' if function.impure else f'{python_name}({args})'
+        return code, result_type(return_type), ATOM
+
+    def callee_scope(self, function: FunctionSource) -> str:
+        """
+        :return: the code of the namespace a function is called with, which only has the variables it reads
+        """
+        return self.frame([name for name in self.function.locals if function.reads_all or name in function.reads])
+
+    def argument(self, arg: list[str], param_type: str) -> str | None:
+        """
+        This compiles an argument the same way evaluate_arguments evaluates it
+        :param arg: the tokens of the argument
+        :param param_type: the type of the parameter
+        :return: the code of the argument, or None if it can not be compiled
+        """
+        if param_type in ('int', 'bool'):
+            expression = self.expression(arg, param_type)
+            return expression and expression[0]
+
+        if len(arg) != 1:
+            if param_type in ('seq', 'map', 'file'):
+                return self.reference(arg, param_type)
+            return None
+        val = arg[0]
+        if val in self.env:
+            value_type = self.env[val]
+            if value_type == param_type and value_type != 'any':
+                return self.python_name(val)
+            if param_type == 'str' and value_type in ('int', 'bool'):
+                return f'str({self.python_name(val)})'
+            return None
+        if param_type != 'str' or val in self.transpiler.possible or is_argument(val):
+            return None
+        return repr(unquote(val))  # a word which is not a variable
+
+    def reference(self, vals: list[str], var_type: str) -> str | None:
+        """
+        :return: the code of a seq or a map (a variable, or a call which returns one), or None
+        """
+        if len(vals) == 1 and self.env.get(vals[0]) == var_type:
+            return self.python_name(vals[0])
+        if len(vals) > 2 and vals[1] == '(' and call_end(vals, 1) == len(vals) - 1:
+            call = self.call(vals[0], vals[2:-1])
+            if call is not None and call[1] == var_type:
+                return call[0]
+        return None
+
+    def str_value(self, vals: list[str]) -> str | None:
+        """
+        This compiles a string the same way str_eval evaluates it: the text of the line with its variables
+        substituted, unless it is a call of a function
+        :return: the code of the string, or None
+        """
+        if len(vals) > 2 and vals[1] == '(' and vals[-1] == ')' and \
+                (vals[0] in self.transpiler.functions or vals[0] in BUILTINS or vals[0] in UNARIES):
+            if call_end(vals, 1) != len(vals) - 1:
+                return None
+            call = self.call(vals[0], vals[2:-1])
+            return call[0] if call is not None and call[1] == 'str' else None
+        return self.text(self.lines[self.line_num].start_of(vals))
+
+    def text(self, start: int) -> str:
+        """
+        This compiles the text of the current line from a position, with every variable substituted
+        the same way interpolate does it
+        :param start: the position in the raw line where the text starts
+        :return: the code of the text
+        """
+        line = self.lines[self.line_num]
+        raw = line.raw
+        pieces = []  # text, or (the code of a value, true if it is always a str)
+        position = start
+        for token in line.tokens:
+            if token.col < start:
+                continue
+            if token.kind == IDENTIFIER:
+                piece = self.variable_text(token.text)
+                if piece is None:
+                    continue  # never a variable, so it is output as it is written
+            elif token.kind == STRING:
+                piece = unquote(token.text)
+            else:
+                continue
+            pieces.append(raw[position:token.col])
+            pieces.append(piece)
+            position = token.col + len(token.text)
+        pieces.append(raw[position:])
+        return text_code(pieces)
+
+    def variable_text(self, name: str):
+        """
+        :param name: a name in a line of text
+        :return: the text it is replaced with, (the code of its value, true if it is always a str),
+                or None if it is never replaced
+        """
+        if name in self.env:
+            return self.python_name(name), self.env[name] == 'str'
+        function = self.known_function(name)
+        if function is not None:
+            return f"{name}: ({', '.join(param_type for param_type, _ in function.params)}) -> " \
+                   f"{function.return_type}"
+        if name not in self.transpiler.possible and not is_argument(name):
+            return None
+
+        self.reads.add(name)
+        if name in self.function.locals:  # assigned on some paths, but not all of them
+            self.unset = True
+            python_name = self.python_name(name)
+            return f'text(scope.get({name!r}, UNSET) if {python_name} is UNSET else {python_name}, {name!r})', True
+        return f'text(scope.get({name!r}, UNSET), {name!r})', True
+
+    def expression(self, vals: list[str], kind: str) -> tuple[str, int] | None:
+        """
+        This compiles an int or bool expression to a python expression. This can only be done when every value
+        in it is a literal, a variable which has definitely been assigned a value of the right type,
+        or a call which can be compiled (which returns the right type)
+        :param vals: the tokens of the expression
+        :param kind: 'int' or 'bool'
+        :return: the code of the expression and its precedence, or None if the interpreter has to evaluate it
+        """
+        if kind == 'int' and divides_before_call(vals):
+            return None
+
+        samples = []  # the tokens, with a value of the right type in place of each operand
+        operands = []  # the code and precedence of each operand, in order
+        i = 0
+        while i < len(vals):
+            val = vals[i]
+            if val in SYMBOLS:
+                if val == ',' or (val == '(' and i > 0 and vals[i-1] not in SYMBOLS):
+                    return None
+                samples.append(val)
+                i += 1
+                continue
+
+            if i + 1 < len(vals) and vals[i+1] == '(':
+                end = call_end(vals, i + 1)
+                call = self.call(val, vals[i+2:end]) if end is not None else None
+                if call is None or call[1] not in ('int', kind):
+                    return None
+                samples.append(0 if call[1] == 'int' else True)
+                operands.append(call[::2])
+                i = end + 1
+                continue
+
+            if val in self.env:
+                value_type = self.env[val]
+                if value_type not in ('int', kind):
+                    return None
+                samples.append(0 if value_type == 'int' else True)
+                operands.append((self.python_name(val), ATOM))
+            else:
+                if val in self.transpiler.possible or is_argument(val):
+                    return None  # its type is only known when the program runs
+                value = parse_value(val)
+                if type(value) is not int and (type(value) is not bool or kind != 'bool'):
+                    return None
+                samples.append(value)
+                operands.append((str(value), ATOM))
+            i += 1
+
+        try:
+            if kind == 'int':
+                root = gen_math_tree(samples)
+                if samples:
+                    return None  # the interpreter ignores the rest
+            else:
+                root = gen_bool_tree(samples)
+            if tree_type(root) is not (int if kind == 'int' else bool):
+                return None
+        except Exception:  # the interpreter makes the error
+            return None
+        return render(root, iter(operands))
+
+
+def render(root, operands) -> (str, int):
+    """
+    This writes an expression tree as python
+    :param root: the root of the tree
+    :param operands: the code and precedence of each operand (its leaves, from left to right)
+    :return: the code of the expression and its precedence
+    """
+    if root.op is Operator.INT or root.op is Operator.BOOL:
+        return next(operands)
+
+    symbol, precedence = PYTHON_OPERATORS[root.op]
+    left, left_precedence = render(root.left, operands)
+    right, right_precedence = render(root.right, operands)
+    if left_precedence < precedence or left_precedence == precedence == COMPARISON:  # comparisons chain in python
+        left = f'({left})'
+    if right_precedence <= precedence:
+        right = f'({right})'
+    return f'{left} {symbol} {right}', precedence
+
+
+def text_code(pieces: list) -> str:
+    """
+    :param pieces: the pieces of a text: text, or (the code of a value, true if it is always a str)
+    :return: the code of the text, as an f-string when it has values in it
+    """
+    parts = []
+    for piece in pieces:
+        if type(piece) is str:
+            if parts and type(parts[-1]) is str:
+                parts[-1] += piece
+            elif piece:
+                parts.append(piece)
+        else:
+            parts.append(piece)
+
+    if not parts:
+        return "''"
+    if len(parts) == 1:
+        if type(parts[0]) is str:
+            return repr(parts[0])
+        code, is_str = parts[0]
+        return code if is_str else f'str({code})'
+    return 'f"' + ''.join(escape_text(part) if type(part) is str else f'{{{part[0]}}}' for part in parts) + '"'
+
+
+def escape_text(text: str) -> str:
+    """
+    :return: text, written inside of an f-string in double quotes
+    """
+    for old, new in (('\\', '\\\\'), ('"', '\\"'), ('{', '{{'), ('}', '}}'), ('\t', '\\t'), ('\r', '\\r')):
+        text = text.replace(old, new)
+    return text
+
+
+def tuple_code(items: list[str]) -> str:
+    return f'({items[0]},)' if len(items) == 1 else f"({', '.join(items)})"
+
+
+def divides_before_call(vals: list[str]) -> bool:
+    """
+    The interpreter runs the calls in an expression (and in the arguments of a call) before it does any arithmetic,
+    so dividing by zero before a call in python would stop the program before the call instead of after it
+    :param vals: the tokens of an expression
+    :return: true if a / or % comes before a function call
+    """
+    divided = False
+    for i, val in enumerate(vals):
+        if val in ('/', '%'):
+            divided = True
+        elif divided and i + 1 < len(vals) and vals[i+1] == '(' and val not in SYMBOLS:
+            return True
+    return False
+
+
+def meet(first: dict | None, second: dict | None) -> dict | None:
+    """
+    :param first: the variables definitely assigned at the end of one path (None if its end can not be reached)
+    :param second: the variables definitely assigned at the end of another path
+    :return: the variables definitely assigned where the paths join
+    """
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return {name: value_type if second[name] == value_type else 'any'
+            for name, value_type in first.items() if name in second}
+
+
+def result_type(var_type: str) -> str:
+    """
+    :return: the type of the value assigned to a variable of a type
+    """
+    if var_type in VALUE_TYPES:
+        return var_type
+    return 'str' if determine_evaluator(var_type) is str_eval else 'any'
+
+
+def is_argument(name: str) -> bool:
+    """
+    :return: true if a name can be a command line argument (which is not a variable, but is in the namespace)
+    """
+    return name == 'ARG_COUNT' or (name.startswith('ARG_') and name[4:].isdecimal())
+
+
+def python_names(names: list[str]) -> dict[str, str]:
+    """
+    This gives every variable and function a name in python. Names which python (or the compiled module)
+    already uses get underscores after them, until they are not the name of anything else
+    :param names: every variable and function
+    :return: each name -> its name in python
+    """
+    taken = RESERVED | set(names)
+    retval = {}
+    for name in names:
+        python_name = name
+        if name in RESERVED:
+            while python_name in taken:
+                python_name += '_'
+            taken.add(python_name)
+        retval[name] = python_name
+    return retval
+
+
+def error_statement(err: BinPSyntaxError) -> Statement:
+    """
+    :return: a statement which stops the program with an error when it runs
+    """
+    return Statement('error', err._num, [], error=('BinPSyntaxError', err._reason))
+
+
+def cannot_compile(line_num: int, line: str, what: str) -> BinPSyntaxError:
+    """
+    :return: the error for a part of a program which can not be compiled
+    """
+    return BinPSyntaxError(line_num, line, message=f"{what} can not be compiled to python")
@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, 'main.py')
+
+# the example programs are all run with the same arguments and input, since some of them need both
+PROGRAM_ARGS = ['48', '18']
+PROGRAM_INPUT = 'true\nfalse\n'
+
+
+def run_binp(*args: str, stdin: str = '', cwd: str = None, env: dict = None) -> subprocess.CompletedProcess:
+    """
+    This runs main.py the way a person would from a shell
+    :param args: the command line arguments (options, the program and its arguments)
+    :param stdin: the text piped into the program
+    :param cwd: the directory to run it in (files the program opens are found from here)
+    :param env: extra environment variables
+    :return: the finished process, with stdout and stderr as text
+    """
+    return subprocess.run([sys.executable, MAIN, *args], input=stdin, capture_output=True, text=True, cwd=cwd,
+                          env={**os.environ, 'PYTHONPATH': ROOT, **(env or {})}, timeout=120)
+
+
+def run_python(path: str, *args: str, stdin: str = '', cwd: str = None) -> subprocess.CompletedProcess:
+    """
+    This runs a python file, like a program compiled with --emit-python
+    :param path: the python file
+    :param args: its command line arguments
+    :param stdin: the text piped into it
+    :param cwd: the directory to run it in
+    :return: the finished process, with stdout and stderr as text
+    """
+    return subprocess.run([sys.executable, path, *args], input=stdin, capture_output=True, text=True, cwd=cwd,
+                          env={**os.environ, 'PYTHONPATH': ROOT}, timeout=120)
+
+
+def programs(directory: str) -> list[str]:
+    """
+    :param directory: 'valid_programs' or 'invalid_programs'
+    :return: the path of every program in the directory, relative to the root of the repo
+    """
+    return sorted(os.path.join(directory, name) for name in os.listdir(os.path.join(ROOT, directory))
+                  if name.endswith('.binp'))
+
+
+def write(directory, name: str, text: str) -> str:
+    """
+    This writes a file for a test
+    :param directory: the directory to write it in (usually tmp_path)
+    :param name: the name of the file
+    :param text: what to write
+    :return: the path of the file
+    """
+    path = os.path.join(directory, name)
+    with open(path, 'w') as file:
+        file.write(text)
+    return path
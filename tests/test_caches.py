@@ -0,0 +1,125 @@
+import io
+
+import pytest
+
+from binp.builtins import get_builtins
+from binp.caches import UNCACHEABLE
+from binp.context import Context, CURRENT_CONTEXT
+from binp.errors import BinPValueError, BinPRuntimeError, BinPArgumentError, BinPSyntaxError
+from binp.evaluators import int_eval, bool_eval
+from binp.formatting import format_file, format_line
+from binp.interpreter import run_program, get_unaries
+from tests.helpers import run_binp, write
+
+ERRORS = (BinPValueError, BinPRuntimeError, BinPArgumentError, BinPSyntaxError)
+
+FUNCTIONS = '''var int func f = (int x) =>
+    return x + 1
+end f
+var int func g = (int x) =>
+    return x * 10
+end g
+'''
+
+
+@pytest.fixture
+def context():
+    context = Context(stdout=io.StringIO())
+    token = CURRENT_CONTEXT.set(context)
+    yield context
+    CURRENT_CONTEXT.reset(token)
+
+
+def namespace(source: str = '') -> dict:
+    """
+    :param source: a program declaring the functions (and variables) the namespace starts with
+    :return: the global namespace after running it
+    """
+    global_namespace = get_builtins(get_unaries({}))
+    run_program(format_file(io.StringIO(source)), global_namespace)
+    return global_namespace
+
+
+def evaluate(line, eval_func, local_namespace: dict):
+    """
+    This evaluates the expression after the '=' of a line
+    :return: the value, or the type and reason of the error it made
+    """
+    try:
+        return eval_func(0, line, line.split()[4:], local_namespace)
+    except ERRORS as err:
+        return type(err), err._reason
+
+
+def check_same_as_uncached(text: str, eval_func, namespaces: list[dict]) -> list:
+    """
+    This evaluates one site in every namespace in turn, so its cache is made by the first one and
+    guarded by the rest, and checks each result is what a line with no cache gives
+    :return: the results
+    """
+    site = format_line(text)
+    results = [evaluate(site, eval_func, local_namespace) for local_namespace in namespaces]
+    assert results == [evaluate(format_line(text), eval_func, local_namespace) for local_namespace in namespaces]
+    return results
+
+
+def test_int_guard_misses_when_a_type_changes(context):
+    results = check_same_as_uncached('var int y = x * 2 + 1', int_eval,
+                                     [{'x': 3}, {'x': 'abc'}, {'x': True}, {}, {'x': -4}])
+    assert results[0] == 7 and results[-1] == -7
+    assert all(type(result) is tuple for result in results[1:-1])
+
+
+def test_bool_guard_misses_when_a_type_changes(context):
+    namespaces = [{'x': 1, 'y': True}, {'x': 1, 'y': 5}, {'x': 'a', 'y': True}, {'x': 5, 'y': True}]
+    results = check_same_as_uncached('var bool b = x < 3 && y', bool_eval, namespaces)
+    assert results[0] is True and results[-1] is False
+
+
+def test_call_site_follows_a_redefined_function(context):
+    first = namespace(FUNCTIONS)
+    redefined = dict(first, f=first['g'])
+    shadowed = dict(first, f=7)
+    results = check_same_as_uncached('var int y = f(2) + 1', int_eval, [first, redefined, shadowed, first])
+    assert results[0] == 4 and results[1] == 21 and results[3] == 4
+
+
+def test_bool_calls_are_not_cached(context):
+    site = format_line('var bool b = false && f(1) == 2')
+    assert evaluate(site, bool_eval, namespace(FUNCTIONS)) is False
+    assert list(site.sites.values()) == [UNCACHEABLE]
+
+
+def test_bool_calls_still_short_circuit(tmp_path):
+    # the same line runs three times, with the cache made on the first
+    program = write(tmp_path, 'short.binp', '''var bool func noisy = (bool x) =>
+    output called
+    return x
+end noisy
+var int i = 0
+while (i < 3) =>
+    var bool a = false && noisy(true)
+    var bool b = true || noisy(false)
+    var bool c = i == 2 && noisy(true)
+    output a b c
+    var int i = i + 1
+end
+''')
+    result = run_binp(program)
+    assert (result.returncode, result.stderr) == (0, '')
+    assert result.stdout == ' >> False True False \n >> False True False \n >> called \n >> False True True \n'
+
+
+def test_redefined_function_in_a_loop(tmp_path):
+    program = write(tmp_path, 'redefine.binp', FUNCTIONS + '''var int i = 0
+while (i < 2) =>
+    var int y = f(i) + 1
+    output y
+    var int func f = (int x) =>
+        return x * 100
+    end f
+    var int i = i + 1
+end
+''')
+    result = run_binp(program)
+    assert (result.returncode, result.stdout, result.stderr) == (0, ' >> 2 \n >> 101 \n', '')
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from tests.helpers import run_binp, write
+
+# reads a number from the file and one from the input each iteration, so running out of input stops it part way
+JOB = '''var file f = fopen(nums.txt, r)
+var file out = fopen(out.txt, w)
+var int total = 0
+while (bool_negate(feof(f))) =>
+    var int step = input
+    var int n = fread_int(f)
+    var int total = total + n * step
+    fwrite(out, n total)
+end
+fclose(out)
+output total
+'''
+
+
+def run_job(tmp_path, stdin: str, program: str = 'job.binp'):
+    """
+    :return: the finished run of a program, checkpointed before every statement
+    """
+    return run_binp('--checkpoint=job.ckpt', '--checkpoint-every=0', '--resume', program, stdin=stdin, cwd=tmp_path)
+
+
+def test_resume_reopens_files(tmp_path):
+    write(tmp_path, 'nums.txt', '1\n2\n3\n4\n5\n6\n')
+    write(tmp_path, 'job.binp', JOB)
+
+    stopped = run_job(tmp_path, '1\n1\n1\n')
+    assert stopped.returncode == 3
+    assert 'No more input to read' in stopped.stderr
+    assert (tmp_path / 'job.ckpt').exists()
+
+    resumed = run_job(tmp_path, '1\n1\n1\n2\n2\n2\n')  # the first three lines were read before the checkpoint
+    assert (resumed.returncode, resumed.stdout, resumed.stderr) == (0, ' >> 36 \n', '')
+    assert (tmp_path / 'out.txt').read_text() == '1 1\n2 3\n3 6\n4 14\n5 24\n6 36\n'
+    assert not (tmp_path / 'job.ckpt').exists()
+
+
+def test_resume_fails_when_a_file_is_gone(tmp_path):
+    write(tmp_path, 'nums.txt', '1\n2\n')
+    write(tmp_path, 'job.binp', JOB)
+    assert run_job(tmp_path, '1\n').returncode == 3
+    (tmp_path / 'nums.txt').unlink()
+
+    resumed = run_job(tmp_path, '1\n1\n')
+    assert resumed.returncode == 1
+    assert resumed.stderr == "Checkpoint Error in 'job.ckpt': Unable to reopen file 'nums.txt' " \
+                             "(No such file or directory)\n"
+
+
+def test_only_top_level_while_loops_are_checkpointed(tmp_path):
+    write(tmp_path, 'nested.binp', '''var int i = 0
+if (true) =>
+    while (i < 3) =>
+        var int x = input
+        var int i = i + 1
+    end
+end
+''')
+    assert run_job(tmp_path, '1\n1\n', 'nested.binp').returncode == 3
+    with open(tmp_path / 'job.ckpt') as file:
+        assert json.load(file)['line'] == 1  # the if, which had not finished
+
+
+@pytest.mark.parametrize('source', [
+    'var int func main = () =>\n    var int x = input\n    return x\nend main\nvar int r = main()\n$ done\n',
+    'for (int i = 0, 3) =>\n    var int x = input\nend\n',
+    'import "lib.binp"\nif (true) =>\n    while (true) =>\n        var int x = input\n    end\nend\n',
+])
+def test_programs_which_can_never_checkpoint_are_refused(tmp_path, source):
+    write(tmp_path, 'lib.binp', 'var int func two = () =>\n    return 2\nend two\n')
+    write(tmp_path, 'never.binp', source)
+    result = run_job(tmp_path, '1\n', 'never.binp')
+    assert (result.returncode, result.stdout) == (1, '')
+    assert result.stderr.startswith('--checkpoint can never save a checkpoint of this program')
+    assert not (tmp_path / 'job.ckpt').exists()
+
+
+@pytest.mark.parametrize('source', [
+    'var int x = input\nvar int y = input\n',
+    'var int func main = () =>\n    return 1\nend main\nwhile (true) =>\n    var int x = input\nend\n',
+])
+def test_programs_which_can_checkpoint_run(tmp_path, source):
+    write(tmp_path, 'once.binp', source)
+    result = run_job(tmp_path, '1\n', 'once.binp')
+    assert result.returncode == 3 and 'No more input to read' in result.stderr
+    assert (tmp_path / 'job.ckpt').exists()
@@ -0,0 +1,69 @@
+import pytest
+
+from tests.helpers import run_binp, run_python, write
+
+# prints every time it is called, so a test can see which calls ran
+NOISY = '''var bool func noisy = (bool x) =>
+    output called x
+    return x
+end noisy
+'''
+
+
+def run_both(tmp_path, source: str) -> list:
+    """
+    This runs a program with the interpreter and compiled with --emit-python
+    :return: the finished interpreter run and the finished compiled run
+    """
+    program = write(tmp_path, 'expressions.binp', source)
+    module = str(tmp_path / 'expressions.py')
+    assert run_binp(f'--emit-python={module}', program).returncode == 0
+    return [run_binp(program), run_python(module)]
+
+
+@pytest.mark.parametrize('expression, value', [
+    ('true || false && false', True),  # && before ||
+    ('false && true || true', True),
+    ('true || true && bool_negate(true)', True),
+    ('false || true && bool_negate(false)', True),
+    ('false || true && bool_negate(true)', False),
+    ('(true || false) && false', False),
+    ('bool_negate(false || true) || false', False),
+    ('1 + 2 * 3 == 7 && 10 - 4 / 2 > 7', True),  # arithmetic, then comparisons, then && and ||
+    ('2 * (3 + 1) != 8 || 5 % 3 <= 1', False),
+])
+@pytest.mark.parametrize('compiled', [False, True])
+def test_bool_precedence(tmp_path, expression, value, compiled):
+    result = run_both(tmp_path, f'var bool b = {expression}\noutput b\n')[compiled]
+    assert (result.returncode, result.stdout, result.stderr) == (0, f' >> {value} \n', '')
+
+
+@pytest.mark.parametrize('expression, value, calls', [
+    ('false && noisy(true)', False, []),
+    ('true || noisy(false)', True, []),
+    ('false && (noisy(true) || noisy(true))', False, []),
+    ('true && noisy(false) || noisy(true)', True, [False, True]),
+    ('noisy(true) || noisy(false)', True, [True]),
+    ('noisy(false) && noisy(true) || true', True, [False]),
+])
+@pytest.mark.parametrize('compiled', [False, True])
+def test_calls_on_the_right_only_run_when_needed(tmp_path, expression, value, calls, compiled):
+    result = run_both(tmp_path, NOISY + f'var bool b = {expression}\noutput b\n')[compiled]
+    assert (result.returncode, result.stderr) == (0, '')
+    assert result.stdout == ''.join(f' >> called {call} \n' for call in calls) + f' >> {value} \n'
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_short_circuit_in_conditions(tmp_path, compiled):
+    result = run_both(tmp_path, NOISY + '''var int i = 0
+while (i < 2 && noisy(true)) =>
+    var int i = i + 1
+end
+if (i == 5 && noisy(true)) =>
+    output no
+else =>
+    output i
+end
+''')[compiled]
+    assert (result.returncode, result.stderr) == (0, '')
+    assert result.stdout == ' >> called True \n >> called True \n >> 2 \n'
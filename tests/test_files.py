@@ -0,0 +1,102 @@
+import pytest
+
+from tests.helpers import run_binp, run_python, write
+
+
+def run_both(tmp_path, source: str) -> list:
+    """
+    This runs a program with the interpreter and compiled with --emit-python
+    :param tmp_path: the directory to run it in
+    :param source: the program
+    :return: the finished interpreter run and the finished compiled run
+    """
+    program = write(tmp_path, 'files.binp', source)
+    interpreted = run_binp(program, cwd=tmp_path)
+    module = str(tmp_path / 'files.py')
+    assert run_binp(f'--emit-python={module}', program).returncode == 0
+    return [interpreted, run_python(module, cwd=tmp_path)]
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_quoted_text_is_written_as_is(tmp_path, compiled):
+    result = run_both(tmp_path, '''var file f = fopen('my  data.txt', w)
+fwrite(f, 'a - b,  c')
+fwrite(f, "(x) + 1")
+fwrite(f, 3 - 1)
+fclose(f)
+''')[compiled]
+    assert result.returncode == 0, result.stderr
+    with open(tmp_path / 'my  data.txt') as file:  # double quotes are kept, the same as in an output
+        assert file.read() == 'a - b,  c\n"(x) + 1"\n3-1\n'
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_returning_an_int_does_not_keep_a_file_open(tmp_path, compiled):
+    # the int returned is the same as the number of the handle, the file is still closed (and written out)
+    result = run_both(tmp_path, '''var int func fill = () =>
+    var file out = fopen(out.txt, w)
+    fwrite(out, hello)
+    return 1
+end fill
+var int n = fill()
+var file f = fopen(out.txt, r)
+var str line = fread_str(f)
+output line
+''')[compiled]
+    assert (result.returncode, result.stdout, result.stderr) == (0, ' >> hello \n', '')
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_returned_handles_stay_open(tmp_path, compiled):
+    write(tmp_path, 'in.txt', '4\n5\n')
+    result = run_both(tmp_path, '''var file func open_input = () =>
+    return fopen(in.txt, r)
+end open_input
+var file f = open_input()
+var int total = fread_int(f) + fread_int(f)
+output total
+''')[compiled]
+    assert (result.returncode, result.stdout, result.stderr) == (0, ' >> 9 \n', '')
+
+
+def test_handles_are_not_ints(tmp_path):
+    write(tmp_path, 'in.txt', '4\n')
+    for source in ['var int f = fopen(in.txt, r)\n', 'var file f = 1\n', 'var int x = fread_int(1)\n']:
+        result = run_binp(write(tmp_path, 'bad.binp', source), cwd=tmp_path)
+        assert result.returncode == 3
+        assert 'Traceback' not in result.stderr
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_handles_stored_where_the_caller_can_reach_them_stay_open(tmp_path, compiled):
+    write(tmp_path, 'in.txt', '4\n5\n6\n')
+    result = run_both(tmp_path, '''var map registry = map_new()
+var null func open_into = (map m) =>
+    map_set(m, in, fopen(in.txt, r))
+    map_set(registry, in, map_get(m, in))
+    var file out = fopen(out.txt, w)
+    fwrite(out, done)
+end open_into
+var map func open_nested = () =>
+    var map inner = map_new()
+    map_set(inner, in, fopen(in.txt, r))
+    var map outer = map_new()
+    map_set(outer, nest, inner)
+    map_set(outer, self, outer)
+    return outer
+end open_nested
+var map files = map_new()
+open_into(files)
+var file f = map_get(files, in)
+var file g = map_get(registry, in)
+var int total = fread_int(f) + fread_int(g)
+var map nested = open_nested()
+var map inner = map_get(nested, nest)
+var file h = map_get(inner, in)
+var int first = fread_int(h)
+var file o = fopen(out.txt, r)
+var str line = fread_str(o)
+output total first line
+''')[compiled]
+    # the file only written to in open_into was closed (and written out) when it returned
+    assert (result.returncode, result.stdout, result.stderr) == (0, ' >> 9 4 done \n', '')
@@ -0,0 +1,49 @@
+import pytest
+
+from benchmarks.generate import generate, get_parser
+from tests.helpers import run_binp, run_python, write
+
+# generator options which cover deep nesting, many functions, deep recursion and long expressions
+OPTIONS = [
+    [],
+    ['--seed', '1', '--depth', '3', '--functions', '8'],
+    ['--seed', '2', '--recursion', '60', '--expression-length', '6'],
+    ['--seed', '3', '--lines', '600', '--variables', '20', '--outputs', '60'],
+]
+
+
+def generated(tmp_path, options: list[str]) -> (str, str):
+    """
+    This writes a generated program to a file
+    :param tmp_path: the directory to write it in
+    :param options: the generator options
+    :return: the path of the program and the output it should print
+    """
+    source, expected = generate(get_parser().parse_args(['-', *options]))
+    return write(tmp_path, 'generated.binp', source), expected
+
+
+@pytest.mark.parametrize('options', OPTIONS)
+def test_generated_program(tmp_path, options):
+    program, expected = generated(tmp_path, options)
+    result = run_binp(program)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == expected
+
+
+@pytest.mark.parametrize('options', OPTIONS)
+def test_generated_program_checks(tmp_path, options):
+    program, expected = generated(tmp_path, options)
+    result = run_binp('--check', program)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == expected
+
+
+@pytest.mark.parametrize('options', OPTIONS)
+def test_generated_program_compiles(tmp_path, options):
+    program, expected = generated(tmp_path, options)
+    module = str(tmp_path / 'generated.py')
+    assert run_binp(f'--emit-python={module}', program).returncode == 0
+    result = run_python(module)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == expected
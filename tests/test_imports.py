@@ -0,0 +1,80 @@
+import subprocess
+import sys
+
+from binp import modules
+from tests.helpers import ROOT, run_binp, write
+
+ADD = '''var int func add2 = (int a, int b) =>
+    return a + b
+end add2
+'''
+BAD = '''var int func bad = (int x) =>
+    return add2(x)
+end bad
+'''
+
+
+def test_check_reports_errors_in_modules(tmp_path):
+    write(tmp_path, 'lib.binp', ADD + BAD)
+    program = write(tmp_path, 'main.binp', 'import "lib.binp"\nvar int r = bad(2)\noutput r\n')
+    result = run_binp('--check', program)
+    assert result.returncode == 3
+    assert f"Error in module '{tmp_path / 'lib.binp'}'" in result.stderr
+    assert 'Incorrect number of arguments in add2 call' in result.stderr
+
+
+def test_module_functions_keep_runtime_checks(tmp_path):
+    # the module can not be checked on its own (add2 is only declared by the program importing it),
+    # so bad still has to find its wrong call when it runs
+    write(tmp_path, 'lib.binp', BAD)
+    program = write(tmp_path, 'main.binp', 'import "lib.binp"\n' + ADD + 'var int r = bad(2)\noutput r\n')
+    result = run_binp('--check', program)
+    assert result.returncode == 3
+    assert result.stderr.startswith('Argument Error on line 5: Incorrect number of arguments in add2 call')
+
+
+def test_callees_see_functions_imported_in_a_function(tmp_path):
+    write(tmp_path, 'lib.binp', ADD)
+    program = write(tmp_path, 'main.binp', '''var int func g = (int x) =>
+    return add2(x, 1)
+end g
+var int func f = (int x) =>
+    import "lib.binp"
+    var int r = g(x)
+    return r
+end f
+var int y = f(5)
+output y
+''')
+    for options in ([], ['--check']):
+        result = run_binp(*options, program)
+        assert (result.returncode, result.stdout, result.stderr) == (0, ' >> 6 \n', '')
+
+
+def test_imports_do_not_search_modules_another_thread_is_compiling(tmp_path):
+    # a module being compiled on another thread must not change where this thread looks for its imports
+    (tmp_path / 'other').mkdir()
+    write(tmp_path / 'other', 'lib.binp', ADD)
+    lib = write(tmp_path, 'lib.binp', ADD)
+    modules._LOADING.append(str(tmp_path / 'other' / 'lib2.binp'))
+    try:
+        assert modules.find_module(0, '', 'lib.binp', [str(tmp_path)]) == lib
+    finally:
+        modules._LOADING.pop()
+
+
+def test_modules_import_modules_next_to_them(tmp_path):
+    (tmp_path / 'lib').mkdir()
+    write(tmp_path / 'lib', 'add.binp', ADD)
+    write(tmp_path / 'lib', 'twice.binp', 'import "add.binp"\nvar int func twice = (int x) =>\n'
+                                          '    return add2(x, x)\nend twice\n')
+    program = write(tmp_path, 'main.binp', 'import "lib/twice.binp"\nvar int y = twice(4)\noutput y\n')
+    result = run_binp(program)
+    assert (result.returncode, result.stdout, result.stderr) == (0, ' >> 8 \n', '')
+
+
+def test_modules_are_only_loaded_when_imported():
+    code = 'import sys\nsys.argv = ["main.py", "valid_programs/hello_world.binp"]\n' \
+           'from binp.cli import main\nmain()\nprint("binp.modules" in sys.modules)'
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=ROOT, timeout=120)
+    assert result.stdout.splitlines()[-1] == 'False'
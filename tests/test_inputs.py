@@ -0,0 +1,41 @@
+import io
+
+import pytest
+
+from binp.evaluators import parse_value
+from binp.inputs import InputReader
+from tests.helpers import run_binp, write
+
+
+@pytest.mark.parametrize('raw, value', [
+    ('5', 5),
+    ('-5', -5),
+    ('0', 0),
+    ('--5', '--5'),
+    ('-0', '-0'),
+    ('007', '007'),
+    ('-', '-'),
+])
+def test_parse_value_ints(raw, value):
+    assert parse_value(raw) == value
+    assert type(parse_value(raw)) is type(value)
+
+
+@pytest.mark.parametrize('raw, value', [
+    (b'5\n', 5),
+    (b'-5\n', -5),
+    (b'--5\n', '--5'),
+    (b'007\n', '007'),
+])
+def test_piped_ints(raw, value):
+    value_read = InputReader(io.BufferedReader(io.BytesIO(raw))).read_value(0, '', 'int')
+    assert value_read == value
+    assert type(value_read) is type(value)
+
+
+def test_two_minus_signs_are_not_an_int(tmp_path):
+    program = write(tmp_path, 'input.binp', 'var int x = input\noutput x\n')
+    result = run_binp(program, stdin='--5\n')
+    assert result.returncode == 3
+    assert result.stderr.startswith('Runtime Error on line 1')
+    assert 'Traceback' not in result.stderr
@@ -0,0 +1,37 @@
+import json
+
+from tests.helpers import run_binp, write
+
+PROGRAM = '''var int func f = (int x) =>
+    var seq s = seq_range(0, x, 1)
+    output in f x
+    return seq_len(s)
+end f
+
+var int y = f(3)
+output y
+'''
+
+
+def test_output_records_have_file_lines(tmp_path):
+    result = run_binp('--output-format=jsonl', write(tmp_path, 'f.binp', PROGRAM))
+    assert result.returncode == 0, result.stderr
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [(record['line'], record['source']) for record in records] == [(3, 'output in f x'), (8, 'output y')]
+
+
+def test_error_records_have_file_lines(tmp_path):
+    program = write(tmp_path, 'e.binp', 'var int func f = (int x) =>\n    var int y = 1\n    var int a = input\n'
+                                        '    return a\nend f\nvar int z = f(2)\n')
+    result = run_binp('--output-format=jsonl', program)
+    assert result.returncode == 3
+    record = json.loads(result.stdout)
+    assert (record['type'], record['line'], record['source']) == ('error', 3, 'var int a = input')
+
+
+def test_memprofile_has_file_lines(tmp_path):
+    result = run_binp('--memprofile', write(tmp_path, 'f.binp', PROGRAM))
+    assert result.returncode == 0, result.stderr
+    assert 'f:2  var seq s' in result.stderr
+    assert '<main>:7  var int y' in result.stderr
+    assert 'counted from' not in result.stderr
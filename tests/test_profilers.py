@@ -0,0 +1,64 @@
+import ast
+import subprocess
+import sys
+
+import pytest
+
+from tests.helpers import ROOT, run_binp, write
+
+PROFILERS = ['binp.stats', 'binp.memprofile']
+
+# runs a program through the command line, then prints which profilers were imported
+LOADED = '''import sys
+sys.argv = ['main.py', *sys.argv[1:]]
+from binp.cli import main
+try:
+    main()
+finally:
+    print(sorted(name for name in sys.modules if name in {profilers!r}), file=sys.stderr)
+'''
+
+
+def loaded_profilers(*args: str) -> list[str]:
+    """
+    :param args: the command line arguments
+    :return: the profiler modules which were imported while the program ran
+    """
+    result = subprocess.run([sys.executable, '-c', LOADED.format(profilers=set(PROFILERS)), *args],
+                            capture_output=True, text=True, cwd=ROOT, timeout=120)
+    return ast.literal_eval(result.stderr.splitlines()[-1])
+
+
+@pytest.mark.parametrize('options, loaded', [
+    ([], []),
+    (['--stats'], ['binp.stats']),
+    (['--memprofile'], ['binp.memprofile']),
+])
+def test_profilers_are_only_loaded_when_used(options, loaded):
+    assert loaded_profilers(*options, 'valid_programs/hello_world.binp') == loaded
+
+
+@pytest.mark.parametrize('source, peak', [
+    # the seq is freed again, and later lines only add a few bytes on top of it
+    ('var seq s = seq_range(0, 200000, 1)\nvar int n = seq_len(s)\nvar seq s = seq_range(0, 2, 1)\n'
+     'output n\nvar int m = n + 1\n$ done\n', '<main> on line 1: var seq s = seq_range ( 0 , 200000 , 1 )'),
+    ('var seq s = seq_range(0, 200000, 1)\nvar int n = seq_len(s)\noutput n\n$ done\n',
+     '<main> on line 1: var seq s = seq_range ( 0 , 200000 , 1 )'),
+    ('var int func build = (int n) =>\n    var seq s = seq_range(0, n, 1)\n    return seq_len(s)\nend build\n'
+     'var int a = build(200000)\noutput a\nvar int b = a + 1\n$ done\n',
+     'build on line 2: var seq s = seq_range ( 0 , n , 1 )'),
+])
+def test_peak_is_blamed_on_the_line_which_grew_it(tmp_path, source, peak):
+    result = run_binp('--memprofile', write(tmp_path, 'peak.binp', source))
+    assert result.returncode == 0, result.stderr
+    report = result.stderr.splitlines()
+    assert report[1] == f'  grown the most by {peak}'
+    assert float(report[0].split()[2]) > 200000 * 28 / 1024  # a python int is at least 28 bytes
+
+
+def test_peak_in_a_function_shows_its_frame(tmp_path):
+    program = write(tmp_path, 'frame.binp', 'var int func build = (int n) =>\n    var seq s = seq_range(0, n, 1)\n'
+                                            '    return seq_len(s)\nend build\nvar int a = build(200000)\n')
+    report = run_binp('--memprofile', program).stderr.splitlines()
+    assert report[2].startswith('  functions running at the peak: 1,')
+    assert report[3] == '    build (2 names)'
@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+from tests.helpers import ROOT, PROGRAM_ARGS, PROGRAM_INPUT, programs, run_binp
+
+EXPECTED = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'expected')
+
+
+def expected_output(program: str) -> str:
+    """
+    :param program: the path of an example program, relative to the root of the repo
+    :return: what it should print (its output, then its errors)
+    """
+    with open(os.path.join(EXPECTED, program[:-len('.binp')] + '.out')) as file:
+        return file.read()
+
+
+@pytest.mark.parametrize('program', programs('valid_programs'))
+def test_valid_program(program):
+    result = run_binp(program, *PROGRAM_ARGS, stdin=PROGRAM_INPUT, cwd=ROOT)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout + result.stderr == expected_output(program)
+
+
+@pytest.mark.parametrize('program', programs('invalid_programs'))
+def test_invalid_program(program):
+    result = run_binp(program, *PROGRAM_ARGS, stdin=PROGRAM_INPUT, cwd=ROOT)
+    assert result.returncode != 0
+    assert result.stdout + result.stderr == expected_output(program)
+
+
+@pytest.mark.parametrize('program', programs('valid_programs'))
+def test_valid_program_checks(program):
+    result = run_binp('--check', program, *PROGRAM_ARGS, stdin=PROGRAM_INPUT, cwd=ROOT)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout + result.stderr == expected_output(program)
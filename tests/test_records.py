@@ -0,0 +1,47 @@
+import pytest
+
+from tests.helpers import run_binp, write
+
+# adds up the second field of every line with two fields, and remembers the first of the last one
+TOTAL = '''BEGIN =>
+    var int total = 0
+    var int count = 0
+    var str last = none
+end
+var int count = count + 1
+if (F_COUNT < 2) =>
+    output skipped LINE_NUM
+    return
+end
+var int total = total + F_1
+var str last = F_0
+END =>
+    output total count last
+end
+'''
+
+
+@pytest.mark.parametrize('options, stdin, output', [
+    (['--fields=,'], 'a,5\nb,-2\nshort\nc,10\n', ' >> skipped 3 \n >> 13 4 c \n'),
+    (['--fields'], 'a 1\n  b   2  \n', ' >> 3 2 b \n'),
+    (['--fields'], '', ' >> 0 0 none \n'),  # BEGIN and END still run once with no input
+])
+def test_begin_variables_add_up_across_lines(tmp_path, options, stdin, output):
+    result = run_binp('--each-line', *options, write(tmp_path, 'total.binp', TOTAL), stdin=stdin)
+    assert (result.returncode, result.stdout, result.stderr) == (0, output, '')
+
+
+def test_lines_do_not_see_each_others_variables(tmp_path):
+    program = write(tmp_path, 'leak.binp', 'if (LINE_NUM == 2) =>\n    var int again = seen + 1\nend\n'
+                                           'var int seen = LINE_NUM\noutput LINE seen\n')
+    result = run_binp('--each-line', program, stdin='x\ny\n')
+    assert result.returncode == 3
+    assert result.stdout == ' >> x 1 \n'
+    assert result.stderr.startswith('Value Error on line 2')
+
+
+def test_end_runs_once_after_the_last_line(tmp_path):
+    program = write(tmp_path, 'end.binp', 'BEGIN =>\n    var int n = 10\nend\nvar int n = n + LINE_NUM\n'
+                                          'END =>\n    var int m = n + 1\n    output m\nend\n')
+    result = run_binp('--each-line', program, stdin='a\nb\nc\n')
+    assert (result.returncode, result.stdout, result.stderr) == (0, ' >> 17 \n', '')
@@ -0,0 +1,59 @@
+import pytest
+
+from binp import sequences
+from binp.expressions import Operator
+from binp.sequences import BinPSeq, INT64_LIMIT, NUMPY_THRESHOLD
+
+LENGTH = 2 * NUMPY_THRESHOLD  # long enough for the numpy fast path
+NEGATIVES = [value * 37 % 2001 - 1000 for value in range(LENGTH)]  # negative, zero and positive values
+DIVISORS = [(value * 13 % 19 - 9) or 5 for value in range(LENGTH)]  # negative and positive, never 0
+HUGE = [(INT64_LIMIT + value) * (-1) ** value for value in range(LENGTH)]  # past int64 both ways
+
+
+def apply(monkeypatch, numpy, op: Operator, left: list[int], right: list[int] | int) -> BinPSeq:
+    """
+    This applies an operator to two sequences, with or without numpy
+    :param numpy: the numpy module, or False to only use python ints
+    :return: the sequence of results
+    """
+    monkeypatch.setattr(sequences, '_numpy', numpy)
+    right = right if type(right) is int else BinPSeq.from_list(right)
+    return sequences.elementwise(0, '', op, BinPSeq.from_list(left), right)
+
+
+@pytest.mark.parametrize('op', [Operator.DIV, Operator.MODULUS])
+@pytest.mark.parametrize('left, right', [
+    (NEGATIVES, DIVISORS),
+    (NEGATIVES, -7),
+    (NEGATIVES, 3),
+    (DIVISORS, [-value for value in reversed(DIVISORS)]),
+])
+def test_numpy_divides_like_python(monkeypatch, op, left, right):
+    numpy = pytest.importorskip('numpy')
+    fast = apply(monkeypatch, numpy, op, left, right)
+    assert fast.is_array()
+    assert fast.to_list() == apply(monkeypatch, False, op, left, right).to_list()
+
+
+@pytest.mark.parametrize('op', [Operator.DIV, Operator.MODULUS, Operator.MUL, Operator.ADD])
+@pytest.mark.parametrize('left, right', [
+    (HUGE, DIVISORS),
+    (HUGE, -3),
+    (NEGATIVES, [value * 3 for value in HUGE]),
+    ([INT64_LIMIT] * LENGTH, -2),  # fits, but the sum and product do not
+])
+def test_numpy_is_not_used_past_int64(monkeypatch, op, left, right):
+    numpy = pytest.importorskip('numpy')
+    fast = apply(monkeypatch, numpy, op, left, right)
+    assert fast.to_list() == apply(monkeypatch, False, op, left, right).to_list()
+    assert all(type(value) is int for value in fast.to_list())
+
+
+@pytest.mark.parametrize('op, function', [
+    (Operator.DIV, lambda x, y: x // y),
+    (Operator.MODULUS, lambda x, y: x % y),
+])
+def test_python_path_rounds_down(monkeypatch, op, function):
+    result = apply(monkeypatch, False, op, HUGE, DIVISORS)
+    assert not result.is_array()
+    assert result.to_list() == [function(x, y) for x, y in zip(HUGE, DIVISORS)]
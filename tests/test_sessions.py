@@ -0,0 +1,75 @@
+import io
+import json
+
+import pytest
+
+from binp.builtins import get_builtins
+from binp.context import Context, CURRENT_CONTEXT
+from binp.errors import BinPExit, BinPSessionError
+from binp.interpreter import get_unaries
+from binp.repl import run_interactive
+from binp.sessions import load_session
+from tests.helpers import run_binp, write
+
+
+def test_load_a_shorter_session(tmp_path):
+    session = str(tmp_path / 'one.sess')
+    assert 'Traceback' not in run_binp(stdin=f'var int a = 1\n:save {session}\n').stderr
+
+    result = run_binp(stdin=f'var int a = 2\nvar int b = 3\n:load {session}\noutput a\nvar int c = 4\noutput c\n')
+    assert 'Traceback' not in result.stderr
+    assert ' >> 1 ' in result.stdout and ' >> 4 ' in result.stdout
+
+
+@pytest.mark.parametrize('session', [
+    {},
+    {'namespace': [], 'lines': []},
+    {'namespace': {}, 'lines': 'var int a = 1'},
+    {'namespace': {}, 'lines': [1]},
+    {'namespace': {'f': {'type': 'func', 'name': 'f', 'return_type': 'int', 'params': 5, 'lines': []}}, 'lines': []},
+    {'namespace': {'f': {'type': 'builtin', 'name': ['eof']}}, 'lines': []},
+    {'namespace': {'a': 5}, 'lines': []},
+])
+def test_malformed_sessions(tmp_path, session):
+    path = write(tmp_path, 'bad.sess', json.dumps({'format': 'binp-session', 'version': 1, **session}))
+    with pytest.raises(BinPSessionError):
+        load_session(path)
+
+    result = run_binp(stdin=f':load {path}\n')
+    assert 'Session Error' in result.stderr and 'Traceback' not in result.stderr
+
+
+class TypedContext(Context):
+    """
+    This context types lines into the prompt instead of reading them from a person
+    """
+    def __init__(self, typed: list[str]):
+        super().__init__(stdout=io.StringIO(), stderr=io.StringIO())
+        self.typed = iter(typed)
+
+    def prompt(self, text: str) -> str:
+        line = next(self.typed, None)
+        if line is None:
+            raise EOFError
+        return line
+
+
+def test_prompt_runs_in_its_context():
+    context = TypedContext(['var int a = 4', 'output a', 'var int b = nope + 1', ':unknown'])
+    with pytest.raises(BinPExit) as stopped:
+        run_interactive(get_builtins(get_unaries({})), context=context)
+    assert stopped.value.code == 3
+    assert context.stdout.getvalue() == 'Press Ctrl-C to exit the interactive prompt\n >> 4 \n'
+    assert "Invalid cast of type 'int'" in context.stderr.getvalue()
+    assert 'Unknown command' in context.stderr.getvalue()
+    assert CURRENT_CONTEXT.get(None) is not context
+
+
+def test_prompt_stops_on_a_bad_session(tmp_path):
+    path = write(tmp_path, 'bad.sess', 'not json')
+    context = TypedContext([])
+    with pytest.raises(BinPExit) as stopped:
+        run_interactive({}, session_file=path, context=context)
+    assert stopped.value.code == 1
+    assert context.stderr.getvalue() == f"Session Error in '{path}': File is not a session\n"
+    assert context.stdout.getvalue() == ''
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from tests.helpers import run_binp, write
+
+# four calls of f (the deepest 4 calls down), two builtin calls, one output, and then an error
+PROGRAM = '''var int func f = (int x) =>
+    if (x == 0) =>
+        return 0
+    end
+    return f(x - 1) + 1
+end f
+var int y = f(3)
+output y
+var seq s = seq_range(0, 4, 1)
+var int n = seq_len(s)
+var int z = n / 0
+'''
+ERROR = 'Runtime Error on line 11: integer division or modulo by zero\nvar int z  =  n  /  0\n'
+
+
+def check_report(report: dict) -> None:
+    """
+    This checks the counters of a --stats report of PROGRAM
+    """
+    assert list(report) == ['statements', 'calls', 'frames', 'namespace_copies', 'peak_namespace_size',
+                            'expression_trees', 'inline_caches', 'output', 'time']
+    statements = report['statements']
+    assert statements['total'] == sum(count for kind, count in statements.items() if kind != 'total')
+    assert {kind: statements[kind] for kind in ['function declaration', 'assignment', 'if', 'return', 'output']} \
+        == {'function declaration': 1, 'assignment': 4, 'if': 4, 'return': 4, 'output': 1}
+    assert report['calls'] == {'functions': 4, 'builtins': 2, 'max_depth': 4}
+    assert report['frames'] == {'count': 4, 'total_slots': 4, 'max_slots': 1}
+    assert report['output'] == {'lines': 1, 'bytes': len(' >> 3 \n')}
+    assert report['namespace_copies'] == {'count': 0, 'total_names': 0}
+    assert report['peak_namespace_size'] >= 4
+    assert set(report['inline_caches']) == {'hits', 'misses'}
+    assert sum(report['inline_caches'].values()) + report['expression_trees'] > 0
+    assert set(report['time']) == {'parse', 'evaluate', 'io'}
+    assert all(type(seconds) is float and seconds >= 0 for seconds in report['time'].values())
+
+
+def test_stats_are_written_to_stderr_after_an_error(tmp_path):
+    result = run_binp('--stats', write(tmp_path, 'stats.binp', PROGRAM))
+    assert (result.returncode, result.stdout) == (3, ' >> 3 \n')
+    assert result.stderr.startswith(ERROR)
+    check_report(json.loads(result.stderr[len(ERROR):]))
+
+
+@pytest.mark.parametrize('options', [[], ['--check']])
+def test_stats_are_written_to_a_file(tmp_path, options):
+    report = tmp_path / 'stats.json'
+    result = run_binp(f'--stats={report}', *options, write(tmp_path, 'stats.binp', PROGRAM))
+    assert (result.returncode, result.stdout, result.stderr) == (3, ' >> 3 \n', ERROR)
+    check_report(json.loads(report.read_text()))
@@ -0,0 +1,45 @@
+import pytest
+
+from tests.helpers import ROOT, PROGRAM_ARGS, PROGRAM_INPUT, programs, run_binp, run_python, write
+
+
+def compile_program(tmp_path, program: str):
+    """
+    This compiles a program with --emit-python
+    :param tmp_path: the directory to write the module in
+    :param program: the path of the program
+    :return: the path of the module, and the finished compile
+    """
+    module = str(tmp_path / 'compiled.py')
+    return module, run_binp(f'--emit-python={module}', program, cwd=ROOT)
+
+
+@pytest.mark.parametrize('program', programs('valid_programs') + programs('invalid_programs'))
+def test_compiled_program_matches_interpreter(tmp_path, program):
+    module, compiled = compile_program(tmp_path, program)
+    if compiled.returncode != 0:  # a block with no end can not be compiled at all, so it fails straight away
+        assert program.startswith('invalid_programs')
+        assert compiled.returncode == 3 and compiled.stderr.startswith('Syntax Error')
+        return
+
+    interpreted = run_binp(program, *PROGRAM_ARGS, stdin=PROGRAM_INPUT, cwd=ROOT)
+    result = run_python(module, *PROGRAM_ARGS, stdin=PROGRAM_INPUT, cwd=ROOT)
+    assert (result.returncode, result.stdout, result.stderr) == \
+           (interpreted.returncode, interpreted.stdout, interpreted.stderr)
+
+
+@pytest.mark.parametrize('step, output', [
+    ('1', ' >> 0 \n >> 1 \n >> 2 \n'),
+    ('2', ' >> 0 \n >> 2 \n'),
+    ('int_negate(1)', ''),
+    ('int_negate(0)', ''),
+])
+def test_compiled_for_loop_step(tmp_path, step, output):
+    program = write(tmp_path, 'loop.binp', f'for (int i = 0, 3, {step}) =>\n    output i\nend\n')
+    module, compiled = compile_program(tmp_path, program)
+    assert compiled.returncode == 0, compiled.stderr
+
+    interpreted = run_binp(program)
+    result = run_python(module)
+    assert result.stdout == interpreted.stdout == output
+    assert (result.returncode, result.stderr) == (interpreted.returncode, interpreted.stderr)